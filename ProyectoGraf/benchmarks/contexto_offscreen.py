@@ -0,0 +1,109 @@
+"""
+Contexto OpenGL 4.0 core sin ventana, para medir y probar el renderizado en máquinas sin pantalla.
+
+PyOpenGL elige la plataforma al importarse por primera vez, así que hay que llamar a
+preparar_plataforma() antes de importar cualquier módulo que use OpenGL.
+"""
+import ctypes
+import os
+
+ANCHO = 1024
+ALTO = 720
+
+def preparar_plataforma(plataforma="egl"):
+    """Selecciona EGL u OSMesa para PyOpenGL (debe ejecutarse antes de importar OpenGL)"""
+    os.environ["PYOPENGL_PLATFORM"] = plataforma
+    # pygame no debe abrir ventana ni dispositivo de audio
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+class ContextoOffscreen:
+    """Crea y activa un contexto con un framebuffer fuera de pantalla de ancho x alto"""
+
+    def __init__(self, ancho=ANCHO, alto=ALTO):
+        self.ancho = ancho
+        self.alto = alto
+        self.plataforma = os.environ.get("PYOPENGL_PLATFORM", "egl")
+        if self.plataforma == "egl":
+            self._crear_egl()
+        elif self.plataforma == "osmesa":
+            self._crear_osmesa()
+        else:
+            raise RuntimeError(f"Plataforma sin ventana no soportada: {self.plataforma}")
+
+    def _crear_egl(self):
+        from OpenGL import EGL
+
+        def arreglo(valores):
+            return (EGL.EGLint * len(valores))(*valores)
+
+        self.display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        mayor, menor = EGL.EGLint(), EGL.EGLint()
+        if not EGL.eglInitialize(self.display, ctypes.pointer(mayor), ctypes.pointer(menor)):
+            raise RuntimeError("No se pudo inicializar EGL")
+
+        atributos_config = arreglo([
+            EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+            EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8, EGL.EGL_ALPHA_SIZE, 8,
+            EGL.EGL_DEPTH_SIZE, 24,
+            EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+            EGL.EGL_NONE])
+        config = EGL.EGLConfig()
+        cantidad = EGL.EGLint()
+        if not EGL.eglChooseConfig(self.display, atributos_config, ctypes.pointer(config), 1, ctypes.pointer(cantidad)) or cantidad.value == 0:
+            raise RuntimeError("EGL no ofrece una configuración con pbuffer RGBA8 y profundidad 24")
+
+        self.superficie = EGL.eglCreatePbufferSurface(
+            self.display, config, arreglo([EGL.EGL_WIDTH, self.ancho, EGL.EGL_HEIGHT, self.alto, EGL.EGL_NONE]))
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        self.contexto = EGL.eglCreateContext(self.display, config, EGL.EGL_NO_CONTEXT, arreglo([
+            EGL.EGL_CONTEXT_MAJOR_VERSION, 4,
+            EGL.EGL_CONTEXT_MINOR_VERSION, 0,
+            EGL.EGL_CONTEXT_OPENGL_PROFILE_MASK, EGL.EGL_CONTEXT_OPENGL_CORE_PROFILE_BIT,
+            EGL.EGL_NONE]))
+        if not self.contexto:
+            raise RuntimeError("EGL no pudo crear un contexto OpenGL 4.0 core")
+        EGL.eglMakeCurrent(self.display, self.superficie, self.superficie, self.contexto)
+        self._egl = EGL
+
+    def _crear_osmesa(self):
+        from OpenGL import GL as gl
+        from OpenGL import arrays, osmesa
+
+        self.contexto = osmesa.OSMesaCreateContextAttribs([
+            osmesa.OSMESA_FORMAT, osmesa.OSMESA_RGBA,
+            osmesa.OSMESA_DEPTH_BITS, 24,
+            osmesa.OSMESA_PROFILE, osmesa.OSMESA_CORE_PROFILE,
+            osmesa.OSMESA_CONTEXT_MAJOR_VERSION, 4,
+            osmesa.OSMESA_CONTEXT_MINOR_VERSION, 0,
+            0], None)
+        if not self.contexto:
+            raise RuntimeError("OSMesa no pudo crear un contexto OpenGL 4.0 core")
+        self.buffer = arrays.GLubyteArray.zeros((self.alto, self.ancho, 4))
+        osmesa.OSMesaMakeCurrent(self.contexto, self.buffer, gl.GL_UNSIGNED_BYTE, self.ancho, self.alto)
+        self._osmesa = osmesa
+
+    def terminar_cuadro(self):
+        """Equivalente a cambiar de buffer: espera a que la GPU termine el cuadro"""
+        from OpenGL import GL as gl
+        gl.glFinish()
+        if self.plataforma == "egl":
+            self._egl.eglSwapBuffers(self.display, self.superficie)
+
+    def leer_pixeles(self):
+        """Devuelve el framebuffer actual como bytes RGBA (fila inferior primero)"""
+        from OpenGL import GL as gl
+        import numpy as np
+        gl.glPixelStorei(gl.GL_PACK_ALIGNMENT, 1)
+        datos = gl.glReadPixels(0, 0, self.ancho, self.alto, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE)
+        # Según la configuración de PyOpenGL llega como bytes o como arreglo de NumPy
+        return datos if isinstance(datos, bytes) else np.ascontiguousarray(datos).tobytes()
+
+    def liberar(self):
+        if self.plataforma == "egl":
+            self._egl.eglMakeCurrent(self.display, self._egl.EGL_NO_SURFACE, self._egl.EGL_NO_SURFACE, self._egl.EGL_NO_CONTEXT)
+            self._egl.eglDestroyContext(self.display, self.contexto)
+            self._egl.eglDestroySurface(self.display, self.superficie)
+            self._egl.eglTerminate(self.display)
+        else:
+            self._osmesa.OSMesaDestroyContext(self.contexto)
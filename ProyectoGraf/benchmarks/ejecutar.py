@@ -0,0 +1,386 @@
+"""
+Benchmarks de las partes críticas del motor. Se ejecuta desde ProyectoGraf:
+
+    python benchmarks/ejecutar.py                      # todo menos el renderizado
+    python benchmarks/ejecutar.py --render egl         # incluye renderizado sin ventana (EGL u osmesa)
+    python benchmarks/ejecutar.py --solo laberinto curvas
+    python benchmarks/ejecutar.py --comparar benchmarks/resultados/anterior.json
+
+Cada ejecución guarda un JSON en benchmarks/resultados/ con el commit actual
+para comparar tiempos entre versiones.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+CARPETA_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+CARPETA_PROYECTO = os.path.dirname(CARPETA_BENCHMARKS)
+CARPETA_RESULTADOS = os.path.join(CARPETA_BENCHMARKS, "resultados")
+sys.path.insert(0, CARPETA_PROYECTO)
+sys.path.insert(0, CARPETA_BENCHMARKS)
+
+import contexto_offscreen
+
+TAMANOS_LABERINTO = (30, 60, 120)
+NIVELES = (1, 2, 3)
+PROFUNDIDADES_FRACTAL = (3, 4, 5)
+MUESTRAS_CURVA = 10000
+MUESTRAS_CURVA_LOTE = 1000000
+COLORES_ESCALAR = 10000
+COLORES_LOTE = 1000000
+CUADROS_MUNDO = 600
+CUADROS_RENDER = 120
+PASO = 1.0 / 120.0
+OBJETIVOS_CAMPO = 50
+NIVEL_PERSECUCION = 9
+
+# Grupos registrados con @benchmark: nombre -> función que genera los casos
+BENCHMARKS = {}
+
+def benchmark(grupo):
+    """
+    Registra un generador de casos (nombre, preparar, ejecutar).
+    preparar() no se mide y devuelve el estado que recibe ejecutar(estado).
+    """
+    def registrar(funcion):
+        BENCHMARKS[grupo] = funcion
+        return funcion
+    return registrar
+
+@benchmark("laberinto")
+def casos_laberinto():
+    from laberinto import Laberinto, _configurar_laberinto
+    from recursos_sin_gpu import RegistroSinGpu
+    import esper
+
+    for tamano in TAMANOS_LABERINTO:
+        def generar(_estado, tamano=tamano):
+            Laberinto(ancho=tamano, largo=tamano, rng=random.Random(0)).generar()
+        yield f"generar_{tamano}x{tamano}", None, generar
+
+        def preparar_paredes(tamano=tamano):
+            laberinto = Laberinto(ancho=tamano, largo=tamano, rng=random.Random(0))
+            laberinto.generar()
+            mundo = esper.World()
+            mundo.registro_modelos = RegistroSinGpu()
+            return mundo, laberinto
+
+        def crear_paredes(estado, tamano=tamano):
+            mundo, laberinto = estado
+            _configurar_laberinto(mundo, tamano, tamano, profundidad=1.5, laberinto=laberinto)
+        yield f"entidades_paredes_{tamano}x{tamano}", preparar_paredes, crear_paredes
+
+        def preparar_grafo(tamano=tamano):
+            laberinto = Laberinto(ancho=tamano, largo=tamano, rng=random.Random(0))
+            laberinto.generar()
+            return laberinto
+
+        def construir_grafo(laberinto):
+            laberinto.invalidar_grafo()
+            laberinto.grafo()
+        yield f"grafo_{tamano}x{tamano}", preparar_grafo, construir_grafo
+
+@benchmark("glb")
+def casos_glb():
+    from cargador_glb import CargadorGlb
+    from cargador_asincrono import CargadorAsincrono
+
+    for archivo in CargadorAsincrono.MODELOS_GLB:
+        def decodificar(_estado, archivo=archivo):
+            CargadorGlb(archivo).decodificar()
+        yield f"decodificar_{os.path.splitext(os.path.basename(archivo))[0]}", None, decodificar
+
+@benchmark("fractal")
+def casos_fractal():
+    from generador_fractales import FractalNube
+
+    for profundidad in PROFUNDIDADES_FRACTAL:
+        def generar(_estado, profundidad=profundidad):
+            FractalNube(profundidad, semilla=0, usar_precalculada=False)
+        yield f"generar_profundidad_{profundidad}", None, generar
+
+        def generar_sin_ocultas(_estado, profundidad=profundidad):
+            FractalNube(profundidad, semilla=0, eliminar_caras_ocultas=True, usar_precalculada=False)
+        yield f"generar_sin_ocultas_profundidad_{profundidad}", None, generar_sin_ocultas
+
+@benchmark("curvas")
+def casos_curvas():
+    import glm
+    import numpy as np
+    from curvas_bezier import CurvaBezier
+    from curvas_bspline import CurvaBSpline
+
+    valores_t = [i / (MUESTRAS_CURVA - 1) for i in range(MUESTRAS_CURVA)]
+    bezier = CurvaBezier(glm.vec3(0, 0, 0), glm.vec3(10, 20, 5), glm.vec3(20, -10, 5), glm.vec3(30, 30, 0))
+    puntos = [glm.vec3(15 + 20 * random.Random(i).random(), 15 + 20 * random.Random(-i).random(), 10) for i in range(12)]
+    bspline_cerrada = CurvaBSpline(puntos, cerrada=True)
+    bspline_abierta = CurvaBSpline(puntos, cerrada=False)
+
+    for nombre, curva in (("bezier", bezier), ("bspline_cerrada", bspline_cerrada), ("bspline_abierta", bspline_abierta)):
+        def evaluar(_estado, curva=curva):
+            for t in valores_t:
+                curva.calcular_punto(t)
+        yield f"{nombre}_{MUESTRAS_CURVA}_puntos", None, evaluar
+
+        def evaluar_lote(_estado, curva=curva):
+            curva.calcular_puntos(np.linspace(0.0, 1.0, MUESTRAS_CURVA))
+        yield f"{nombre}_{MUESTRAS_CURVA}_puntos_lote", None, evaluar_lote
+
+        def evaluar_uniforme(_estado, curva=curva):
+            curva.invalidar_tabla()
+            curva.puntos_uniformes(np.linspace(0.0, 1.0, MUESTRAS_CURVA))
+        yield f"{nombre}_{MUESTRAS_CURVA}_puntos_uniformes_con_tabla", None, evaluar_uniforme
+
+    # Lotes grandes: matriz base + Horner (cúbicas) y de Boor (grado arbitrario, anclada)
+    valores_lote = np.linspace(0.0, 1.0, MUESTRAS_CURVA_LOTE)
+    curvas_lote = (
+        ("bezier", bezier),
+        ("bspline_cerrada", bspline_cerrada),
+        ("bspline_abierta", bspline_abierta),
+        ("bspline_anclada_grado_5", CurvaBSpline(puntos, grado=5, anclada=True)),
+    )
+    for nombre, curva in curvas_lote:
+        def evaluar_lote_grande(_estado, curva=curva):
+            curva.calcular_puntos(valores_lote)
+        yield f"{nombre}_{MUESTRAS_CURVA_LOTE}_puntos_lote", None, evaluar_lote_grande
+
+    def aplanar(_estado):
+        bezier.aplanar(0.001)
+    yield "bezier_aplanar_0.001", None, aplanar
+
+@benchmark("color")
+def casos_color():
+    import numpy as np
+    import modelos_color
+
+    generador = np.random.default_rng(0)
+    hsv = np.column_stack((generador.uniform(0.0, 360.0, COLORES_LOTE),
+                           generador.uniform(0.0, 1.0, COLORES_LOTE),
+                           generador.uniform(0.0, 1.0, COLORES_LOTE)))
+    rgb = generador.uniform(0.0, 1.0, (COLORES_LOTE, 3))
+    conversiones = (
+        ("hsv_a_rgb", modelos_color.hsv_a_rgb, modelos_color.hsv_a_rgb_lote, hsv),
+        ("rgb_a_hsv", modelos_color.rgb_a_hsv, modelos_color.rgb_a_hsv_lote, rgb),
+        ("hsl_a_rgb", modelos_color.hsl_a_rgb, modelos_color.hsl_a_rgb_lote, hsv),
+        ("rgb_a_hsl", modelos_color.rgb_a_hsl, modelos_color.rgb_a_hsl_lote, rgb),
+        ("rgb_a_cmy", modelos_color.rgb_a_cmy, modelos_color.rgb_a_cmy_lote, rgb),
+    )
+    for nombre, escalar, lote, colores in conversiones:
+        filas = colores[:COLORES_ESCALAR].tolist()
+
+        def convertir(_estado, escalar=escalar, filas=filas):
+            for fila in filas:
+                escalar(*fila)
+        yield f"{nombre}_{COLORES_ESCALAR}_colores", None, convertir
+
+        def convertir_lote(_estado, lote=lote, colores=colores):
+            lote(colores)
+        yield f"{nombre}_{COLORES_LOTE}_colores_lote", None, convertir_lote
+
+@benchmark("mundo")
+def casos_mundo():
+    import glm
+    from mundo import Mundo
+
+    for tamano in TAMANOS_LABERINTO[:2]:
+        for nivel in NIVELES:
+            def preparar(tamano=tamano, nivel=nivel):
+                return Mundo(glm.vec2(contexto_offscreen.ANCHO, contexto_offscreen.ALTO), nivel,
+                             sin_gpu=True, semilla=0, tamano_laberinto=(tamano, tamano))
+
+            def simular(mundo):
+                for _ in range(CUADROS_MUNDO):
+                    mundo.delta = PASO
+                    mundo.tiempo += PASO
+                    mundo.process()
+            yield f"process_{CUADROS_MUNDO}_cuadros_{tamano}x{tamano}_nivel_{nivel}", preparar, simular
+
+@benchmark("persecucion")
+def casos_persecucion():
+    import glm
+    from campo_flujo import CampoFlujo
+    from laberinto import Laberinto
+    from mundo import Mundo
+    from sistema_persecucion import SistemaPersecucion
+    from sistema_patrulla import SistemaPatrulla
+    from rutas_patrulla import TablaRutas, crear_ruta_patrulla
+
+    tamano = TAMANOS_LABERINTO[-1]
+
+    def preparar_campo():
+        laberinto = Laberinto(ancho=tamano, largo=tamano, rng=random.Random(0))
+        laberinto.generar()
+        campo = CampoFlujo(laberinto)
+        libres = [tuple(celda) for celda in zip(*campo.libre.nonzero())]
+        return campo, random.Random(0).sample(libres, OBJETIVOS_CAMPO)
+
+    def recalcular(estado):
+        campo, objetivos = estado
+        for objetivo in objetivos:
+            campo.actualizar(objetivo)
+    yield f"campo_flujo_{OBJETIVOS_CAMPO}_recalculos_{tamano}x{tamano}", preparar_campo, recalcular
+
+    def preparar_mundo():
+        mundo = Mundo(glm.vec2(contexto_offscreen.ANCHO, contexto_offscreen.ALTO), NIVEL_PERSECUCION,
+                      sin_gpu=True, semilla=0, tamano_laberinto=(tamano, tamano))
+        return mundo, mundo.get_processor(SistemaPersecucion)
+
+    def dirigir(estado):
+        _mundo, sistema = estado
+        for _ in range(CUADROS_MUNDO):
+            sistema.process()
+
+    # nivel * min(ancho, largo) * 0.2 gatos: 216 en un laberinto de 120x120
+    gatos = int(NIVEL_PERSECUCION * tamano * 0.2)
+    yield f"dirigir_{gatos}_gatos_{CUADROS_MUNDO}_pasos_{tamano}x{tamano}", preparar_mundo, dirigir
+
+    def simular(estado):
+        mundo, _sistema = estado
+        for _ in range(CUADROS_MUNDO):
+            mundo.tiempo += PASO
+            mundo.simular_paso(PASO)
+    yield f"simular_{gatos}_gatos_{CUADROS_MUNDO}_pasos_{tamano}x{tamano}", preparar_mundo, simular
+
+    def preparar_laberinto():
+        laberinto = Laberinto(ancho=tamano, largo=tamano, rng=random.Random(0))
+        laberinto.generar()
+        libres = [tuple(celda) for celda in zip(*laberinto.grafo().libre.nonzero())]
+        return laberinto, random.Random(0).sample(libres, gatos)
+
+    def crear_rutas(estado):
+        laberinto, celdas = estado
+        tabla = TablaRutas()
+        rng = random.Random(0)
+        for celda in celdas:
+            curva = crear_ruta_patrulla(laberinto, celda, rng)
+            if curva is not None:
+                tabla.agregar(curva)
+        tabla.preparar()
+    yield f"rutas_patrulla_{gatos}_gatos_{tamano}x{tamano}", preparar_laberinto, crear_rutas
+
+    def patrullar(estado):
+        mundo, _sistema = estado
+        sistema = mundo.get_processor(SistemaPatrulla)
+        for _ in range(CUADROS_MUNDO):
+            sistema.process()
+    yield f"patrullar_{gatos}_gatos_{CUADROS_MUNDO}_pasos_{tamano}x{tamano}", preparar_mundo, patrullar
+
+@benchmark("render")
+def casos_render():
+    import glm
+    import pygame
+    from mundo import Mundo
+    import sistemas_renderizado
+
+    pygame.init()
+    contexto = contexto_offscreen.ContextoOffscreen()
+    for nivel in NIVELES:
+        def preparar(nivel=nivel):
+            mundo = Mundo(glm.vec2(contexto.ancho, contexto.alto), nivel, semilla=0)
+            # Sin ventana no hay buffer que intercambiar: el contexto espera a la GPU
+            mundo.sistemas_cuadro = [sistema for sistema in mundo.sistemas_cuadro
+                                     if not isinstance(sistema, sistemas_renderizado.SistemaFinCuadro)]
+            return mundo
+
+        def dibujar(mundo):
+            for _ in range(CUADROS_RENDER):
+                mundo.tiempo += 1.0 / 60.0
+                alfa = mundo.avanzar_simulacion(1.0 / 60.0)
+                mundo.renderizar(alfa, 1.0 / 60.0)
+                contexto.terminar_cuadro()
+            mundo.limpiar()
+        yield f"render_{CUADROS_RENDER}_cuadros_nivel_{nivel}", preparar, dibujar
+
+def medir(preparar, ejecutar, repeticiones):
+    """Ejecuta una vez de calentamiento y luego 'repeticiones' veces; devuelve estadísticas en segundos"""
+    tiempos = []
+    for indice in range(repeticiones + 1):
+        estado = preparar() if preparar else None
+        inicio = time.perf_counter()
+        ejecutar(estado)
+        duracion = time.perf_counter() - inicio
+        if indice > 0:
+            tiempos.append(duracion)
+    return {
+        "repeticiones": repeticiones,
+        "minimo": min(tiempos),
+        "mediana": statistics.median(tiempos),
+        "media": statistics.fmean(tiempos),
+        "desviacion": statistics.stdev(tiempos) if len(tiempos) > 1 else 0.0,
+    }
+
+def commit_actual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=CARPETA_PROYECTO,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocido"
+
+def comparar(resultados, ruta_anterior):
+    """Imprime el cambio de la mediana respecto a un JSON anterior"""
+    with open(ruta_anterior) as archivo:
+        anteriores = json.load(archivo)["resultados"]
+    print(f"\nComparación con {ruta_anterior} (mediana):")
+    for nombre, datos in resultados.items():
+        anterior = anteriores.get(nombre)
+        if anterior is None:
+            continue
+        cambio = (datos["mediana"] / anterior["mediana"] - 1.0) * 100.0
+        print(f"  {nombre:<55} {anterior['mediana'] * 1000:10.2f} ms -> {datos['mediana'] * 1000:10.2f} ms  ({cambio:+.1f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del motor")
+    parser.add_argument("--solo", nargs="+", choices=sorted(BENCHMARKS), help="grupos a ejecutar")
+    parser.add_argument("--render", choices=("egl", "osmesa"), help="incluye el renderizado sin ventana con esta plataforma")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--salida", help="ruta del JSON (por defecto benchmarks/resultados/<fecha>_<commit>.json)")
+    parser.add_argument("--comparar", metavar="JSON", help="resultados anteriores con los que comparar")
+    argumentos = parser.parse_args()
+
+    # La plataforma de PyOpenGL se fija antes de que algún módulo importe OpenGL
+    if argumentos.render:
+        contexto_offscreen.preparar_plataforma(argumentos.render)
+    else:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    grupos = argumentos.solo or [grupo for grupo in BENCHMARKS if grupo != "render" or argumentos.render]
+    if "render" in grupos and not argumentos.render:
+        parser.error("el grupo render necesita --render egl|osmesa")
+
+    # Rutas relativas (recursos/...) como al ejecutar el juego
+    os.chdir(CARPETA_PROYECTO)
+    resultados = {}
+    for grupo in grupos:
+        for nombre, preparar, ejecutar in BENCHMARKS[grupo]():
+            clave = f"{grupo}.{nombre}"
+            datos = medir(preparar, ejecutar, argumentos.repeticiones)
+            resultados[clave] = datos
+            print(f"{clave:<60} mediana {datos['mediana'] * 1000:10.2f} ms  (mín {datos['minimo'] * 1000:.2f} ms)")
+
+    commit = commit_actual()
+    fecha = datetime.datetime.now()
+    salida = argumentos.salida or os.path.join(CARPETA_RESULTADOS, f"{fecha:%Y%m%d_%H%M%S}_{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, "w") as archivo:
+        json.dump({
+            "commit": commit,
+            "fecha": fecha.isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "resultados": resultados,
+        }, archivo, indent=2)
+    print(f"Resultados guardados en {salida}")
+
+    if argumentos.comparar:
+        comparar(resultados, argumentos.comparar)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Recorrido de cámara sin ventana para medir el renderizado y capturar cuadros.
+
+Construye un Mundo del nivel indicado en un contexto EGL u OSMesa (funciona con
+llvmpipe, sin GPU) y mueve la cámara libre por la curva Bézier de la intro y luego
+por la B-Spline de la victoria. Reporta la distribución de FPS, las llamadas de
+dibujo y el total de llamadas a OpenGL por cuadro; opcionalmente guarda PNGs para
+comparar visualmente entre versiones.
+
+    python benchmarks/render_offscreen.py --nivel 2 --cuadros 600 --plataforma osmesa
+    python benchmarks/render_offscreen.py --capturas capturas/ --cada 60
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+CARPETA_BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+CARPETA_PROYECTO = os.path.dirname(CARPETA_BENCHMARKS)
+sys.path.insert(0, CARPETA_PROYECTO)
+sys.path.insert(0, CARPETA_BENCHMARKS)
+
+import contexto_offscreen
+
+PASO_CUADRO = 1.0 / 60.0
+
+class ContadorLlamadasGl:
+    """Cuenta las llamadas hechas a través del módulo OpenGL.GL (los módulos del juego usan 'gl.')"""
+
+    LLAMADAS_DIBUJO = (
+        "glDrawArrays", "glDrawElements",
+        "glDrawArraysInstanced", "glDrawElementsInstanced",
+        "glMultiDrawArrays", "glMultiDrawElements",
+    )
+
+    def __init__(self):
+        self.conteos = Counter()
+        self._originales = {}
+
+    def instalar(self):
+        from OpenGL import GL as gl
+        for nombre in dir(gl):
+            if not nombre.startswith("gl"):
+                continue
+            original = getattr(gl, nombre)
+            if callable(original):
+                self._originales[nombre] = original
+                setattr(gl, nombre, self._envolver(nombre, original))
+
+    def _envolver(self, nombre, original):
+        conteos = self.conteos
+
+        def llamada_contada(*args, **kwargs):
+            conteos[nombre] += 1
+            return original(*args, **kwargs)
+        return llamada_contada
+
+    def desinstalar(self):
+        from OpenGL import GL as gl
+        for nombre, original in self._originales.items():
+            setattr(gl, nombre, original)
+        self._originales = {}
+
+    def total(self):
+        return sum(self.conteos.values())
+
+    def dibujo(self):
+        return sum(self.conteos[nombre] for nombre in self.LLAMADAS_DIBUJO)
+
+def posicionar_camara(mundo, cuadro, cuadros):
+    """Primera mitad: curva Bézier de la intro; segunda mitad: B-Spline de la victoria"""
+    import glm
+    import componentes_3d as componentes
+
+    mitad = max(cuadros // 2, 1)
+    centro = glm.vec3(mundo.laberinto.centro.x, mundo.laberinto.centro.y, 0)
+    if cuadro < mitad:
+        t = cuadro / max(mitad - 1, 1)
+        posicion = mundo.curva_intro.punto_uniforme(t)
+        # Igual que la intro del juego: del centro del laberinto hacia el jugador
+        jugador = mundo.component_for_entity(mundo.objeto_jugador, componentes.Transformacion).posicion
+        mirar_a = glm.mix(glm.vec3(15, 15, 0), jugador, t)
+    else:
+        t = (cuadro - mitad) / max(cuadros - mitad, 1)
+        posicion = mundo.curva_victoria.punto_uniforme(t)
+        mirar_a = centro
+    mundo.component_for_entity(mundo.cam_libre, componentes.Transformacion).posicion = posicion
+    mundo.component_for_entity(mundo.cam_libre, componentes.OrientacionCamara).mirar_a = mirar_a
+
+def guardar_captura(contexto, ruta):
+    import pygame
+    superficie = pygame.image.frombuffer(contexto.leer_pixeles(), (contexto.ancho, contexto.alto), "RGBA")
+    # OpenGL entrega la fila inferior primero
+    pygame.image.save(pygame.transform.flip(superficie, False, True), ruta)
+
+def percentil(valores, porcentaje):
+    ordenados = sorted(valores)
+    indice = min(int(round(porcentaje / 100.0 * (len(ordenados) - 1))), len(ordenados) - 1)
+    return ordenados[indice]
+
+def ejecutar_recorrido(nivel=1, cuadros=600, semilla=0, carpeta_capturas=None, cada=60):
+    """Dibuja 'cuadros' cuadros recorriendo ambas curvas y devuelve las estadísticas"""
+    import glm
+    import pygame
+    from mundo import Mundo
+    import recursos
+    import sistemas_renderizado
+
+    pygame.init()
+    contexto = contexto_offscreen.ContextoOffscreen()
+    mundo = Mundo(glm.vec2(contexto.ancho, contexto.alto), nivel, semilla=semilla)
+    # Sin ventana no hay buffer que intercambiar: el contexto espera a la GPU al final del cuadro
+    mundo.sistemas_cuadro = [sistema for sistema in mundo.sistemas_cuadro
+                             if not isinstance(sistema, sistemas_renderizado.SistemaFinCuadro)]
+    # La cámara libre la mueve el recorrido, no las secuencias del juego
+    mundo.estado = recursos.ESTADO_EJECUTANDO
+    mundo.id_camara = mundo.cam_libre
+    mundo.controles.modo_control = recursos.ControlJuego.MODO_CAMARA_LIBRE
+    mundo.curva_victoria = mundo.crear_curva_victoria()
+    if carpeta_capturas:
+        os.makedirs(carpeta_capturas, exist_ok=True)
+
+    contador = ContadorLlamadasGl()
+    contador.instalar()
+    tiempos = []
+    llamadas_dibujo = []
+    llamadas_gl = []
+    try:
+        for cuadro in range(cuadros):
+            posicionar_camara(mundo, cuadro, cuadros)
+            total_antes, dibujo_antes = contador.total(), contador.dibujo()
+            inicio = time.perf_counter()
+            mundo.tiempo += PASO_CUADRO
+            mundo.renderizar(1.0, PASO_CUADRO)
+            contexto.terminar_cuadro()
+            tiempos.append(time.perf_counter() - inicio)
+            llamadas_dibujo.append(contador.dibujo() - dibujo_antes)
+            llamadas_gl.append(contador.total() - total_antes)
+            if carpeta_capturas and cuadro % cada == 0:
+                guardar_captura(contexto, os.path.join(carpeta_capturas, f"nivel{nivel}_cuadro{cuadro:05d}.png"))
+    finally:
+        contador.desinstalar()
+        mundo.limpiar()
+        contexto.liberar()
+
+    fps = [1.0 / tiempo for tiempo in tiempos]
+    return {
+        "nivel": nivel,
+        "cuadros": cuadros,
+        "plataforma": contexto.plataforma,
+        "fps_medio": len(tiempos) / sum(tiempos),
+        "fps_p1": percentil(fps, 1),
+        "fps_p5": percentil(fps, 5),
+        "fps_p50": percentil(fps, 50),
+        "ms_cuadro_p50": percentil(tiempos, 50) * 1000.0,
+        "ms_cuadro_p95": percentil(tiempos, 95) * 1000.0,
+        "ms_cuadro_p99": percentil(tiempos, 99) * 1000.0,
+        "llamadas_dibujo_por_cuadro": sum(llamadas_dibujo) / len(llamadas_dibujo),
+        "llamadas_gl_por_cuadro": sum(llamadas_gl) / len(llamadas_gl),
+        "llamadas_gl_mas_frecuentes": dict(contador.conteos.most_common(10)),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de renderizado sin ventana")
+    parser.add_argument("--nivel", type=int, default=1)
+    parser.add_argument("--cuadros", type=int, default=600)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--plataforma", choices=("egl", "osmesa"), default="egl")
+    parser.add_argument("--capturas", metavar="CARPETA", help="guarda un PNG cada --cada cuadros")
+    parser.add_argument("--cada", type=int, default=60)
+    parser.add_argument("--json", metavar="RUTA", help="guarda las estadísticas en JSON")
+    argumentos = parser.parse_args()
+
+    # Antes de que cualquier módulo del juego importe OpenGL
+    contexto_offscreen.preparar_plataforma(argumentos.plataforma)
+    os.chdir(CARPETA_PROYECTO)
+
+    estadisticas = ejecutar_recorrido(argumentos.nivel, argumentos.cuadros, argumentos.semilla,
+                                      argumentos.capturas, argumentos.cada)
+    for clave, valor in estadisticas.items():
+        print(f"{clave}: {valor}")
+    if argumentos.json:
+        with open(argumentos.json, "w") as archivo:
+            json.dump(estadisticas, archivo, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Campo de flujo sobre el mapa del laberinto: una búsqueda en anchura (BFS) desde la
+celda del objetivo da la distancia de cada celda libre y, para cada una, el paso hacia
+la celda vecina más cercana al objetivo. Todos los perseguidores leen su dirección en
+O(1) y el campo solo se recalcula cuando el objetivo cambia de celda.
+"""
+from collections import deque
+import numpy as np
+
+class CampoFlujo:
+    """Distancias y direcciones hacia una celda objetivo del mapa de un Laberinto"""
+
+    # (fila, columna) de las cuatro celdas vecinas
+    VECINOS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+    SIN_CAMINO = -1
+
+    def __init__(self, laberinto):
+        self.laberinto = laberinto
+        self.libre = ~np.asarray(laberinto.mapa, dtype=bool)
+        self.filas, self.columnas = self.libre.shape
+        self.distancias = np.full(self.libre.shape, self.SIN_CAMINO, dtype=np.int32)
+        # Paso (fila, columna) hacia la vecina más cercana al objetivo; (0, 0) en el objetivo o sin camino
+        self.paso_fila = np.zeros(self.libre.shape, dtype=np.int8)
+        self.paso_columna = np.zeros(self.libre.shape, dtype=np.int8)
+        self.objetivo = None
+        self.recalculos = 0
+        self._libre_plano = self.libre.ravel().tolist()
+
+    def actualizar(self, objetivo):
+        """Recalcula el campo hacia la celda (fila, columna) si cambió. Devuelve True si se recalculó"""
+        if objetivo == self.objetivo:
+            return False
+        self.objetivo = objetivo
+        self.distancias = self._calcular_distancias(objetivo)
+        self._calcular_pasos()
+        self.recalculos += 1
+        return True
+
+    def _calcular_distancias(self, objetivo):
+        columnas = self.columnas
+        total = self.filas * columnas
+        libre = self._libre_plano
+        distancias = [self.SIN_CAMINO] * total
+        inicio = objetivo[0] * columnas + objetivo[1]
+        distancias[inicio] = 0
+        pendientes = deque([inicio])
+        # Los bordes del mapa siempre son pared, así que los vecinos de una celda libre están dentro
+        desplazamientos = (-columnas, columnas, -1, 1)
+        while pendientes:
+            actual = pendientes.popleft()
+            siguiente = distancias[actual] + 1
+            for desplazamiento in desplazamientos:
+                vecina = actual + desplazamiento
+                if 0 <= vecina < total and libre[vecina] and distancias[vecina] < 0:
+                    distancias[vecina] = siguiente
+                    pendientes.append(vecina)
+        return np.array(distancias, dtype=np.int32).reshape(self.filas, columnas)
+
+    def _calcular_pasos(self):
+        """Para cada celda elige (con NumPy, todo el mapa a la vez) la vecina de menor distancia"""
+        infinito = np.iinfo(np.int32).max
+        distancias = np.where(self.distancias < 0, infinito, self.distancias)
+        relleno = np.pad(distancias, 1, constant_values=infinito)
+        vecinas = np.stack([
+            relleno[1 + fila:1 + fila + self.filas, 1 + columna:1 + columna + self.columnas]
+            for fila, columna in self.VECINOS])
+        mejor = np.argmin(vecinas, axis=0)
+        mejora = np.take_along_axis(vecinas, mejor[None], axis=0)[0] < distancias
+        desplazamientos = np.array(self.VECINOS, dtype=np.int8)
+        self.paso_fila = np.where(mejora, desplazamientos[mejor, 0], 0).astype(np.int8)
+        self.paso_columna = np.where(mejora, desplazamientos[mejor, 1], 0).astype(np.int8)
+
+    def paso(self, fila, columna):
+        """(fila, columna) de la siguiente celda hacia el objetivo, o None en el objetivo o sin camino"""
+        paso_fila = self.paso_fila[fila, columna]
+        paso_columna = self.paso_columna[fila, columna]
+        if paso_fila == 0 and paso_columna == 0:
+            return None
+        return fila + int(paso_fila), columna + int(paso_columna)
+
+    def distancia(self, fila, columna):
+        """Celdas hasta el objetivo, o SIN_CAMINO"""
+        return int(self.distancias[fila, columna])
@@ -0,0 +1,62 @@
+import random
+from concurrent.futures import ThreadPoolExecutor, wait
+from cargador_glb import CargadorGlb
+from generador_fractales import FractalNube
+from laberinto import Laberinto
+
+class CargadorAsincrono:
+    """
+    Prepara en segundo plano (mientras se muestra el menú) todo lo que solo usa CPU:
+    lectura de los GLB, desenrollado de índices, decodificación de texturas,
+    generación del laberinto y geometría de las nubes fractales.
+    Las subidas a OpenGL siguen ocurriendo en el hilo principal al crear el Mundo.
+    """
+
+    MODELOS_GLB = [
+        "recursos/modelos/raton.glb",
+        "recursos/modelos/gato.glb",
+    ]
+
+    def __init__(self, ancho_laberinto=30, largo_laberinto=30, profundidad_nube=3, hilos=None, semilla=None):
+        # El Mundo adopta esta semilla para que el laberinto pregenerado sea el suyo
+        self.semilla = semilla if semilla is not None else random.randrange(2 ** 32)
+        self.ancho_laberinto = ancho_laberinto
+        self.largo_laberinto = largo_laberinto
+        self.ejecutor = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="carga")
+
+        self.tareas = [self.ejecutor.submit(CargadorGlb.precargar, archivo) for archivo in self.MODELOS_GLB]
+        self.tarea_laberinto = self.ejecutor.submit(self._generar_laberinto)
+        self.tareas.append(self.tarea_laberinto)
+        # Variantes de nube que el Mundo reparte entre las nubes del horizonte
+        for semilla in range(FractalNube.VARIANTES):
+            self.tareas.append(self.ejecutor.submit(FractalNube.precalcular, profundidad_nube, semilla, True))
+
+    def _generar_laberinto(self):
+        laberinto = Laberinto(ancho=self.ancho_laberinto, largo=self.largo_laberinto, rng=random.Random(self.semilla))
+        laberinto.generar()
+        return laberinto
+
+    def listo(self):
+        """Indica si todas las tareas terminaron (no bloquea)"""
+        return all(tarea.done() for tarea in self.tareas)
+
+    def esperar(self):
+        """Bloquea hasta que todas las tareas terminen. Los fallos solo se reportan:
+        el recurso afectado se vuelve a cargar de forma síncrona más tarde."""
+        wait(self.tareas)
+        for tarea in self.tareas:
+            error = tarea.exception()
+            if error is not None:
+                print(f"Fallo en la carga en segundo plano: {error}")
+
+    def obtener_laberinto(self, ancho, largo):
+        """Devuelve el laberinto pregenerado si coincide con el tamaño pedido"""
+        if self.tarea_laberinto.exception() is not None:
+            return None
+        laberinto = self.tarea_laberinto.result()
+        if laberinto.ancho != ancho or laberinto.alto != largo:
+            return None
+        return laberinto
+
+    def cerrar(self):
+        self.ejecutor.shutdown(wait=True)
@@ -1,195 +1,299 @@
-
-import numpy as np
-import sys
-import io
-from utilidades_gltf import UtilidadesGltf
-import pygame
-from OpenGL import GL as gl
-
-class CargadorGlb:
-    # Clase para cargar archivos GLB (modelos 3D con texturas y animaciones)
-    def __init__(self, archivo):
-        self.archivo = archivo
-        self.vertices = []
-        self.normales = []
-        self.coordenadas_textura = []
-        self.colores = []
-        self.articulaciones = []
-        self.pesos = []
-        
-        # Datos de animacion de huesos
-        self.matrices_huesos = None
-        self.nodos_huesos = None
-        self.datos_json = None
-        self.imagenes = []
-        self.materiales = []
-        self.indice_textura = None
-
-    def cargar(self):
-        # Intentar cargar el archivo
-        try:
-            # Intentar ruta relativa primero
-            ruta = sys.path[0] + "/" + self.archivo
-            
-            # Cargar todos los datos manualmente
-            modelo_cargado = UtilidadesGltf.cargar_modelo(ruta)
-            
-            self.matrices_huesos = modelo_cargado['inverse_bind_matrices']
-            self.nodos_huesos = modelo_cargado['joint_nodes']
-            self.datos_json = modelo_cargado['json']
-            self.imagenes = modelo_cargado.get('images', [])
-            self.materiales = modelo_cargado.get('materials', [])
-            
-            # Procesar primitivas
-            for primitiva in modelo_cargado['primitives']:
-                # Obtener datos
-                posiciones = primitiva['positions']
-                normales = primitiva['normals']
-                coordenadas_textura = primitiva['uvs']
-                articulaciones = primitiva['joints']
-                pesos = primitiva['weights']
-                indices = primitiva['indices']
-                
-                # Color por defecto (blanco)
-                r, g, b = 1.0, 1.0, 1.0
-                
-                # Verificar color del material
-                indice_material = primitiva.get('material')
-                if indice_material is not None and indice_material < len(self.materiales):
-                    material = self.materiales[indice_material]
-                    color_material = material['baseColor']
-                    r, g, b = color_material[0], color_material[1], color_material[2]
-                    
-                    # Guardar índice de textura si existe
-                    if 'baseColorTextureIndex' in material:
-                        self.indice_textura = material['baseColorTextureIndex']
-                
-                # Desenrollar índices
-                if indices is not None:
-                    # Aplanar índices si son (N, 1)
-                    indices = indices.flatten()
-                    for i in indices:
-                        # Posición
-                        self.vertices.extend(posiciones[i])
-                        # Normal
-                        if normales is not None:
-                            self.normales.extend(normales[i])
-                        else:
-                            self.normales.extend([0, 1, 0])
-                        # UV
-                        if coordenadas_textura is not None:
-                            self.coordenadas_textura.extend(coordenadas_textura[i])
-                        else:
-                            self.coordenadas_textura.extend([0.0, 0.0])
-                        # Color
-                        self.colores.extend([r, g, b])
-                        # Skinning
-                        if articulaciones is not None and pesos is not None:
-                            self.articulaciones.extend(articulaciones[i])
-                            self.pesos.extend(pesos[i])
-                else:
-                    # No indexado, solo iterar posiciones
-                    total = len(posiciones)
-                    for i in range(total):
-                        self.vertices.extend(posiciones[i])
-                        if normales is not None:
-                            self.normales.extend(normales[i])
-                        else:
-                            self.normales.extend([0, 1, 0])
-                        if coordenadas_textura is not None:
-                            self.coordenadas_textura.extend(coordenadas_textura[i])
-                        else:
-                            self.coordenadas_textura.extend([0.0, 0.0])
-                        self.colores.extend([r, g, b])
-                        if articulaciones is not None and pesos is not None:
-                            self.articulaciones.extend(articulaciones[i])
-                            self.pesos.extend(pesos[i])
-
-
-
-        except Exception as e:
-            print(f"Fallo al cargar GLB {self.archivo}: {e}")
-            raise e
-
-        return self._crear_modelo()
-
-    def _crear_modelo(self):
-        from clases_renderizado import Modelo3D
-        # Crea el modelo 3D con los datos cargados
-        num_vertices = len(self.vertices) // 3
-        modelo = Modelo3D(num_vertices)
-        
-        modelo.cargar_datos_posicion(self.vertices)
-        modelo.cargar_datos_normal(self.normales)
-        
-        if self.coordenadas_textura:
-            modelo.cargar_datos_uv(self.coordenadas_textura)
-            
-        if self.colores:
-             modelo.cargar_datos_color(self.colores)
-        else:
-             # Blanco por defecto
-             modelo.cargar_datos_color([1.0] * (num_vertices * 3))
-             
-        if self.articulaciones and self.pesos:
-            modelo.cargar_datos_skinning(self.articulaciones, self.pesos)
-            
-        return modelo
-
-    def extraer_textura(self, flip_y=False):
-        # Extrae la textura del archivo GLB y la sube a OpenGL
-        if not self.imagenes:
-            return None
-        
-        num_imagen = 0
-        if self.indice_textura is not None and self.indice_textura < len(self.imagenes):
-            num_imagen = self.indice_textura
-
-        try:
-            datos_imagen = self.imagenes[num_imagen]
-            if datos_imagen is None:
-                return None
-            
-            bytes_imagen = datos_imagen['data']
-            
-            # Cargar imagen con Pygame
-            stream = io.BytesIO(bytes_imagen)
-            imagen = pygame.image.load(stream)
-            
-            if flip_y:
-                imagen = pygame.transform.flip(imagen, False, True)
-                
-            ancho, alto = imagen.get_size()
-            bytes_textura = pygame.image.tostring(imagen, "RGB", False)
-            
-            # Generar textura OpenGL
-            textura_id = gl.glGenTextures(1)
-            gl.glBindTexture(gl.GL_TEXTURE_2D, textura_id)
-            gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGB, ancho, alto, 0, gl.GL_RGB, gl.GL_UNSIGNED_BYTE, bytes_textura)
-            
-            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
-            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
-            
-
-            return textura_id
-
-        except Exception as e:
-            print(f"Fallo al extraer textura de GLB {self.archivo}: {e}")
-            return None
-
-    def extraer_color(self):
-        # Extrae el color del primer material
-        if self.materiales:
-            color = self.materiales[0]['baseColor']
-            return (color[0], color[1], color[2])
-        return None
-
-    def extraer_esqueleto(self):
-        # Extrae los datos de los huesos para animacion
-        if self.matrices_huesos is not None:
-            return {
-                'inverse_bind_matrices': self.matrices_huesos,
-                'joint_nodes': self.nodos_huesos,
-                'json': self.datos_json
-            }
-        return None
+import numpy as np
+import os
+import sys
+import io
+import threading
+from utilidades_gltf import UtilidadesGltf
+import pygame
+from OpenGL import GL as gl
+from cola_subida import ColaSubidaGpu
+
+def decimar_por_agrupamiento(posiciones, resolucion):
+    """
+    Simplifica una malla de triangulos sin indices (3 vertices seguidos por triangulo)
+    agrupando los vertices por celdas de una rejilla uniforme. Cada vertice se mueve al
+    promedio de su celda y se descartan los triangulos que quedan degenerados.
+    Devuelve las nuevas posiciones (N, 3) y el indice del vertice original de cada una.
+    """
+    if len(posiciones) == 0:
+        return posiciones, np.zeros(0, dtype=np.int64)
+    minimo = posiciones.min(axis=0)
+    lado = float((posiciones.max(axis=0) - minimo).max()) / resolucion
+    if lado <= 0.0:
+        return posiciones, np.arange(len(posiciones))
+
+    celdas = np.minimum(((posiciones - minimo) / lado).astype(np.int64), resolucion - 1)
+    claves = (celdas[:, 0] * resolucion + celdas[:, 1]) * resolucion + celdas[:, 2]
+    _, grupo = np.unique(claves, return_inverse=True)
+    grupo = grupo.ravel()
+
+    # Posicion promedio de cada celda
+    cantidad = np.bincount(grupo)
+    promedio = np.zeros((len(cantidad), 3), dtype=np.float64)
+    np.add.at(promedio, grupo, posiciones)
+    promedio /= cantidad[:, np.newaxis]
+
+    triangulos = grupo.reshape(-1, 3)
+    validos = (triangulos[:, 0] != triangulos[:, 1]) & (triangulos[:, 1] != triangulos[:, 2]) & (triangulos[:, 0] != triangulos[:, 2])
+    originales = np.arange(len(posiciones)).reshape(-1, 3)[validos].ravel()
+    return promedio[grupo[originales]].astype(np.float32), originales
+
+class CargadorGlb:
+    # Clase para cargar archivos GLB (modelos 3D con texturas y animaciones)
+
+    # Datos ya decodificados en segundo plano (ruta -> CargadorGlb)
+    _decodificados = {}
+    _bloqueo_decodificados = threading.Lock()
+
+    def __init__(self, archivo):
+        self.archivo = archivo
+        self.vertices = []
+        self.normales = []
+        self.coordenadas_textura = []
+        self.colores = []
+        self.articulaciones = []
+        self.pesos = []
+        
+        # Datos de animacion de huesos
+        self.matrices_huesos = None
+        self.nodos_huesos = None
+        self.datos_json = None
+        self.imagenes = []
+        self.materiales = []
+        self.indice_textura = None
+
+        # Imagen de la textura ya decodificada (superficie de Pygame)
+        self.imagen_textura = None
+        self.decodificado = False
+
+    @staticmethod
+    def _ruta_completa(archivo):
+        # Intentar ruta relativa primero
+        return os.path.normpath(sys.path[0] + "/" + archivo)
+
+    @classmethod
+    def precargar(cls, archivo):
+        # Decodifica el archivo sin tocar OpenGL para que cargar() solo tenga que subir los datos.
+        # Se puede llamar desde cualquier hilo.
+        cargador = cls(archivo)
+        cargador.decodificar()
+        with cls._bloqueo_decodificados:
+            cls._decodificados[cls._ruta_completa(archivo)] = cargador
+        return cargador
+
+    def _tomar_precargado(self):
+        # Reutiliza los datos de precargar() si existen
+        with self._bloqueo_decodificados:
+            precargado = self._decodificados.get(self._ruta_completa(self.archivo))
+        if precargado is None:
+            return False
+        self.__dict__.update(precargado.__dict__)
+        return True
+
+    @classmethod
+    def obtener_decodificado(cls, archivo):
+        # Devuelve los datos decodificados del archivo (de la caché o leyéndolo ahora)
+        cargador = cls(archivo)
+        if not cargador._tomar_precargado():
+            cargador = cls.precargar(archivo)
+        return cargador
+
+    def cargar(self):
+        # Decodificar en este hilo solo si nadie lo hizo antes en segundo plano
+        if not self.decodificado and not self._tomar_precargado():
+            self.decodificar()
+        cola = ColaSubidaGpu.actual()
+        if cola is None:
+            return self._crear_modelo()
+        with cola.recurso(self.archivo):
+            return self._crear_modelo()
+
+    def decodificar(self):
+        # Parte de la carga que solo usa CPU: leer el GLB, desenrollar indices y decodificar la imagen
+        try:
+            ruta = self._ruta_completa(self.archivo)
+            
+            # Cargar todos los datos manualmente
+            modelo_cargado = UtilidadesGltf.cargar_modelo(ruta)
+            
+            self.matrices_huesos = modelo_cargado['inverse_bind_matrices']
+            self.nodos_huesos = modelo_cargado['joint_nodes']
+            self.datos_json = modelo_cargado['json']
+            self.imagenes = modelo_cargado.get('images', [])
+            self.materiales = modelo_cargado.get('materials', [])
+            
+            # Procesar primitivas
+            for primitiva in modelo_cargado['primitives']:
+                # Obtener datos
+                posiciones = np.asarray(primitiva['positions'])
+                normales = primitiva['normals']
+                coordenadas_textura = primitiva['uvs']
+                articulaciones = primitiva['joints']
+                pesos = primitiva['weights']
+                indices = primitiva['indices']
+                
+                # Color por defecto (blanco)
+                r, g, b = 1.0, 1.0, 1.0
+                
+                # Verificar color del material
+                indice_material = primitiva.get('material')
+                if indice_material is not None and indice_material < len(self.materiales):
+                    material = self.materiales[indice_material]
+                    color_material = material['baseColor']
+                    r, g, b = color_material[0], color_material[1], color_material[2]
+                    
+                    # Guardar índice de textura si existe
+                    if 'baseColorTextureIndex' in material:
+                        self.indice_textura = material['baseColorTextureIndex']
+                
+                # Desenrollar índices de una sola vez con NumPy
+                if indices is not None:
+                    # Aplanar índices si son (N, 1)
+                    indices = np.asarray(indices).flatten()
+                else:
+                    # No indexado, solo recorrer posiciones
+                    indices = np.arange(len(posiciones))
+                total = len(indices)
+
+                self.vertices.extend(posiciones[indices].ravel().tolist())
+                if normales is not None:
+                    self.normales.extend(np.asarray(normales)[indices].ravel().tolist())
+                else:
+                    self.normales.extend([0, 1, 0] * total)
+                if coordenadas_textura is not None:
+                    self.coordenadas_textura.extend(np.asarray(coordenadas_textura)[indices].ravel().tolist())
+                else:
+                    self.coordenadas_textura.extend([0.0, 0.0] * total)
+                self.colores.extend([r, g, b] * total)
+                # Skinning
+                if articulaciones is not None and pesos is not None:
+                    self.articulaciones.extend(np.asarray(articulaciones)[indices].ravel().tolist())
+                    self.pesos.extend(np.asarray(pesos)[indices].ravel().tolist())
+
+            self.imagen_textura = self._decodificar_imagen()
+
+        except Exception as e:
+            print(f"Fallo al cargar GLB {self.archivo}: {e}")
+            raise e
+
+        self.decodificado = True
+
+    def _decodificar_imagen(self):
+        # Decodifica la imagen de la textura (PNG/JPG) a una superficie de Pygame
+        if not self.imagenes:
+            return None
+        
+        num_imagen = 0
+        if self.indice_textura is not None and self.indice_textura < len(self.imagenes):
+            num_imagen = self.indice_textura
+
+        try:
+            datos_imagen = self.imagenes[num_imagen]
+            if datos_imagen is None:
+                return None
+            
+            # Cargar imagen con Pygame
+            stream = io.BytesIO(datos_imagen['data'])
+            return pygame.image.load(stream)
+
+        except Exception as e:
+            print(f"Fallo al decodificar textura de GLB {self.archivo}: {e}")
+            return None
+
+    def _crear_modelo(self):
+        from clases_renderizado import Modelo3D
+        # Crea el modelo 3D con los datos cargados
+        num_vertices = len(self.vertices) // 3
+        modelo = Modelo3D(num_vertices)
+        
+        modelo.cargar_datos_posicion(self.vertices)
+        modelo.cargar_datos_normal(self.normales)
+        
+        if len(self.coordenadas_textura):
+            modelo.cargar_datos_uv(self.coordenadas_textura)
+            
+        if len(self.colores):
+             modelo.cargar_datos_color(self.colores)
+        else:
+             # Blanco por defecto
+             modelo.cargar_datos_color([1.0] * (num_vertices * 3))
+             
+        if len(self.articulaciones) and len(self.pesos):
+            modelo.cargar_datos_skinning(self.articulaciones, self.pesos)
+            
+        return modelo
+
+    def crear_modelo_decimado(self, resolucion):
+        # Crea una version simplificada del modelo (para niveles de detalle lejanos)
+        # agrupando los vertices en una rejilla de resolucion^3 celdas
+        posiciones = np.asarray(self.vertices, dtype=np.float32).reshape(-1, 3)
+        posiciones_reducidas, originales = decimar_por_agrupamiento(posiciones, resolucion)
+
+        reducido = CargadorGlb(self.archivo)
+        reducido.__dict__.update(self.__dict__)
+        reducido.vertices = posiciones_reducidas.ravel()
+        # Los demas atributos se toman de la esquina original de cada triangulo que sobrevive
+        reducido.normales = np.asarray(self.normales, dtype=np.float32).reshape(-1, 3)[originales].ravel()
+        reducido.colores = np.asarray(self.colores, dtype=np.float32).reshape(-1, 3)[originales].ravel()
+        if len(self.coordenadas_textura):
+            reducido.coordenadas_textura = np.asarray(self.coordenadas_textura, dtype=np.float32).reshape(-1, 2)[originales].ravel()
+        if len(self.articulaciones) and len(self.pesos):
+            reducido.articulaciones = np.asarray(self.articulaciones, dtype=np.int32).reshape(-1, 4)[originales].ravel()
+            reducido.pesos = np.asarray(self.pesos, dtype=np.float32).reshape(-1, 4)[originales].ravel()
+
+        cola = ColaSubidaGpu.actual()
+        if cola is None:
+            return reducido._crear_modelo()
+        with cola.recurso(f"{self.archivo} (detalle {resolucion})"):
+            return reducido._crear_modelo()
+
+    def extraer_textura(self, flip_y=False):
+        # Sube a OpenGL la textura ya decodificada del archivo GLB
+        imagen = self.imagen_textura
+        if imagen is None and not self.decodificado:
+            imagen = self._decodificar_imagen()
+        if imagen is None:
+            return None
+
+        try:
+            ancho, alto = imagen.get_size()
+            # tostring con flip equivale a voltear la superficie en Y
+            bytes_textura = pygame.image.tostring(imagen, "RGB", flip_y)
+            
+            # Generar textura OpenGL
+            textura_id = gl.glGenTextures(1)
+            gl.glBindTexture(gl.GL_TEXTURE_2D, textura_id)
+            cola = ColaSubidaGpu.actual()
+            if cola is None:
+                gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGB, ancho, alto, 0, gl.GL_RGB, gl.GL_UNSIGNED_BYTE, bytes_textura)
+            else:
+                # Los píxeles se suben por franjas en los próximos cuadros
+                with cola.recurso(self.archivo + " (textura)"):
+                    cola.agregar_textura(textura_id, ancho, alto, gl.GL_RGB, bytes_textura)
+            
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
+            
+
+            return textura_id
+
+        except Exception as e:
+            print(f"Fallo al extraer textura de GLB {self.archivo}: {e}")
+            return None
+
+    def extraer_color(self):
+        # Extrae el color del primer material
+        if self.materiales:
+            color = self.materiales[0]['baseColor']
+            return (color[0], color[1], color[2])
+        return None
+
+    def extraer_esqueleto(self):
+        # Extrae los datos de los huesos para animacion
+        if self.matrices_huesos is not None:
+            return {
+                'inverse_bind_matrices': self.matrices_huesos,
+                'joint_nodes': self.nodos_huesos,
+                'json': self.datos_json
+            }
+        return None
@@ -0,0 +1,145 @@
+import ctypes
+import time
+from contextlib import contextmanager
+from OpenGL import GL as gl
+
+class ColaSubidaGpu:
+    """
+    Cola de subidas a la GPU repartidas entre varios cuadros.
+    Mientras está activa, ContenedorVertices y CargadorGlb encolan sus
+    glBufferData/glTexImage2D en lugar de ejecutarlos, y procesar() ejecuta
+    solo lo que cabe en el presupuesto por cuadro (milisegundos y/o bytes).
+    """
+
+    # Cola que reciben las subidas en este momento (None = subir de inmediato)
+    _activa = None
+
+    # Alto máximo (en bytes) de cada franja de textura subida por el PBO
+    BYTES_FRANJA_TEXTURA = 256 * 1024
+
+    def __init__(self, presupuesto_ms=4.0, presupuesto_bytes=None):
+        self.presupuesto_ms = presupuesto_ms
+        self.presupuesto_bytes = presupuesto_bytes
+        self.tareas = []
+        self.indice = 0
+        self.bytes_totales = 0
+        self.bytes_subidos = 0
+        self.recurso_actual = None
+        # Tiempos por recurso: nombre -> [bytes, milisegundos, subidas]
+        self.tiempos = {}
+        self._pbo = None
+
+    @classmethod
+    def actual(cls):
+        return cls._activa
+
+    def activar(self):
+        ColaSubidaGpu._activa = self
+
+    def desactivar(self):
+        if ColaSubidaGpu._activa is self:
+            ColaSubidaGpu._activa = None
+
+    @contextmanager
+    def recurso(self, nombre):
+        """Agrupa las subidas encoladas dentro del bloque bajo un mismo nombre de recurso"""
+        anterior = self.recurso_actual
+        self.recurso_actual = nombre
+        try:
+            yield
+        finally:
+            self.recurso_actual = anterior
+
+    def agregar(self, bytes_estimados, funcion, nombre=None):
+        """Encola una subida. 'funcion' se ejecuta más tarde, en el hilo principal"""
+        nombre = self.recurso_actual or nombre or "sin nombre"
+        self.tareas.append((nombre, bytes_estimados, funcion))
+        self.bytes_totales += bytes_estimados
+
+    def agregar_textura(self, id_textura, ancho, alto, formato, datos):
+        """Encola la subida de una textura en franjas de filas a través de un PBO"""
+        bytes_fila = ancho * (3 if formato == gl.GL_RGB else 4)
+        filas_franja = max(1, self.BYTES_FRANJA_TEXTURA // bytes_fila)
+
+        def reservar():
+            gl.glBindTexture(gl.GL_TEXTURE_2D, id_textura)
+            gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, formato, ancho, alto, 0, formato, gl.GL_UNSIGNED_BYTE, None)
+        self.agregar(0, reservar, "textura")
+
+        for fila in range(0, alto, filas_franja):
+            filas = min(filas_franja, alto - fila)
+            inicio = fila * bytes_fila
+            franja = datos[inicio:inicio + filas * bytes_fila]
+            self.agregar(len(franja), self._crear_subida_franja(id_textura, fila, ancho, filas, formato, franja), "textura")
+
+    def _crear_subida_franja(self, id_textura, fila, ancho, filas, formato, franja):
+        def subir():
+            if self._pbo is None:
+                self._pbo = gl.glGenBuffers(1)
+            gl.glBindBuffer(gl.GL_PIXEL_UNPACK_BUFFER, self._pbo)
+            # Huérfano + copia: el controlador no tiene que esperar a la franja anterior
+            gl.glBufferData(gl.GL_PIXEL_UNPACK_BUFFER, len(franja), None, gl.GL_STREAM_DRAW)
+            gl.glBufferSubData(gl.GL_PIXEL_UNPACK_BUFFER, 0, len(franja), franja)
+            gl.glBindTexture(gl.GL_TEXTURE_2D, id_textura)
+            gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1)
+            gl.glTexSubImage2D(gl.GL_TEXTURE_2D, 0, 0, fila, ancho, filas, formato, gl.GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+            gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 4)
+            gl.glBindBuffer(gl.GL_PIXEL_UNPACK_BUFFER, 0)
+        return subir
+
+    def procesar(self):
+        """Ejecuta subidas hasta agotar el presupuesto del cuadro (siempre al menos una)"""
+        inicio = time.perf_counter()
+        bytes_cuadro = 0
+        while self.indice < len(self.tareas):
+            nombre, bytes_tarea, funcion = self.tareas[self.indice]
+            if bytes_cuadro > 0:
+                if self.presupuesto_bytes is not None and bytes_cuadro + bytes_tarea > self.presupuesto_bytes:
+                    break
+                if (time.perf_counter() - inicio) * 1000.0 >= self.presupuesto_ms:
+                    break
+
+            inicio_tarea = time.perf_counter()
+            funcion()
+            duracion = (time.perf_counter() - inicio_tarea) * 1000.0
+
+            registro = self.tiempos.setdefault(nombre, [0, 0.0, 0])
+            registro[0] += bytes_tarea
+            registro[1] += duracion
+            registro[2] += 1
+
+            # Liberar la referencia a los datos ya subidos
+            self.tareas[self.indice] = None
+            self.indice += 1
+            bytes_cuadro += max(bytes_tarea, 1)
+            self.bytes_subidos += bytes_tarea
+
+    def terminada(self):
+        return self.indice >= len(self.tareas)
+
+    def progreso(self):
+        """Fracción (0.0 a 1.0) de los bytes ya subidos"""
+        if self.bytes_totales == 0:
+            return 1.0 if self.terminada() else 0.0
+        return self.bytes_subidos / self.bytes_totales
+
+    def vaciar(self):
+        """Sube todo lo pendiente sin respetar el presupuesto"""
+        while not self.terminada():
+            nombre, bytes_tarea, funcion = self.tareas[self.indice]
+            self.tareas[self.indice] = None
+            self.indice += 1
+            funcion()
+            self.bytes_subidos += bytes_tarea
+
+    def imprimir_tiempos(self):
+        """Muestra los tiempos de subida de cada recurso"""
+        print("Subidas a la GPU:")
+        for nombre, (bytes_recurso, milisegundos, subidas) in sorted(self.tiempos.items(), key=lambda par: -par[1][1]):
+            print(f"  {nombre}: {bytes_recurso / 1024.0:.1f} KB en {subidas} subidas, {milisegundos:.2f} ms")
+
+    def limpiar(self):
+        self.desactivar()
+        if self._pbo is not None:
+            gl.glDeleteBuffers(1, [self._pbo])
+            self._pbo = None
@@ -0,0 +1,78 @@
+import bisect
+from abc import ABC, abstractmethod
+import glm
+import numpy as np
+
+class CurvaParametrica(ABC):
+    """
+    Base de las curvas de cámara. Las subclases implementan calcular_puntos(ts) y
+    calcular_derivadas(ts) con NumPy; a partir de ellas se precalcula una tabla de
+    longitud de arco para recorrer la curva a velocidad constante.
+    """
+
+    # Muestras de la tabla de longitud de arco
+    MUESTRAS_TABLA = 512
+
+    @abstractmethod
+    def calcular_puntos(self, ts):
+        """Puntos de la curva para un arreglo de t (0.0 a 1.0). Devuelve un arreglo (N, 3)"""
+
+    @abstractmethod
+    def calcular_derivadas(self, ts):
+        """Derivadas respecto a t para un arreglo de t. Devuelve un arreglo (N, 3)"""
+
+    @staticmethod
+    def _a_arreglo(puntos):
+        return np.array([[punto.x, punto.y, punto.z] for punto in puntos], dtype=np.float64)
+
+    def _tabla(self):
+        """(valores de t, longitud acumulada) muestreados una sola vez"""
+        tabla = getattr(self, "_tabla_longitud", None)
+        if tabla is None:
+            ts = np.linspace(0.0, 1.0, self.MUESTRAS_TABLA)
+            puntos = self.calcular_puntos(ts)
+            acumulada = np.concatenate(([0.0], np.cumsum(np.linalg.norm(np.diff(puntos, axis=0), axis=1))))
+            tabla = (ts, acumulada, ts.tolist(), acumulada.tolist())
+            self._tabla_longitud = tabla
+        return tabla
+
+    def invalidar_tabla(self):
+        """Llamar después de mover los puntos de control (descarta la tabla y los coeficientes)"""
+        self._tabla_longitud = None
+        self._coeficientes_cache = None
+
+    def longitud(self):
+        return float(self._tabla()[1][-1])
+
+    def parametro(self, fraccion):
+        """t que corresponde a recorrer 'fraccion' (0.0 a 1.0) de la longitud de la curva"""
+        _ts, _acumulada, ts, acumulada = self._tabla()
+        objetivo = min(max(fraccion, 0.0), 1.0) * acumulada[-1]
+        indice = min(max(bisect.bisect_left(acumulada, objetivo), 1), len(acumulada) - 1)
+        tramo = acumulada[indice] - acumulada[indice - 1]
+        mezcla = (objetivo - acumulada[indice - 1]) / tramo if tramo > 0 else 0.0
+        return ts[indice - 1] + (ts[indice] - ts[indice - 1]) * mezcla
+
+    def parametros(self, fracciones):
+        """Versión de parametro() para un arreglo de fracciones"""
+        ts, acumulada, _ts, _acumulada = self._tabla()
+        return np.interp(np.clip(fracciones, 0.0, 1.0) * acumulada[-1], acumulada, ts)
+
+    def punto_uniforme(self, fraccion):
+        """Punto tras recorrer 'fraccion' de la longitud (velocidad constante)"""
+        x, y, z = self.calcular_puntos(np.array([self.parametro(fraccion)]))[0]
+        return glm.vec3(x, y, z)
+
+    def tangente_uniforme(self, fraccion):
+        """Dirección (normalizada) de la curva tras recorrer 'fraccion' de la longitud"""
+        return self.calcular_tangente(self.parametro(fraccion))
+
+    def calcular_tangente(self, t):
+        """Dirección normalizada de la curva en t"""
+        x, y, z = self.calcular_derivadas(np.array([t]))[0]
+        tangente = glm.vec3(x, y, z)
+        return glm.normalize(tangente) if glm.length(tangente) > 0.0 else tangente
+
+    def puntos_uniformes(self, fracciones):
+        """Puntos a velocidad constante para un arreglo de fracciones. Devuelve (N, 3)"""
+        return self.calcular_puntos(self.parametros(fracciones))
@@ -1,40 +1,119 @@
-import glm
-
-class CurvaBezier:
-    """Clase para crear movimientos curvos suaves (Curva de Bézier Cúbica)"""
-    
-    def __init__(self, punto_inicio, control_1, control_2, punto_final):
-        self.inicio = punto_inicio
-        self.control_1 = control_1
-        self.control_2 = control_2
-        self.final = punto_final
-
-    def calcular_punto(self, tiempo):
-        """
-        Calcula una posición en la curva basada en el tiempo (0.0 a 1.0)
-        Fórmula: B(t) = (1-t)³P0 + 3(1-t)²tP1 + 3(1-t)t²P2 + t³P3
-        """
-        # Inverso del tiempo (lo que falta para terminar)
-        t = tiempo
-        u = 1 - t
-        
-        # Potencias para la fórmula
-        tt = t * t
-        uu = u * u
-        uuu = uu * u
-        ttt = tt * t
-
-        # Calcular la posición final sumando las influencias de cada punto
-        # 1. Influencia del punto de inicio (disminuye rápido)
-        parte_inicio = uuu * self.inicio
-        
-        # 2. Influencia del primer control (sube y baja al principio)
-        parte_control_1 = 3 * uu * t * self.control_1
-        
-        # 3. Influencia del segundo control (sube y baja al final)
-        parte_control_2 = 3 * u * tt * self.control_2
-        
-        # 4. Influencia del punto final (aumenta rápido al final)
-        parte_final = ttt * self.final
-
-        return parte_inicio + parte_control_1 + parte_control_2 + parte_final
+import glm
+import numpy as np
+from curva_parametrica import CurvaParametrica
+
+class CurvaBezier(CurvaParametrica):
+    """Clase para crear movimientos curvos suaves (Curva de Bézier Cúbica)"""
+    
+    def __init__(self, punto_inicio, control_1, control_2, punto_final):
+        self.inicio = punto_inicio
+        self.control_1 = control_1
+        self.control_2 = control_2
+        self.final = punto_final
+
+    def calcular_punto(self, tiempo):
+        """
+        Calcula una posición en la curva basada en el tiempo (0.0 a 1.0)
+        Fórmula: B(t) = (1-t)³P0 + 3(1-t)²tP1 + 3(1-t)t²P2 + t³P3
+        """
+        # Inverso del tiempo (lo que falta para terminar)
+        t = tiempo
+        u = 1 - t
+        
+        # Potencias para la fórmula
+        tt = t * t
+        uu = u * u
+        uuu = uu * u
+        ttt = tt * t
+
+        # Calcular la posición final sumando las influencias de cada punto
+        # 1. Influencia del punto de inicio (disminuye rápido)
+        parte_inicio = uuu * self.inicio
+        
+        # 2. Influencia del primer control (sube y baja al principio)
+        parte_control_1 = 3 * uu * t * self.control_1
+        
+        # 3. Influencia del segundo control (sube y baja al final)
+        parte_control_2 = 3 * u * tt * self.control_2
+        
+        # 4. Influencia del punto final (aumenta rápido al final)
+        parte_final = ttt * self.final
+
+        return parte_inicio + parte_control_1 + parte_control_2 + parte_final
+
+    # Matriz base de Bézier cúbica: B(t) = [1 t t² t³] · M · [P0 P1 P2 P3]
+    MATRIZ_BASE = np.array([
+        [1.0, 0.0, 0.0, 0.0],
+        [-3.0, 3.0, 0.0, 0.0],
+        [3.0, -6.0, 3.0, 0.0],
+        [-1.0, 3.0, -3.0, 1.0],
+    ])
+
+    def _controles(self):
+        return self._a_arreglo((self.inicio, self.control_1, self.control_2, self.final))
+
+    def _coeficientes(self):
+        """Coeficientes polinómicos (4, 3), calculados una sola vez (ver invalidar_tabla)"""
+        coeficientes = getattr(self, "_coeficientes_cache", None)
+        if coeficientes is None:
+            coeficientes = self.MATRIZ_BASE @ self._controles()
+            self._coeficientes_cache = coeficientes
+        return coeficientes
+
+    def calcular_puntos(self, ts):
+        """Misma fórmula que calcular_punto para muchos t a la vez. Devuelve un arreglo (N, 3)"""
+        t = np.asarray(ts, dtype=np.float64)[:, None]
+        c0, c1, c2, c3 = self._coeficientes()
+        # Horner: c0 + t(c1 + t(c2 + t·c3))
+        return c0 + t * (c1 + t * (c2 + t * c3))
+
+    def calcular_derivadas(self, ts):
+        """B'(t) = c1 + 2t·c2 + 3t²·c3 con los mismos coeficientes"""
+        t = np.asarray(ts, dtype=np.float64)[:, None]
+        _c0, c1, c2, c3 = self._coeficientes()
+        return c1 + t * (2 * c2 + t * 3 * c3)
+
+    def subdividir(self, t=0.5):
+        """
+        Parte la curva en t con de Casteljau. Devuelve (izquierda, derecha), dos CurvaBezier
+        que juntas recorren exactamente la misma curva.
+        """
+        p0, p1, p2, p3 = self.inicio, self.control_1, self.control_2, self.final
+        p01 = glm.mix(p0, p1, t)
+        p12 = glm.mix(p1, p2, t)
+        p23 = glm.mix(p2, p3, t)
+        p012 = glm.mix(p01, p12, t)
+        p123 = glm.mix(p12, p23, t)
+        medio = glm.mix(p012, p123, t)
+        return CurvaBezier(p0, p01, p012, medio), CurvaBezier(medio, p123, p23, p3)
+
+    def aplanar(self, tolerancia=0.01, profundidad_maxima=16):
+        """
+        Polilínea (lista de glm.vec3) que se aleja de la curva menos que 'tolerancia'.
+        Subdivide solo donde la curva se dobla, en lugar de muestrear t uniformemente.
+        """
+        puntos = [glm.vec3(self.inicio)]
+        pendientes = [(self, 0)]
+        while pendientes:
+            curva, profundidad = pendientes.pop()
+            if profundidad >= profundidad_maxima or curva._es_plana(tolerancia):
+                puntos.append(glm.vec3(curva.final))
+            else:
+                izquierda, derecha = curva.subdividir()
+                # Pila: la derecha se procesa después de la izquierda
+                pendientes.append((derecha, profundidad + 1))
+                pendientes.append((izquierda, profundidad + 1))
+        return puntos
+
+    def _es_plana(self, tolerancia):
+        """Los controles están a menos de 'tolerancia' de la cuerda (la curva queda dentro de su envolvente)"""
+        cuerda = self.final - self.inicio
+        largo = glm.length(cuerda)
+        for control in (self.control_1, self.control_2):
+            if largo > 0.0:
+                distancia = glm.length(glm.cross(control - self.inicio, cuerda)) / largo
+            else:
+                distancia = glm.length(control - self.inicio)
+            if distancia > tolerancia:
+                return False
+        return True
@@ -1,62 +1,184 @@
-import glm
-
-class CurvaBSpline:
-    """
-    Implementación de una curva B-Spline Cúbica Uniforme.
-    Ideal para trayectorias suaves y cíclicas de cámara.
-    """
-    def __init__(self, puntos_control, cerrada=False):
-        self.puntos = puntos_control
-        self.cerrada = cerrada
-        
-    def calcular_punto(self, t_total):
-        """
-        Calcula un punto en la spline.
-        t_total: valor entre 0.0 y 1.0 que representa el recorrido completo de la curva.
-        """
-        num_puntos = len(self.puntos)
-        if num_puntos < 4:
-            return glm.vec3(0) # Se necesitan al menos 4 puntos
-            
-        # Si es cerrada, el recorrido incluye volver al inicio
-        # Ajustamos el índice base
-        if self.cerrada:
-            t_escalado = t_total * num_puntos
-            indice = int(t_escalado)
-            t = t_escalado - indice
-            
-            # Índices de los 4 puntos de control necesarios para este segmento
-            i0 = (indice - 1) % num_puntos
-            i1 = indice % num_puntos
-            i2 = (indice + 1) % num_puntos
-            i3 = (indice + 2) % num_puntos
-        else:
-            # Para abierta, ajustamos para no salirnos de rango
-            # (Implementación simplificada para el caso de uso de cámara cíclica)
-            # Para este proyecto usaremos principalmente el modo cerrado para la cámara
-            t_escalado = t_total * (num_puntos - 3)
-            indice = int(t_escalado)
-            t = t_escalado - indice
-            
-            i0 = max(0, min(indice, num_puntos - 1))
-            i1 = max(0, min(indice + 1, num_puntos - 1))
-            i2 = max(0, min(indice + 2, num_puntos - 1))
-            i3 = max(0, min(indice + 3, num_puntos - 1))
-
-        p0 = self.puntos[i0]
-        p1 = self.puntos[i1]
-        p2 = self.puntos[i2]
-        p3 = self.puntos[i3]
-
-        # Polinomios base de B-Spline cúbica uniforme
-        # 1/6 * [ (-t^3 + 3t^2 - 3t + 1)P0 + (3t^3 - 6t^2 + 4)P1 + (-3t^3 + 3t^2 + 3t + 1)P2 + (t^3)P3 ]
-        
-        tt = t * t
-        ttt = tt * t
-        
-        term0 = (-ttt + 3*tt - 3*t + 1) / 6.0
-        term1 = (3*ttt - 6*tt + 4) / 6.0
-        term2 = (-3*ttt + 3*tt + 3*t + 1) / 6.0
-        term3 = ttt / 6.0
-        
-        return p0 * term0 + p1 * term1 + p2 * term2 + p3 * term3
+import glm
+import numpy as np
+from curva_parametrica import CurvaParametrica
+
+class CurvaBSpline(CurvaParametrica):
+    """
+    Implementación de una curva B-Spline Cúbica Uniforme.
+    Ideal para trayectorias suaves y cíclicas de cámara.
+
+    Con grado distinto de 3 o anclada=True se usa una B-Spline general de ese grado
+    (vector de nudos uniforme, o con los extremos repetidos para que la curva empiece
+    y termine en el primer y último punto de control), evaluada con de Boor.
+    """
+
+    # Matriz base de la B-Spline cúbica uniforme: P(t) = [1 t t² t³] · M · [P0 P1 P2 P3]
+    MATRIZ_BASE = np.array([
+        [1.0, 4.0, 1.0, 0.0],
+        [-3.0, 0.0, 3.0, 0.0],
+        [3.0, -6.0, 3.0, 0.0],
+        [-1.0, 3.0, -3.0, 1.0],
+    ]) / 6.0
+
+    def __init__(self, puntos_control, cerrada=False, grado=3, anclada=False):
+        self.puntos = puntos_control
+        self.cerrada = cerrada
+        self.grado = grado
+        self.anclada = anclada and not cerrada
+
+    def es_cubica_uniforme(self):
+        return self.grado == 3 and not self.anclada
+        
+    def calcular_punto(self, t_total):
+        """
+        Calcula un punto en la spline.
+        t_total: valor entre 0.0 y 1.0 que representa el recorrido completo de la curva.
+        """
+        if not self.es_cubica_uniforme():
+            x, y, z = self.calcular_puntos(np.array([t_total]))[0]
+            return glm.vec3(x, y, z)
+
+        num_puntos = len(self.puntos)
+        if num_puntos < 4:
+            return glm.vec3(0) # Se necesitan al menos 4 puntos
+            
+        # Si es cerrada, el recorrido incluye volver al inicio
+        # Ajustamos el índice base
+        if self.cerrada:
+            t_escalado = t_total * num_puntos
+            indice = int(t_escalado)
+            t = t_escalado - indice
+            
+            # Índices de los 4 puntos de control necesarios para este segmento
+            i0 = (indice - 1) % num_puntos
+            i1 = indice % num_puntos
+            i2 = (indice + 1) % num_puntos
+            i3 = (indice + 2) % num_puntos
+        else:
+            # Para abierta, ajustamos para no salirnos de rango
+            # (Implementación simplificada para el caso de uso de cámara cíclica)
+            # Para este proyecto usaremos principalmente el modo cerrado para la cámara
+            t_escalado = t_total * (num_puntos - 3)
+            indice = int(t_escalado)
+            t = t_escalado - indice
+            
+            i0 = max(0, min(indice, num_puntos - 1))
+            i1 = max(0, min(indice + 1, num_puntos - 1))
+            i2 = max(0, min(indice + 2, num_puntos - 1))
+            i3 = max(0, min(indice + 3, num_puntos - 1))
+
+        p0 = self.puntos[i0]
+        p1 = self.puntos[i1]
+        p2 = self.puntos[i2]
+        p3 = self.puntos[i3]
+
+        # Polinomios base de B-Spline cúbica uniforme
+        # 1/6 * [ (-t^3 + 3t^2 - 3t + 1)P0 + (3t^3 - 6t^2 + 4)P1 + (-3t^3 + 3t^2 + 3t + 1)P2 + (t^3)P3 ]
+        
+        tt = t * t
+        ttt = tt * t
+        
+        term0 = (-ttt + 3*tt - 3*t + 1) / 6.0
+        term1 = (3*ttt - 6*tt + 4) / 6.0
+        term2 = (-3*ttt + 3*tt + 3*t + 1) / 6.0
+        term3 = ttt / 6.0
+        
+        return p0 * term0 + p1 * term1 + p2 * term2 + p3 * term3
+
+    # --- Evaluación por lotes con NumPy ---
+
+    def _coeficientes_segmentos(self):
+        """
+        Coeficientes polinómicos (segmentos, 4, 3) de cada tramo cúbico: M · [P0 P1 P2 P3].
+        Se calculan una sola vez (ver invalidar_tabla).
+        """
+        coeficientes = getattr(self, "_coeficientes_cache", None)
+        if coeficientes is not None:
+            return coeficientes
+        num_puntos = len(self.puntos)
+        controles = self._a_arreglo(self.puntos)
+        if self.cerrada:
+            # El tramo i usa los puntos i-1 .. i+2 (con vuelta al inicio)
+            indices = (np.arange(num_puntos)[:, None] + np.arange(-1, 3)) % num_puntos
+        else:
+            indices = np.arange(num_puntos - 3)[:, None] + np.arange(4)
+        coeficientes = np.einsum("ij,sjk->sik", self.MATRIZ_BASE, controles[indices])
+        self._coeficientes_cache = coeficientes
+        return coeficientes
+
+    def _tramos(self, ts):
+        """Índice de tramo, t local y escala dt_local/dt_total para cada t_total"""
+        segmentos = len(self.puntos) if self.cerrada else len(self.puntos) - 3
+        t_escalado = np.asarray(ts, dtype=np.float64) * segmentos
+        indice = np.floor(t_escalado).astype(np.intp)
+        if self.cerrada:
+            local = t_escalado - indice
+            indice %= segmentos
+        else:
+            # t_total = 1.0 es el final del último tramo
+            indice = np.clip(indice, 0, segmentos - 1)
+            local = t_escalado - indice
+        return indice, local[:, None], segmentos
+
+    def calcular_puntos(self, ts):
+        """Puntos para un arreglo de t (0.0 a 1.0). Devuelve un arreglo (N, 3)"""
+        if len(self.puntos) <= (3 if self.es_cubica_uniforme() else self.grado):
+            return np.zeros((len(ts), 3))
+        if not self.es_cubica_uniforme():
+            nudos, controles, grado, inicio, fin = self._nudos_y_controles()
+            return _de_boor(nudos, controles, grado, inicio + np.asarray(ts, dtype=np.float64) * (fin - inicio))
+        coeficientes = self._coeficientes_segmentos()
+        indice, t, _segmentos = self._tramos(ts)
+        c = coeficientes[indice]
+        # Horner: c0 + t(c1 + t(c2 + t·c3))
+        return c[:, 0] + t * (c[:, 1] + t * (c[:, 2] + t * c[:, 3]))
+
+    def calcular_derivadas(self, ts):
+        """Derivadas respecto a t_total para un arreglo de t. Devuelve un arreglo (N, 3)"""
+        if len(self.puntos) <= (3 if self.es_cubica_uniforme() else self.grado):
+            return np.zeros((len(ts), 3))
+        if not self.es_cubica_uniforme():
+            return self._derivadas_generales(np.asarray(ts, dtype=np.float64))
+        coeficientes = self._coeficientes_segmentos()
+        indice, t, segmentos = self._tramos(ts)
+        c = coeficientes[indice]
+        return (c[:, 1] + t * (2 * c[:, 2] + t * 3 * c[:, 3])) * segmentos
+
+    def _nudos_y_controles(self):
+        """Vector de nudos, puntos de control (repetidos si es cerrada), grado y dominio [inicio, fin]"""
+        grado = self.grado
+        controles = self._a_arreglo(self.puntos)
+        if self.cerrada:
+            # Curva periódica: los primeros 'grado' puntos se repiten al final. Se rota para
+            # que t = 0 quede cerca de puntos[0], como en el caso cúbico
+            controles = np.roll(controles, grado // 2, axis=0)
+            controles = np.vstack((controles, controles[:grado]))
+        cantidad = len(controles)
+        if self.anclada:
+            interiores = np.linspace(0.0, 1.0, cantidad - grado + 1)[1:-1]
+            nudos = np.concatenate((np.zeros(grado + 1), interiores, np.ones(grado + 1)))
+        else:
+            nudos = np.linspace(0.0, 1.0, cantidad + grado + 1)
+        return nudos, controles, grado, nudos[grado], nudos[cantidad]
+
+    def _derivadas_generales(self, ts):
+        """La derivada de una B-Spline de grado p es otra de grado p-1 con controles p(P[i+1]-P[i])/(u[i+p+1]-u[i+1])"""
+        nudos, controles, grado, inicio, fin = self._nudos_y_controles()
+        distancias = nudos[grado + 1:len(controles) + grado] - nudos[1:len(controles)]
+        derivados = grado * np.diff(controles, axis=0) / np.where(distancias > 0, distancias, 1.0)[:, None]
+        return _de_boor(nudos[1:-1], derivados, grado - 1, inicio + ts * (fin - inicio)) * (fin - inicio)
+
+def _de_boor(nudos, controles, grado, us):
+    """Algoritmo de de Boor vectorizado: evalúa la B-Spline en todos los parámetros 'us' a la vez"""
+    tramo = np.clip(np.searchsorted(nudos, us, side="right") - 1, grado, len(controles) - 1)
+    # Ejes (grado+1, N, ...) para que cada columna de la recurrencia sea un bloque contiguo
+    d = controles[tramo + np.arange(-grado, 1)[:, None]]
+    # Los nudos que usa cada parámetro (de u[tramo-grado+1] a u[tramo+grado]) se juntan una sola vez
+    locales = nudos[tramo + np.arange(1 - grado, grado + 1)[:, None]]
+    for r in range(1, grado + 1):
+        for j in range(grado, r - 1, -1):
+            izquierda = locales[j - 1]
+            ancho = locales[j + grado - r] - izquierda
+            alfa = ((us - izquierda) / np.where(ancho > 0, ancho, 1.0))[:, None]
+            d[j] = d[j - 1] + alfa * (d[j] - d[j - 1])
+    return d[grado]
@@ -0,0 +1,53 @@
+"""
+Estado de entrada del jugador como máscara de bits compacta.
+Se usa para grabar/reproducir partidas y para mover al jugador en el modo sin GPU,
+donde no hay ventana de la que leer el teclado. Con ventana la usa también el Mundo con
+entrada_repetible (main.py --grabar), para que la partida grabada se pueda reproducir.
+"""
+import esper
+import glm
+import pygame
+import componentes_3d as componentes
+import recursos
+
+ARRIBA = 1 << 0
+ABAJO = 1 << 1
+IZQUIERDA = 1 << 2
+DERECHA = 1 << 3
+
+# Teclas que activan cada bit
+TECLAS = {
+    ARRIBA: (pygame.K_UP, pygame.K_w),
+    ABAJO: (pygame.K_DOWN, pygame.K_s),
+    IZQUIERDA: (pygame.K_LEFT, pygame.K_a),
+    DERECHA: (pygame.K_RIGHT, pygame.K_d),
+}
+
+VELOCIDAD_JUGADOR = 4.0
+
+def leer_teclado():
+    """Convierte las teclas presionadas en este momento a la máscara de entrada"""
+    presionadas = pygame.key.get_pressed()
+    entrada = 0
+    for bit, teclas in TECLAS.items():
+        if any(presionadas[tecla] for tecla in teclas):
+            entrada |= bit
+    return entrada
+
+def direccion(entrada):
+    """Dirección de movimiento (en los ejes del mundo) que indica la máscara de entrada"""
+    x = (1.0 if entrada & DERECHA else 0.0) - (1.0 if entrada & IZQUIERDA else 0.0)
+    y = (1.0 if entrada & ARRIBA else 0.0) - (1.0 if entrada & ABAJO else 0.0)
+    return x, y
+
+class SistemaEntradaJugador(esper.Processor):
+    """
+    Mueve al jugador según mundo.entrada (reemplaza al control por teclado cuando la entrada
+    debe poder repetirse). Fuera de ESTADO_EJECUTANDO, por ejemplo durante la intro, se queda quieto.
+    """
+
+    def process(self, *args):
+        mundo = self.world
+        x, y = direccion(mundo.entrada) if mundo.estado == recursos.ESTADO_EJECUTANDO else (0.0, 0.0)
+        velocidad = mundo.component_for_entity(mundo.objeto_jugador, componentes.Velocidad)
+        velocidad.valor = glm.vec3(x * VELOCIDAD_JUGADOR, y * VELOCIDAD_JUGADOR, velocidad.valor.z)
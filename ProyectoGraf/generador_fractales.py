@@ -1,106 +1,246 @@
-import glm
-import random
-from clases_renderizado import Modelo3D
-
-class FractalNube:
-    """Genera una nube fractal usando cubos recursivos"""
-    def __init__(self, profundidad=3):
-        self.profundidad = profundidad
-        self.vertices = []
-        self.normales = []
-        self.colores = []
-        self.coordenadas_textura = []
-        
-        # Generar el fractal desde el centro
-        centro = glm.vec3(0.0, 0.0, 0.0)
-        tamano = 1.0
-        self._agregar_cubo_recursivo(centro, tamano, profundidad)
-
-    def _agregar_cubo_recursivo(self, centro, tamano, profundidad):
-        """Genera cubos de forma recursiva para crear el efecto fractal"""
-        if profundidad == 0:
-            return
-
-        # Color aleatorio en tonos blancos/azulados para simular nube
-        nivel_gris = random.uniform(0.85, 1.0)
-        nivel_azul = random.uniform(0.9, 1.0)
-        color = glm.vec3(nivel_gris, nivel_gris, nivel_azul)
-        
-        self._agregar_cubo(centro, tamano, color)
-        
-        # Direcciones para las 6 caras del cubo (+X, -X, +Y, -Y, +Z, -Z)
-        direcciones = [
-            glm.vec3(1, 0, 0), glm.vec3(-1, 0, 0),
-            glm.vec3(0, 1, 0), glm.vec3(0, -1, 0),
-            glm.vec3(0, 0, 1), glm.vec3(0, 0, -1)
-        ]
-        
-        for direccion in direcciones:
-            # 60% de probabilidad de crecer en cada dirección
-            if random.random() > 0.4:
-                # Reducir el tamaño para el siguiente nivel
-                factor_reduccion = random.uniform(0.6, 0.8)
-                tamano_hijo = tamano * factor_reduccion
-                
-                # Calcular posición del cubo hijo
-                desplazamiento = direccion * (tamano * 0.5 + tamano_hijo * 0.5)
-                
-                # Añadir variación aleatoria para romper la uniformidad
-                variacion = glm.vec3(
-                    random.uniform(-0.3, 0.3),
-                    random.uniform(-0.3, 0.3),
-                    random.uniform(-0.3, 0.3)
-                ) * tamano
-                
-                centro_hijo = centro + desplazamiento + variacion
-                
-                self._agregar_cubo_recursivo(centro_hijo, tamano_hijo, profundidad - 1)
-
-    def _agregar_cubo(self, centro, tamano, color):
-        """Añade un cubo a la geometría del fractal"""
-        radio = tamano * 0.5
-        
-        # Definir los 8 vértices del cubo
-        vertices = [
-            centro + glm.vec3(-radio, radio, -radio),   # 0: atrás-arriba-izquierda
-            centro + glm.vec3(radio, radio, -radio),    # 1: atrás-arriba-derecha
-            centro + glm.vec3(-radio, -radio, -radio),  # 2: atrás-abajo-izquierda
-            centro + glm.vec3(radio, -radio, -radio),   # 3: atrás-abajo-derecha
-            centro + glm.vec3(-radio, radio, radio),    # 4: frente-arriba-izquierda
-            centro + glm.vec3(radio, radio, radio),     # 5: frente-arriba-derecha
-            centro + glm.vec3(-radio, -radio, radio),   # 6: frente-abajo-izquierda
-            centro + glm.vec3(radio, -radio, radio)     # 7: frente-abajo-derecha
-        ]
-        
-        # Crear las 6 caras del cubo usando 2 triángulos por cara
-        self._agregar_cara(vertices[4], vertices[5], vertices[1], vertices[0], glm.vec3(0, 1, 0), color)   # Arriba
-        self._agregar_cara(vertices[2], vertices[3], vertices[7], vertices[6], glm.vec3(0, -1, 0), color)  # Abajo
-        self._agregar_cara(vertices[6], vertices[7], vertices[5], vertices[4], glm.vec3(0, 0, 1), color)   # Frente
-        self._agregar_cara(vertices[3], vertices[2], vertices[0], vertices[1], glm.vec3(0, 0, -1), color)  # Atrás
-        self._agregar_cara(vertices[2], vertices[6], vertices[4], vertices[0], glm.vec3(-1, 0, 0), color)  # Izquierda
-        self._agregar_cara(vertices[7], vertices[3], vertices[1], vertices[5], glm.vec3(1, 0, 0), color)   # Derecha
-
-    def _agregar_cara(self, p0, p1, p2, p3, normal, color):
-        """Añade una cara (2 triángulos) usando 4 vértices"""
-        self._agregar_triangulo(p0, p1, p2, normal, color)
-        self._agregar_triangulo(p0, p2, p3, normal, color)
-
-    def _agregar_triangulo(self, punto1, punto2, punto3, normal, color):
-        """Añade un triángulo a la geometría"""
-        for punto in [punto1, punto2, punto3]:
-            self.vertices.extend([punto.x, punto.y, punto.z])
-            self.normales.extend([normal.x, normal.y, normal.z])
-            self.colores.extend([color.x, color.y, color.z])
-            self.coordenadas_textura.extend([0.0, 0.0])
-
-    def crear_modelo(self):
-        """Crea y retorna el modelo 3D del fractal"""
-        cantidad_vertices = len(self.vertices) // 3
-        modelo = Modelo3D(cantidad_vertices)
-        
-        modelo.cargar_datos_posicion(self.vertices)
-        modelo.cargar_datos_normal(self.normales)
-        modelo.cargar_datos_uv(self.coordenadas_textura)
-        modelo.cargar_datos_color(self.colores)
-            
-        return modelo
+import threading
+import numpy as np
+from clases_renderizado import Modelo3D
+
+# Plantilla del cubo unitario (centrado en el origen, lado 1)
+_ESQUINAS_CUBO = np.array([
+    [-0.5, 0.5, -0.5],   # 0: atrás-arriba-izquierda
+    [0.5, 0.5, -0.5],    # 1: atrás-arriba-derecha
+    [-0.5, -0.5, -0.5],  # 2: atrás-abajo-izquierda
+    [0.5, -0.5, -0.5],   # 3: atrás-abajo-derecha
+    [-0.5, 0.5, 0.5],    # 4: frente-arriba-izquierda
+    [0.5, 0.5, 0.5],     # 5: frente-arriba-derecha
+    [-0.5, -0.5, 0.5],   # 6: frente-abajo-izquierda
+    [0.5, -0.5, 0.5],    # 7: frente-abajo-derecha
+], dtype=np.float32)
+
+# Las 6 caras como 4 esquinas cada una (2 triángulos: p0 p1 p2 y p0 p2 p3)
+_CARAS_CUBO = np.array([
+    [4, 5, 1, 0],  # Arriba
+    [2, 3, 7, 6],  # Abajo
+    [6, 7, 5, 4],  # Frente
+    [3, 2, 0, 1],  # Atrás
+    [2, 6, 4, 0],  # Izquierda
+    [7, 3, 1, 5],  # Derecha
+])
+_NORMALES_CARAS = np.array([
+    [0, 1, 0], [0, -1, 0],
+    [0, 0, 1], [0, 0, -1],
+    [-1, 0, 0], [1, 0, 0],
+], dtype=np.float32)
+
+# (6 caras, 6 vértices, 3) listos para escalar y trasladar por difusión
+_PLANTILLA_POSICIONES = _ESQUINAS_CUBO[_CARAS_CUBO[:, [0, 1, 2, 0, 2, 3]]]
+_PLANTILLA_NORMALES = np.repeat(_NORMALES_CARAS[:, np.newaxis, :], 6, axis=1)
+
+# Direcciones de crecimiento (+X, -X, +Y, -Y, +Z, -Z)
+_DIRECCIONES = np.array([
+    [1, 0, 0], [-1, 0, 0],
+    [0, 1, 0], [0, -1, 0],
+    [0, 0, 1], [0, 0, -1],
+], dtype=np.float32)
+
+class FractalNube:
+    """Genera una nube fractal usando cubos recursivos (un nivel de recursión a la vez con NumPy)"""
+
+    # Cantidad de nubes distintas que el Mundo reparte entre sus nubes
+    VARIANTES = 4
+
+    # Geometrías generadas en segundo plano ((profundidad, semilla) -> lista de FractalNube)
+    _precalculadas = {}
+    _bloqueo_precalculadas = threading.Lock()
+
+    # Cubos procesados por bloque al buscar caras ocultas (limita la memoria de la comparación N x N)
+    BLOQUE_OCULTAMIENTO = 256
+
+    def __init__(self, profundidad=3, semilla=None, eliminar_caras_ocultas=False, usar_precalculada=True):
+        self.profundidad = profundidad
+        self.semilla = semilla
+        self.eliminar_caras_ocultas = eliminar_caras_ocultas
+
+        # Reutilizar una geometría ya generada por precalcular() si existe
+        if usar_precalculada and self._tomar_precalculada(profundidad, semilla, eliminar_caras_ocultas):
+            return
+
+        generador = np.random.default_rng(semilla)
+        self.centros, self.tamanos, self.colores_cubo, self.niveles = self._generar_cubos(generador, profundidad)
+        self._calcular_visibilidad()
+        self._construir_geometria()
+
+    @classmethod
+    def precalcular(cls, profundidad=3, semilla=None, eliminar_caras_ocultas=False):
+        """Genera la geometría sin tocar OpenGL (se puede llamar desde cualquier hilo)"""
+        nube = cls(profundidad, semilla, eliminar_caras_ocultas, usar_precalculada=False)
+        with cls._bloqueo_precalculadas:
+            cls._precalculadas.setdefault((profundidad, semilla, eliminar_caras_ocultas), []).append(nube)
+        return nube
+
+    def _tomar_precalculada(self, profundidad, semilla, eliminar_caras_ocultas):
+        """Copia la geometría de una nube precalculada con los mismos parámetros"""
+        with self._bloqueo_precalculadas:
+            pendientes = self._precalculadas.get((profundidad, semilla, eliminar_caras_ocultas))
+            if not pendientes:
+                return False
+            nube = pendientes.pop()
+        self.__dict__.update(nube.__dict__)
+        return True
+
+    @staticmethod
+    def _generar_cubos(generador, profundidad):
+        """
+        Genera los centros, tamaños y colores de todos los cubos.
+        Cada nivel crea sus hijos en bloque: 60% de probabilidad de crecer en cada
+        una de las 6 direcciones, con tamaño reducido y una variación aleatoria.
+        """
+        raices = 1 if profundidad > 0 else 0
+        centros = [np.zeros((raices, 3), dtype=np.float32)]
+        tamanos = [np.ones(raices, dtype=np.float32)]
+
+        for _ in range(profundidad - 1):
+            centro_padre = centros[-1]
+            tamano_padre = tamanos[-1]
+            if len(tamano_padre) == 0:
+                break
+
+            # (padres, direcciones)
+            crece = generador.random((len(tamano_padre), 6)) > 0.4
+            factor_reduccion = generador.uniform(0.6, 0.8, size=crece.shape)
+            variacion = generador.uniform(-0.3, 0.3, size=crece.shape + (3,))
+
+            indice_padre, indice_direccion = np.nonzero(crece)
+            tamano = tamano_padre[indice_padre]
+            tamano_hijo = tamano * factor_reduccion[indice_padre, indice_direccion]
+
+            desplazamiento = _DIRECCIONES[indice_direccion] * (tamano * 0.5 + tamano_hijo * 0.5)[:, np.newaxis]
+            variacion = variacion[indice_padre, indice_direccion] * tamano[:, np.newaxis]
+
+            centros.append((centro_padre[indice_padre] + desplazamiento + variacion).astype(np.float32))
+            tamanos.append(tamano_hijo.astype(np.float32))
+
+        niveles = np.concatenate([np.full(len(nivel), indice, dtype=np.int32) for indice, nivel in enumerate(tamanos)])
+        centros = np.concatenate(centros)
+        tamanos = np.concatenate(tamanos)
+
+        # Color aleatorio en tonos blancos/azulados para simular nube
+        nivel_gris = generador.uniform(0.85, 1.0, size=len(tamanos))
+        nivel_azul = generador.uniform(0.9, 1.0, size=len(tamanos))
+        colores = np.stack([nivel_gris, nivel_gris, nivel_azul], axis=1).astype(np.float32)
+        return centros, tamanos, colores, niveles
+
+    def reducir(self, niveles):
+        """
+        Devuelve una copia con solo los primeros 'niveles' niveles de recursión.
+        Los cubos que quedan son los mismos, así que la silueta lejana no cambia.
+        """
+        reducida = FractalNube.__new__(FractalNube)
+        reducida.profundidad = min(niveles, self.profundidad)
+        reducida.semilla = self.semilla
+        reducida.eliminar_caras_ocultas = self.eliminar_caras_ocultas
+        mascara = self.niveles < niveles
+        reducida.centros = self.centros[mascara]
+        reducida.tamanos = self.tamanos[mascara]
+        reducida.colores_cubo = self.colores_cubo[mascara]
+        reducida.niveles = self.niveles[mascara]
+        # Las caras tapadas por cubos que ya no están vuelven a ser visibles
+        reducida._calcular_visibilidad()
+        reducida._construir_geometria()
+        return reducida
+
+    def radio(self):
+        """Radio de la esfera (centrada en el origen) que contiene a todos los cubos"""
+        if len(self.tamanos) == 0:
+            return 0.0
+        distancias = np.linalg.norm(self.centros, axis=1) + self.tamanos * (np.sqrt(3.0) / 2.0)
+        return float(distancias.max())
+
+    def _calcular_visibilidad(self):
+        if self.eliminar_caras_ocultas:
+            self.caras_visibles = ~self._calcular_caras_ocultas()
+        else:
+            self.caras_visibles = np.ones((len(self.tamanos), 6), dtype=bool)
+
+    def _calcular_caras_ocultas(self):
+        """
+        Devuelve una máscara (cubos, 6 caras) con las caras tapadas por completo por otro cubo.
+        Una cara queda oculta cuando otro cubo cubre todo su cuadrado en los dos ejes del plano
+        y además atraviesa el plano hacia afuera (si solo lo toca, la cara sigue siendo visible).
+        """
+        radios = self.tamanos[:, np.newaxis] * 0.5
+        minimos = self.centros - radios
+        maximos = self.centros + radios
+        cantidad = len(self.tamanos)
+        ocultas = np.zeros((cantidad, 6), dtype=bool)
+        tolerancia = 1e-5
+
+        for cara, normal in enumerate(_NORMALES_CARAS):
+            eje = int(np.flatnonzero(normal)[0])
+            otros = [indice for indice in range(3) if indice != eje]
+            positivo = normal[eje] > 0
+            plano = maximos[:, eje] if positivo else minimos[:, eje]
+
+            for inicio in range(0, cantidad, self.BLOQUE_OCULTAMIENTO):
+                fin = min(inicio + self.BLOQUE_OCULTAMIENTO, cantidad)
+                # (bloque, cubos): ¿el cubo j tapa la cara del cubo i?
+                p = plano[inicio:fin, np.newaxis]
+                if positivo:
+                    atraviesa = (minimos[np.newaxis, :, eje] <= p + tolerancia) & (maximos[np.newaxis, :, eje] > p + tolerancia)
+                else:
+                    atraviesa = (maximos[np.newaxis, :, eje] >= p - tolerancia) & (minimos[np.newaxis, :, eje] < p - tolerancia)
+                cubre = atraviesa
+                for otro in otros:
+                    cubre &= minimos[np.newaxis, :, otro] <= minimos[inicio:fin, np.newaxis, otro] + tolerancia
+                    cubre &= maximos[np.newaxis, :, otro] >= maximos[inicio:fin, np.newaxis, otro] - tolerancia
+                # Un cubo nunca se tapa a sí mismo
+                filas = np.arange(fin - inicio)
+                cubre[filas, filas + inicio] = False
+                ocultas[inicio:fin, cara] = cubre.any(axis=1)
+
+        return ocultas
+
+    def _construir_geometria(self):
+        """Genera los arreglos de vértices aplicando la plantilla del cubo a todos los cubos a la vez"""
+        # (cubos, caras, vértices, 3)
+        posiciones = self.centros[:, np.newaxis, np.newaxis, :] + \
+            self.tamanos[:, np.newaxis, np.newaxis, np.newaxis] * _PLANTILLA_POSICIONES
+        normales = np.broadcast_to(_PLANTILLA_NORMALES, posiciones.shape)
+        colores = np.broadcast_to(self.colores_cubo[:, np.newaxis, np.newaxis, :], posiciones.shape)
+
+        # (caras visibles, vértices, 3)
+        posiciones = posiciones[self.caras_visibles]
+        normales = normales[self.caras_visibles]
+        colores = colores[self.caras_visibles]
+
+        self.vertices = np.ascontiguousarray(posiciones, dtype=np.float32).ravel()
+        self.normales = np.ascontiguousarray(normales, dtype=np.float32).ravel()
+        self.colores = np.ascontiguousarray(colores, dtype=np.float32).ravel()
+        self.coordenadas_textura = np.zeros(len(posiciones) * 6 * 2, dtype=np.float32)
+
+    def contar_triangulos(self):
+        return len(self.vertices) // 9
+
+    def crear_modelo(self):
+        """Crea y retorna el modelo 3D del fractal"""
+        cantidad_vertices = len(self.vertices) // 3
+        modelo = Modelo3D(cantidad_vertices)
+
+        modelo.cargar_datos_posicion(self.vertices)
+        modelo.cargar_datos_normal(self.normales)
+        modelo.cargar_datos_uv(self.coordenadas_textura)
+        modelo.cargar_datos_color(self.colores)
+
+        return modelo
+
+
+def reporte_triangulos(profundidades=range(3, 7), semilla=0):
+    """Imprime los triángulos de cada profundidad con y sin eliminación de caras ocultas"""
+    print("Profundidad | Triángulos | Sin caras ocultas | Ahorro")
+    for profundidad in profundidades:
+        completa = FractalNube(profundidad, semilla, usar_precalculada=False)
+        reducida = FractalNube(profundidad, semilla, eliminar_caras_ocultas=True, usar_precalculada=False)
+        antes = completa.contar_triangulos()
+        despues = reducida.contar_triangulos()
+        ahorro = 100.0 * (antes - despues) / antes if antes else 0.0
+        print(f"{profundidad:11d} | {antes:10d} | {despues:17d} | {ahorro:5.1f}%")
+
+if __name__ == "__main__":
+    reporte_triangulos()
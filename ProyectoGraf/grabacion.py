@@ -0,0 +1,192 @@
+"""
+Grabación y reproducción determinista de partidas.
+
+Formato binario (little endian):
+    cabecera: "CCHS", versión (u8), nivel (u8), opciones (u8), frecuencia de simulación (u16), semilla (u64)
+    cuadros:  delta del cuadro (f64) + máscara de entrada (u16), 10 bytes por cuadro
+    final:    "FIN!" + SHA-256 del estado final (32 bytes)
+
+La reproducción crea un Mundo sin GPU con la misma semilla, aplica los mismos
+deltas y entradas a través del paso fijo y compara la huella del estado final.
+Son verificables (opción VERIFICABLE) las sesiones cuyo jugador se movió solo con la
+máscara grabada: las de grabar_sesion_sin_gpu y las de main.py --grabar, que crea el
+Mundo con entrada_repetible. Las de ventana empiezan por la intro (opción CON_INTRO) y
+la reproducción también la simula. Los archivos de versión 1 no son verificables.
+
+    python grabacion.py sesion.bin
+    python grabacion.py --grabar sesion.bin --nivel 2 --semilla 7 --politica directa
+"""
+import argparse
+import os
+import random
+import struct
+import sys
+import glm
+
+MAGIA = b"CCHS"
+VERSION = 2
+CABECERA = struct.Struct("<4sBBBHQ")
+# Versión 1: sin byte de opciones (todas grabadas con ventana)
+CABECERA_V1 = struct.Struct("<4sBBHQ")
+# Opciones de la cabecera
+VERIFICABLE = 1 << 0
+CON_INTRO = 1 << 1
+CUADRO = struct.Struct("<dH")
+MARCA_FIN = b"FIN!"
+TAMANO_FIN = len(MARCA_FIN) + 32
+
+RESOLUCION = 1024, 720
+PASO = 1.0 / 120.0
+# Duración máxima de una sesión grabada sin GPU (segundos de juego)
+DURACION_MAXIMA = 180.0
+
+class GrabadorSesion:
+    """Escribe los deltas y la entrada de cada cuadro de una partida"""
+
+    def __init__(self, ruta, nivel, semilla, frecuencia, verificable=False, con_intro=False):
+        self.archivo = open(ruta, "wb")
+        opciones = (VERIFICABLE if verificable else 0) | (CON_INTRO if con_intro else 0)
+        self.archivo.write(CABECERA.pack(MAGIA, VERSION, nivel, opciones, frecuencia, semilla))
+        self.cuadros = 0
+
+    @classmethod
+    def para_mundo(cls, ruta, mundo):
+        """Verificable solo si el jugador del mundo se mueve con la máscara grabada (entrada_repetible)"""
+        return cls(ruta, mundo.nivel, mundo.semilla, mundo.FRECUENCIA_SIMULACION,
+                   verificable=mundo.entrada_repetible, con_intro=mundo.con_intro)
+
+    def grabar(self, delta, entrada):
+        self.archivo.write(CUADRO.pack(delta, entrada))
+        self.cuadros += 1
+
+    def cerrar(self, hash_final):
+        self.archivo.write(MARCA_FIN + bytes.fromhex(hash_final))
+        self.archivo.close()
+
+class SesionGrabada:
+    """Contenido de un archivo de sesión"""
+
+    def __init__(self, nivel, semilla, frecuencia, cuadros, hash_final, verificable=False, con_intro=False):
+        self.nivel = nivel
+        self.semilla = semilla
+        self.frecuencia = frecuencia
+        self.cuadros = cuadros
+        self.hash_final = hash_final
+        self.verificable = verificable
+        self.con_intro = con_intro
+
+    @classmethod
+    def leer(cls, ruta):
+        with open(ruta, "rb") as archivo:
+            datos = archivo.read()
+
+        magia, version = datos[:4], datos[4] if len(datos) > 4 else None
+        if magia != MAGIA or version not in (1, VERSION):
+            raise ValueError(f"{ruta} no es una sesión grabada compatible")
+        if version == 1:
+            _, _, nivel, frecuencia, semilla = CABECERA_V1.unpack_from(datos, 0)
+            opciones, tamano_cabecera = 0, CABECERA_V1.size
+        else:
+            _, _, nivel, opciones, frecuencia, semilla = CABECERA.unpack_from(datos, 0)
+            tamano_cabecera = CABECERA.size
+
+        hash_final = None
+        fin = len(datos)
+        if fin - TAMANO_FIN >= tamano_cabecera and datos[fin - TAMANO_FIN:fin - 32] == MARCA_FIN:
+            hash_final = datos[fin - 32:].hex()
+            fin -= TAMANO_FIN
+
+        cuerpo = datos[tamano_cabecera:fin]
+        if len(cuerpo) % CUADRO.size != 0:
+            raise ValueError(f"{ruta} está truncado")
+        cuadros = list(CUADRO.iter_unpack(cuerpo))
+        return cls(nivel, semilla, frecuencia, cuadros, hash_final,
+                   bool(opciones & VERIFICABLE), bool(opciones & CON_INTRO))
+
+def _avanzar(mundo, delta, entrada):
+    """
+    Un cuadro sin GPU; la grabación y la reproducción pasan por aquí para seguir el mismo camino.
+    Repite lo que hace bucle_juego en main.py sin dibujar: pasos fijos y luego las secuencias
+    de cámara con el delta del cuadro (de ellas depende el fin de la intro).
+    """
+    mundo.entrada = entrada
+    mundo.tiempo += delta
+    mundo.avanzar_simulacion(delta)
+    mundo.delta = delta
+    mundo._actualizar_secuencias()
+
+def grabar_sesion_sin_gpu(ruta, nivel=1, semilla=0, politica="directa", duracion=DURACION_MAXIMA, paso=PASO):
+    """
+    Juega una partida sin GPU con una política de simulacion_lotes y la graba como sesión
+    verificable. Devuelve la cantidad de cuadros grabados.
+    """
+    from mundo import Mundo
+    import recursos
+    from simulacion_lotes import POLITICAS, PASOS_POR_DECISION
+
+    mundo = Mundo(glm.vec2(RESOLUCION), nivel, sin_gpu=True, semilla=semilla)
+    # La política tiene su propio generador para no alterar el azar de la simulación
+    decisor = POLITICAS[politica](random.Random(semilla ^ 0x5EED))
+    grabador = GrabadorSesion.para_mundo(ruta, mundo)
+    entrada = 0
+    for cuadro in range(int(duracion / paso)):
+        if cuadro % PASOS_POR_DECISION == 0:
+            entrada = decisor.decidir(mundo)
+        grabador.grabar(paso, entrada)
+        _avanzar(mundo, paso, entrada)
+        if mundo.estado in (recursos.ESTADO_VICTORIA, recursos.ESTADO_DERROTA):
+            break
+    grabador.cerrar(mundo.hash_estado())
+    mundo.limpiar()
+    return grabador.cuadros
+
+def reproducir_sesion(ruta):
+    """
+    Reproduce una sesión sin GPU. Devuelve (hash obtenido, hash grabado, coinciden);
+    'coinciden' es None si la sesión no es verificable (versión 1, o jugador movido sin la máscara).
+    """
+    from mundo import Mundo
+
+    sesion = SesionGrabada.leer(ruta)
+    mundo = Mundo(glm.vec2(RESOLUCION), sesion.nivel, sin_gpu=True, semilla=sesion.semilla,
+                  con_intro=sesion.con_intro)
+    mundo.FRECUENCIA_SIMULACION = sesion.frecuencia
+    for delta, entrada in sesion.cuadros:
+        _avanzar(mundo, delta, entrada)
+    obtenido = mundo.hash_estado()
+    mundo.limpiar()
+    coinciden = obtenido == sesion.hash_final if sesion.verificable else None
+    return obtenido, sesion.hash_final, coinciden
+
+def main():
+    # pygame no necesita ventana ni dispositivo de audio para grabar ni reproducir
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from simulacion_lotes import POLITICAS
+
+    parser = argparse.ArgumentParser(description="Graba o reproduce sesiones deterministas sin GPU")
+    parser.add_argument("sesion", help="archivo de sesión a reproducir (o a escribir con --grabar)")
+    parser.add_argument("--grabar", action="store_true", help="graba una partida sin GPU jugada por una política")
+    parser.add_argument("--nivel", type=int, default=1)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--politica", choices=sorted(POLITICAS), default="directa")
+    parser.add_argument("--segundos", type=float, default=DURACION_MAXIMA, help="duración máxima de la partida grabada")
+    argumentos = parser.parse_args()
+
+    if argumentos.grabar:
+        cuadros = grabar_sesion_sin_gpu(argumentos.sesion, argumentos.nivel, argumentos.semilla,
+                                        argumentos.politica, argumentos.segundos)
+        print(f"{cuadros} cuadros grabados en {argumentos.sesion}")
+        return
+
+    obtenido, grabado, coinciden = reproducir_sesion(argumentos.sesion)
+    print(f"Estado final reproducido: {obtenido}")
+    print(f"Estado final grabado:     {grabado}")
+    if coinciden is None:
+        print("NO VERIFICABLE: el jugador no se movió con la entrada grabada")
+        sys.exit(0)
+    print("OK" if coinciden else "DIFERENTE")
+    sys.exit(0 if coinciden else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Estructura del laberinto precalculada a partir de su mapa:
+  - nodos: celdas libres que no son pasillo simple (cruces, callejones sin salida)
+  - aristas: pasillos entre dos nodos, con su longitud en celdas y las celdas que recorren
+  - callejones sin salida: nodos con una sola celda vecina libre
+  - distancias mínimas entre todos los pares de nodos (matriz de NumPy, bajo demanda)
+
+Se construye una vez por laberinto (ver Laberinto.grafo()) y las consultas de aparición
+y de IA pasan a ser búsquedas en tablas.
+"""
+import numpy as np
+
+class GrafoLaberinto:
+    """Grafo de pasillos de un mapa de laberinto (True = pared)"""
+
+    VECINOS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+    def __init__(self, mapa):
+        self.libre = ~np.asarray(mapa, dtype=bool)
+        self.filas, self.columnas = self.libre.shape
+        relleno = np.pad(self.libre, 1)
+        # Cantidad de vecinas libres de cada celda (0 en las paredes)
+        self.grados = (relleno[:-2, 1:-1].astype(np.int8) + relleno[2:, 1:-1]
+                       + relleno[1:-1, :-2] + relleno[1:-1, 2:]) * self.libre
+
+        self.nodos = [tuple(int(v) for v in celda) for celda in np.argwhere(self.libre & (self.grados != 2))]
+        self.indice_nodo = {celda: indice for indice, celda in enumerate(self.nodos)}
+        # Aristas: (nodo_a, nodo_b, longitud en celdas, celdas intermedias)
+        self.aristas = []
+        # Celda de pasillo -> (arista, pasos desde nodo_a)
+        self.ubicacion_pasillo = {}
+        self.vecinos_nodo = [[] for _ in self.nodos]
+        # Nodo -> [(arista, True si el nodo es su extremo a)] para recorrer los pasillos en orden
+        self.aristas_nodo = [[] for _ in self.nodos]
+        self._construir_aristas()
+
+        self.callejones = [celda for celda in self.nodos if self.grados[celda] == 1]
+        self._distancias = None
+
+    def _vecinas_libres(self, celda):
+        fila, columna = celda
+        for paso_fila, paso_columna in self.VECINOS:
+            vecina = (fila + paso_fila, columna + paso_columna)
+            if 0 <= vecina[0] < self.filas and 0 <= vecina[1] < self.columnas and self.libre[vecina]:
+                yield vecina
+
+    def _recorrer(self, inicio, primera):
+        """Sigue un pasillo desde el nodo 'inicio' por 'primera' hasta el siguiente nodo"""
+        celdas = []
+        anterior, actual = inicio, primera
+        while actual not in self.indice_nodo:
+            celdas.append(actual)
+            siguiente = next(vecina for vecina in self._vecinas_libres(actual) if vecina != anterior)
+            anterior, actual = actual, siguiente
+        return actual, celdas
+
+    def _agregar_arista(self, nodo_a, nodo_b, celdas):
+        indice = len(self.aristas)
+        self.aristas.append((nodo_a, nodo_b, len(celdas) + 1, celdas))
+        for pasos, celda in enumerate(celdas, start=1):
+            self.ubicacion_pasillo[celda] = (indice, pasos)
+        self.vecinos_nodo[nodo_a].append((nodo_b, len(celdas) + 1))
+        self.aristas_nodo[nodo_a].append((indice, True))
+        if nodo_b != nodo_a:
+            self.vecinos_nodo[nodo_b].append((nodo_a, len(celdas) + 1))
+            self.aristas_nodo[nodo_b].append((indice, False))
+
+    def _construir_aristas(self):
+        recorridos = set()
+        pendientes = list(self.nodos)
+        while pendientes:
+            for inicio in pendientes:
+                for primera in self._vecinas_libres(inicio):
+                    if (inicio, primera) in recorridos:
+                        continue
+                    final, celdas = self._recorrer(inicio, primera)
+                    ultima = celdas[-1] if celdas else inicio
+                    recorridos.add((inicio, primera))
+                    recorridos.add((final, ultima))
+                    self._agregar_arista(self.indice_nodo[inicio], self.indice_nodo[final], celdas)
+            # Un anillo de pasillos sin cruces no tiene nodos: se toma una de sus celdas como nodo
+            sueltas = [tuple(int(v) for v in celda) for celda in np.argwhere(self.libre & (self.grados == 2))
+                       if tuple(int(v) for v in celda) not in self.ubicacion_pasillo
+                       and tuple(int(v) for v in celda) not in self.indice_nodo]
+            pendientes = sueltas[:1]
+            for celda in pendientes:
+                self.indice_nodo[celda] = len(self.nodos)
+                self.nodos.append(celda)
+                self.vecinos_nodo.append([])
+                self.aristas_nodo.append([])
+
+    def distancias_nodos(self):
+        """Matriz (nodos x nodos) de distancias mínimas en celdas; inf si no hay camino. Se calcula una vez"""
+        if self._distancias is not None:
+            return self._distancias
+        cantidad = len(self.nodos)
+        distancias = np.full((cantidad, cantidad), np.inf, dtype=np.float32)
+        np.fill_diagonal(distancias, 0.0)
+        for nodo_a, nodo_b, longitud, _celdas in self.aristas:
+            if longitud < distancias[nodo_a, nodo_b]:
+                distancias[nodo_a, nodo_b] = distancias[nodo_b, nodo_a] = longitud
+        try:
+            from scipy.sparse.csgraph import shortest_path
+            distancias = shortest_path(np.where(np.isinf(distancias), 0, distancias), directed=False).astype(np.float32)
+        except ImportError:
+            # Floyd-Warshall: una pasada de NumPy por nodo intermedio
+            for intermedio in range(cantidad):
+                np.minimum(distancias, distancias[:, intermedio, None] + distancias[None, intermedio, :], out=distancias)
+        self._distancias = distancias
+        return distancias
+
+    def ubicar(self, celda):
+        """Nodos más cercanos a una celda libre: [(nodo, pasos)] (uno si es nodo, los dos extremos si es pasillo)"""
+        if celda in self.indice_nodo:
+            return [(self.indice_nodo[celda], 0)]
+        indice, pasos = self.ubicacion_pasillo[celda]
+        nodo_a, nodo_b, longitud, _celdas = self.aristas[indice]
+        return [(nodo_a, pasos), (nodo_b, longitud - pasos)]
+
+    def distancia(self, celda_a, celda_b):
+        """Distancia mínima en celdas entre dos celdas libres usando la matriz de nodos"""
+        if celda_a == celda_b:
+            return 0.0
+        distancias = self.distancias_nodos()
+        mejor = min(pasos_a + float(distancias[nodo_a, nodo_b]) + pasos_b
+                    for nodo_a, pasos_a in self.ubicar(celda_a)
+                    for nodo_b, pasos_b in self.ubicar(celda_b))
+        # Ambas en el mismo pasillo: también se puede ir directo por él
+        if celda_a in self.ubicacion_pasillo and celda_b in self.ubicacion_pasillo:
+            arista_a, pasos_a = self.ubicacion_pasillo[celda_a]
+            arista_b, pasos_b = self.ubicacion_pasillo[celda_b]
+            if arista_a == arista_b:
+                mejor = min(mejor, abs(pasos_a - pasos_b))
+        return mejor
+
+    def profundidad_callejon(self, celda):
+        """Celdas desde un callejón sin salida hasta el cruce más cercano"""
+        nodo = self.indice_nodo[celda]
+        return min((longitud for _vecino, longitud in self.vecinos_nodo[nodo]), default=0)
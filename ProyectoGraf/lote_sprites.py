@@ -0,0 +1,294 @@
+"""
+Dibujo por lotes de la interfaz 2D (menú, HUD, pantalla de carga, panel del perfilador).
+
+Cada cuadro se acumulan todos los rectángulos con textura (posición en píxeles, UV, color y
+página de textura), se ordenan por capa y página y se suben juntos a un único VBO dinámico:
+hay una llamada de dibujo por cada página (textura) usada en cada capa, no una por elemento.
+
+Las imágenes pequeñas y los glifos del texto se empaquetan en páginas de un Atlas; el texto
+se arma con un quad por carácter desde los glifos ya rasterizados (FuenteAtlas), así que
+cambiar un texto no crea ni sube texturas.
+"""
+import ctypes
+import numpy as np
+import pygame
+from OpenGL import GL as gl
+from graficos_2d import ShaderLoteUI
+
+BLANCO = (1.0, 1.0, 1.0, 1.0)
+
+# Caracteres que FuenteAtlas rasteriza al crearse (el resto se agrega la primera vez que se usa)
+CARACTERES_BASE = "".join(chr(codigo) for codigo in range(32, 127)) + "áéíóúÁÉÍÓÚñÑüÜ¿¡°"
+
+class RegionAtlas:
+    """Rectángulo de una página del atlas: tamaño en píxeles y coordenadas de textura (u0, v0, u1, v1)"""
+    def __init__(self, pagina, ancho, alto, uv):
+        self.pagina = pagina
+        self.ancho = ancho
+        self.alto = alto
+        self.uv = uv
+
+class PaginaAtlas:
+    """Una textura del atlas, llenada por estantes (filas de alto variable) de izquierda a derecha"""
+
+    def __init__(self, ancho, alto):
+        self.ancho = ancho
+        self.alto = alto
+        self.superficie = pygame.Surface((ancho, alto), pygame.SRCALPHA)
+        self.superficie.fill((0, 0, 0, 0))
+        self.id_textura = gl.glGenTextures(1)
+        self.sucia = True
+        self._x = 0
+        self._y = 0
+        self._alto_estante = 0
+
+    def reservar(self, ancho, alto, margen):
+        """Posición (x, y) para un rectángulo de ancho x alto, o None si ya no entra"""
+        x, y, alto_estante = self._x, self._y, self._alto_estante
+        if x + ancho > self.ancho:
+            # Estante nuevo debajo del actual
+            x, y, alto_estante = 0, y + alto_estante + margen, 0
+        if x + ancho > self.ancho or y + alto > self.alto:
+            return None
+        self._x = x + ancho + margen
+        self._y = y
+        self._alto_estante = max(alto_estante, alto)
+        return x, y
+
+    def subir(self):
+        """Sube la superficie a la GPU si cambió desde la última vez"""
+        if not self.sucia:
+            return
+        # Sin invertir: la fila 0 (arriba) queda en v = 0, igual que la proyección de ShaderLoteUI
+        datos = pygame.image.tostring(self.superficie, "RGBA", False)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self.id_textura)
+        gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, self.ancho, self.alto, 0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, datos)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_S, gl.GL_CLAMP_TO_EDGE)
+        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_T, gl.GL_CLAMP_TO_EDGE)
+        self.sucia = False
+
+    def limpiar(self):
+        gl.glDeleteTextures(1, [self.id_textura])
+
+class Atlas:
+    """
+    Empaqueta superficies de pygame en páginas de TAMANO_PAGINA x TAMANO_PAGINA.
+    Una superficie más grande que una página (por ejemplo un fondo) recibe una página propia.
+    """
+
+    TAMANO_PAGINA = 1024
+    # Píxeles libres entre regiones para que el filtrado lineal no mezcle vecinas
+    MARGEN = 2
+
+    def __init__(self, tamano_pagina=TAMANO_PAGINA):
+        self.tamano_pagina = tamano_pagina
+        self.paginas = []
+
+    def agregar(self, superficie):
+        """Copia la superficie al atlas y devuelve su RegionAtlas"""
+        ancho, alto = superficie.get_size()
+        if ancho > self.tamano_pagina or alto > self.tamano_pagina:
+            pagina = PaginaAtlas(ancho, alto)
+            self.paginas.append(pagina)
+            posicion = pagina.reservar(ancho, alto, 0)
+        else:
+            posicion = None
+            for pagina in self.paginas:
+                if pagina.ancho == self.tamano_pagina:
+                    posicion = pagina.reservar(ancho, alto, self.MARGEN)
+                    if posicion is not None:
+                        break
+            if posicion is None:
+                pagina = PaginaAtlas(self.tamano_pagina, self.tamano_pagina)
+                self.paginas.append(pagina)
+                posicion = pagina.reservar(ancho, alto, self.MARGEN)
+        x, y = posicion
+        pagina.superficie.blit(superficie, (x, y))
+        pagina.sucia = True
+        uv = (x / pagina.ancho, y / pagina.alto, (x + ancho) / pagina.ancho, (y + alto) / pagina.alto)
+        return RegionAtlas(pagina, ancho, alto, uv)
+
+    def agregar_color_solido(self):
+        """Región blanca para rectángulos de color (el color lo pone el vértice)"""
+        superficie = pygame.Surface((4, 4), pygame.SRCALPHA)
+        superficie.fill((255, 255, 255, 255))
+        region = self.agregar(superficie)
+        # Todas las UV en el centro: el filtrado nunca toca los bordes
+        u = (region.uv[0] + region.uv[2]) / 2
+        v = (region.uv[1] + region.uv[3]) / 2
+        region.uv = (u, v, u, v)
+        return region
+
+    def limpiar(self):
+        for pagina in self.paginas:
+            pagina.limpiar()
+        self.paginas = []
+
+class FuenteAtlas:
+    """Glifos de una fuente de pygame rasterizados una vez en un Atlas (en blanco, se tiñen al dibujar)"""
+
+    def __init__(self, atlas, nombre="Arial", tamano=24, negrita=False):
+        self.atlas = atlas
+        self.fuente = pygame.font.SysFont(nombre, tamano, bold=negrita)
+        self.alto_linea = self.fuente.get_linesize()
+        self.glifos = {}
+        for caracter in CARACTERES_BASE:
+            self.glifo(caracter)
+
+    def glifo(self, caracter):
+        region = self.glifos.get(caracter)
+        if region is None:
+            region = self.atlas.agregar(self.fuente.render(caracter, True, (255, 255, 255)))
+            self.glifos[caracter] = region
+        return region
+
+    def medir(self, texto, escala=1.0):
+        """(ancho, alto) en píxeles del texto en una línea"""
+        return sum(self.glifo(caracter).ancho for caracter in texto) * escala, self.alto_linea * escala
+
+class LoteSprites:
+    """
+    Acumula quads entre comenzar() y terminar() y los dibuja con una llamada por página y capa.
+    Dentro de una misma capa no se garantiza el orden entre páginas distintas: lo que deba quedar
+    encima (texto sobre un panel, botones sobre el fondo) va en una capa mayor.
+    """
+
+    # x, y, u, v, r, g, b, a
+    COMPONENTES_VERTICE = 8
+    # Esquinas de los dos triángulos del quad: índices en (x0, y0, x1, y1)
+    _ESQUINAS_X = [0, 2, 2, 0, 2, 0]
+    _ESQUINAS_Y = [1, 1, 3, 1, 3, 3]
+
+    def __init__(self):
+        self.shader = ShaderLoteUI()
+        self.atlas = Atlas()
+        self.solido = self.atlas.agregar_color_solido()
+        self.id_contenedor = gl.glGenVertexArrays(1)
+        self.id_buffer = gl.glGenBuffers(1)
+        gl.glBindVertexArray(self.id_contenedor)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.id_buffer)
+        paso = self.COMPONENTES_VERTICE * ctypes.sizeof(ctypes.c_float)
+        for atributo, componentes, desplazamiento in (
+                (ShaderLoteUI.ATRIBUTO_POSICION, 2, 0),
+                (ShaderLoteUI.ATRIBUTO_COORD_TEXTURA, 2, 2),
+                (ShaderLoteUI.ATRIBUTO_COLOR, 4, 4)):
+            gl.glVertexAttribPointer(atributo, componentes, gl.GL_FLOAT, False, paso,
+                                     ctypes.c_void_p(desplazamiento * ctypes.sizeof(ctypes.c_float)))
+            gl.glEnableVertexAttribArray(atributo)
+        gl.glBindVertexArray(0)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+
+        self.resolucion = (1, 1)
+        # Estadísticas del último terminar() y acumuladas
+        self.llamadas_dibujo = 0
+        self.quads_dibujados = 0
+        self.llamadas_totales = 0
+        self._vaciar()
+
+    def _vaciar(self):
+        self._rectangulos = []
+        self._uvs = []
+        self._colores = []
+        self._texturas = []
+        self._capas = []
+        self._paginas = set()
+
+    def comenzar(self, resolucion):
+        self.resolucion = resolucion
+        self._vaciar()
+
+    def textura(self, id_textura, x, y, ancho, alto, color=BLANCO, capa=0, uv=(0.0, 0.0, 1.0, 1.0)):
+        """Quad con una textura propia (fuera del atlas); (x, y) es la esquina superior izquierda en píxeles"""
+        self._rectangulos.append((x, y, x + ancho, y + alto))
+        self._uvs.append(uv)
+        self._colores.append(color)
+        self._texturas.append(id_textura)
+        self._capas.append(capa)
+
+    def region(self, region, x, y, ancho=None, alto=None, color=BLANCO, capa=0):
+        """Quad con una región del atlas, a su tamaño original salvo que se indique otro"""
+        self._paginas.add(region.pagina)
+        self.textura(region.pagina.id_textura, x, y,
+                     region.ancho if ancho is None else ancho,
+                     region.alto if alto is None else alto,
+                     color, capa, region.uv)
+
+    def rectangulo(self, x, y, ancho, alto, color, capa=0):
+        """Rectángulo de un color sólido (con alfa)"""
+        self.region(self.solido, x, y, ancho, alto, color, capa)
+
+    def texto(self, fuente, texto, x, y, color=BLANCO, capa=0, escala=1.0):
+        """Texto en una línea desde (x, y) arriba a la izquierda. Devuelve el ancho dibujado"""
+        inicio = x
+        for caracter in texto:
+            glifo = fuente.glifo(caracter)
+            if caracter != " ":
+                self.region(glifo, x, y, glifo.ancho * escala, glifo.alto * escala, color, capa)
+            x += glifo.ancho * escala
+        return x - inicio
+
+    def _vertices(self, orden):
+        """Arreglo (quads * 6, COMPONENTES_VERTICE) con los quads en el orden indicado"""
+        rectangulos = np.asarray(self._rectangulos, dtype=np.float32)[orden]
+        uvs = np.asarray(self._uvs, dtype=np.float32)[orden]
+        colores = np.asarray(self._colores, dtype=np.float32)[orden]
+        vertices = np.empty((len(orden), 6, self.COMPONENTES_VERTICE), dtype=np.float32)
+        vertices[:, :, 0] = rectangulos[:, self._ESQUINAS_X]
+        vertices[:, :, 1] = rectangulos[:, self._ESQUINAS_Y]
+        vertices[:, :, 2] = uvs[:, self._ESQUINAS_X]
+        vertices[:, :, 3] = uvs[:, self._ESQUINAS_Y]
+        vertices[:, :, 4:] = colores[:, None, :]
+        return vertices.reshape(-1, self.COMPONENTES_VERTICE)
+
+    def terminar(self):
+        """Sube todos los quads en un único VBO y los dibuja. Devuelve la cantidad de llamadas de dibujo"""
+        cantidad = len(self._rectangulos)
+        self.llamadas_dibujo = 0
+        self.quads_dibujados = cantidad
+        if cantidad == 0:
+            return 0
+        for pagina in self._paginas:
+            pagina.subir()
+
+        # Orden estable por (capa, textura): cada tramo con la misma clave es una sola llamada
+        texturas = np.asarray(self._texturas, dtype=np.int64)
+        capas = np.asarray(self._capas, dtype=np.int64)
+        orden = np.lexsort((texturas, capas))
+        texturas = texturas[orden]
+        capas = capas[orden]
+        cortes = np.flatnonzero((texturas[1:] != texturas[:-1]) | (capas[1:] != capas[:-1])) + 1
+        inicios = np.concatenate(([0], cortes)).tolist()
+        finales = np.concatenate((cortes, [cantidad])).tolist()
+
+        vertices = self._vertices(orden)
+        gl.glDisable(gl.GL_DEPTH_TEST)
+        gl.glEnable(gl.GL_BLEND)
+        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+        self.shader.activar()
+        self.shader.set_resolucion(self.resolucion)
+        gl.glBindVertexArray(self.id_contenedor)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.id_buffer)
+        # Buffer nuevo cada cuadro (orphaning): el driver no espera a que la GPU suelte el anterior
+        gl.glBufferData(gl.GL_ARRAY_BUFFER, vertices.nbytes, vertices, gl.GL_STREAM_DRAW)
+        gl.glActiveTexture(gl.GL_TEXTURE0)
+        for inicio, final in zip(inicios, finales):
+            gl.glBindTexture(gl.GL_TEXTURE_2D, int(texturas[inicio]))
+            gl.glDrawArrays(gl.GL_TRIANGLES, inicio * 6, (final - inicio) * 6)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+        gl.glBindVertexArray(0)
+        self.shader.desactivar()
+        gl.glDisable(gl.GL_BLEND)
+        gl.glEnable(gl.GL_DEPTH_TEST)
+
+        self.llamadas_dibujo = len(inicios)
+        self.llamadas_totales += self.llamadas_dibujo
+        self._vaciar()
+        return self.llamadas_dibujo
+
+    def limpiar(self):
+        self.shader.liberar_recursos()
+        self.atlas.limpiar()
+        gl.glDeleteBuffers(1, [self.id_buffer])
+        gl.glDeleteVertexArrays(1, [self.id_contenedor])
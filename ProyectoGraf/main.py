@@ -1,89 +1,209 @@
-import glm
-import pygame
-import pygame.display
-from mundo import Mundo
-from menu import Menu
-import recursos
-import sistemas_renderizado
-import sistemas_renderizado_3d
-import sistema_interfaz
-import sistema_control
-
-RESOLUCION = 1024, 720
-FPS = 60
-NIVEL = 1
-
-def bucle_juego(mundo):
-    reloj = pygame.time.Clock()
-    ultimo_tiempo = pygame.time.get_ticks()
-    mundo.sonido.reproducir('inicio')
-    mundo.sonido.iniciar_musica()
-    while True:
-        # Calcular tiempo delta (diferencia de tiempo entre cuadros)
-        tiempo_actual = pygame.time.get_ticks()
-        mundo.delta = min(max((tiempo_actual - ultimo_tiempo) / 1000.0, 0.00000001), 0.1)
-        mundo.tiempo = tiempo_actual / 1000.0
-        ultimo_tiempo = tiempo_actual
-        # Obtener eventos
-        for evento in pygame.event.get():
-            if evento.type == pygame.QUIT:
-                return
-            elif evento.type == pygame.KEYDOWN and evento.key == pygame.locals.K_ESCAPE:
-                return
-        # Actualizar
-        
-        # --- Lógica de Pausa ---
-        if mundo.estado == recursos.ESTADO_EJECUTANDO or mundo.estado == recursos.ESTADO_INTRO or mundo.estado == recursos.ESTADO_VICTORIA or mundo.estado == recursos.ESTADO_DERROTA:
-            mundo.process(mundo.delta)
-        elif mundo.estado == recursos.ESTADO_PAUSADO:
-            # Solo procesar renderizado y UI en pausa
-            # Nota: esper no tiene un método process_group fácil, así que llamamos a los sistemas manualmente
-            # O simplemente usamos process() pero los sistemas lógicos deben chequear el estado.
-            # En este diseño, los sistemas corren siempre. Vamos a filtrar en main.
-            
-            # Opción B: Ejecutar solo sistemas de renderizado
-            mundo._process(mundo.delta, mundo.get_processor(sistemas_renderizado.SistemaInicioCuadro))
-            mundo._process(mundo.delta, mundo.get_processor(sistemas_renderizado_3d.SistemaConfiguracionLuz))
-            mundo._process(mundo.delta, mundo.get_processor(sistemas_renderizado_3d.SistemaTransformacion))
-            mundo._process(mundo.delta, mundo.get_processor(sistemas_renderizado_3d.SistemaInicioRenderizado))
-            mundo._process(mundo.delta, mundo.get_processor(sistemas_renderizado_3d.SistemaRenderizadoModelos))
-            mundo._process(mundo.delta, mundo.get_processor(sistemas_renderizado_3d.SistemaFinRenderizado))
-            mundo._process(mundo.delta, mundo.get_processor(sistema_interfaz.SistemaUI))
-            mundo._process(mundo.delta, mundo.get_processor(sistemas_renderizado.SistemaFinCuadro))
-            
-            # Permitir cambio de cámara en pausa
-            mundo._process(mundo.delta, mundo.get_processor(sistema_control.SistemaControl))
-
-        reloj.tick(FPS)
-
-def main():
-    pygame.init()
-    pygame.display.init()
-    
-    pygame.display.set_mode(RESOLUCION, pygame.DOUBLEBUF | pygame.OPENGL)
-    pygame.display.set_caption("CHEESE CHASE")
-    
-    # Inicializar fuente para el menú
-    pygame.font.init()
-
-    while True:
-        # Mostrar menú
-        pygame.mouse.set_visible(True)
-        menu = Menu(RESOLUCION)
-        nivel = menu.ejecutar()
-        menu.limpiar()
-
-        if nivel == 4: # Salir
-            break
-            
-        # Ejecutar juego
-        pygame.mouse.set_visible(False)
-        mundo = Mundo(glm.vec2(RESOLUCION), nivel)
-        bucle_juego(mundo)
-        mundo.limpiar()
-
-    pygame.quit()
-
-
-if __name__ == '__main__':
-    main()
+import argparse
+import glm
+import pygame
+import pygame.display
+from mundo import Mundo
+from menu import Menu
+from cargador_asincrono import CargadorAsincrono
+from cola_subida import ColaSubidaGpu
+from pantalla_carga import PantallaCarga
+from grabacion import GrabadorSesion
+from perfilador import Perfilador, OverlayPerfilador
+from servicio_audio import ServicioAudio
+from resolucion_dinamica import SistemaInicioEscena, SistemaFinEscena
+import entrada_jugador
+import recursos
+import sistemas_renderizado
+import sistemas_renderizado_3d
+import sistema_interfaz
+import sistema_control
+
+RESOLUCION = 1024, 720
+FPS = 60
+NIVEL = 1
+PRESUPUESTO_SUBIDA_MS = 8.0
+MAX_DELTA_CUADRO = 0.25
+
+def resolucion_ventana():
+    """Tamaño actual de la ventana (puede cambiar: la ventana es redimensionable)"""
+    return pygame.display.get_surface().get_size()
+
+def cargar_mundo(nivel, precarga, entrada_repetible=False, perfilar=False):
+    """
+    Crea el Mundo y sube sus recursos a la GPU repartidos entre cuadros con barra de progreso.
+    Devuelve None si se cierra la ventana durante la carga. Con 'perfilar' muestra el tiempo
+    de subida de cada recurso.
+    """
+    pantalla = PantallaCarga(resolucion_ventana())
+    cola = ColaSubidaGpu(presupuesto_ms=PRESUPUESTO_SUBIDA_MS)
+    cola.activar()
+    try:
+        mundo = Mundo(glm.vec2(resolucion_ventana()), nivel, precarga, entrada_repetible=entrada_repetible)
+    finally:
+        cola.desactivar()
+
+    reloj = pygame.time.Clock()
+    salir = False
+    while not cola.terminada():
+        for evento in pygame.event.get():
+            if evento.type == pygame.QUIT:
+                # Lo que quede sin subir se descarta junto con el mundo
+                salir = True
+            elif evento.type == pygame.VIDEORESIZE:
+                mundo.actualizar_resolucion(glm.vec2(evento.w, evento.h))
+                pantalla.resolucion = evento.size
+        if salir:
+            break
+        cola.procesar()
+        pantalla.dibujar(cola.progreso())
+        pygame.display.flip()
+        reloj.tick(FPS)
+
+    if perfilar and not salir:
+        cola.imprimir_tiempos()
+    cola.limpiar()
+    pantalla.limpiar()
+    if salir:
+        mundo.limpiar()
+        return None
+    return mundo
+
+def activar_perfilador(mundo):
+    """Cronometra todos los sistemas del mundo y agrega el panel de tiempos (F3 lo oculta)"""
+    perfilador = Perfilador()
+    perfilador.envolver(mundo)
+    overlay = OverlayPerfilador(perfilador, mundo.resolucion)
+    # El panel se dibuja antes de que SistemaFinCuadro cambie de buffer
+    fin_cuadro = mundo.get_processor(sistemas_renderizado.SistemaFinCuadro)
+    mundo.sistemas_cuadro.insert(mundo.sistemas_cuadro.index(fin_cuadro), overlay)
+    return perfilador, overlay
+
+def bucle_juego(mundo, grabador=None, perfilador=None, overlay=None):
+    reloj = pygame.time.Clock()
+    ultimo_tiempo = pygame.time.get_ticks()
+    mundo.sonido.reproducir('inicio')
+    mundo.sonido.iniciar_musica()
+    while True:
+        # Calcular tiempo delta (diferencia de tiempo entre cuadros)
+        tiempo_actual = pygame.time.get_ticks()
+        delta_cuadro = min(max((tiempo_actual - ultimo_tiempo) / 1000.0, 0.00000001), MAX_DELTA_CUADRO)
+        mundo.delta = delta_cuadro
+        mundo.tiempo = tiempo_actual / 1000.0
+        ultimo_tiempo = tiempo_actual
+        # Obtener eventos
+        for evento in pygame.event.get():
+            if evento.type == pygame.QUIT:
+                return
+            elif evento.type == pygame.KEYDOWN and evento.key == pygame.locals.K_ESCAPE:
+                return
+            elif evento.type == pygame.KEYDOWN and evento.key == pygame.locals.K_F3 and overlay:
+                overlay.visible = not overlay.visible
+            elif evento.type == pygame.VIDEORESIZE:
+                mundo.actualizar_resolucion(glm.vec2(evento.w, evento.h))
+                if overlay:
+                    overlay.resolucion = mundo.resolucion
+        # Actualizar
+        
+        # --- Lógica de Pausa ---
+        if mundo.estado == recursos.ESTADO_EJECUTANDO or mundo.estado == recursos.ESTADO_INTRO or mundo.estado == recursos.ESTADO_VICTORIA or mundo.estado == recursos.ESTADO_DERROTA:
+            # Simular a paso fijo todo el tiempo acumulado y luego dibujar interpolando
+            mundo.entrada = entrada_jugador.leer_teclado()
+            if grabador:
+                grabador.grabar(delta_cuadro, mundo.entrada)
+            alfa = mundo.avanzar_simulacion(delta_cuadro)
+            mundo.renderizar(alfa, delta_cuadro)
+        elif mundo.estado == recursos.ESTADO_PAUSADO:
+            # Solo procesar renderizado y UI en pausa
+            # Nota: esper no tiene un método process_group fácil, así que llamamos a los sistemas manualmente
+            # O simplemente usamos process() pero los sistemas lógicos deben chequear el estado.
+            # En este diseño, los sistemas corren siempre. Vamos a filtrar en main.
+            
+            # Opción B: Ejecutar solo sistemas de renderizado
+            mundo._process(mundo.delta, mundo.get_processor(sistemas_renderizado.SistemaInicioCuadro))
+            mundo._process(mundo.delta, mundo.get_processor(SistemaInicioEscena))
+            mundo._process(mundo.delta, mundo.get_processor(sistemas_renderizado_3d.SistemaConfiguracionLuz))
+            mundo._process(mundo.delta, mundo.get_processor(sistemas_renderizado_3d.SistemaTransformacion))
+            mundo._process(mundo.delta, mundo.get_processor(sistemas_renderizado_3d.SistemaInicioRenderizado))
+            mundo._process(mundo.delta, mundo.get_processor(sistemas_renderizado_3d.SistemaRenderizadoModelos))
+            mundo._process(mundo.delta, mundo.get_processor(sistemas_renderizado_3d.SistemaFinRenderizado))
+            mundo._process(mundo.delta, mundo.get_processor(SistemaFinEscena))
+            mundo._process(mundo.delta, mundo.get_processor(sistema_interfaz.SistemaUI))
+            mundo._process(mundo.delta, mundo.get_processor(sistemas_renderizado.SistemaFinCuadro))
+            
+            # Permitir cambio de cámara en pausa
+            mundo._process(mundo.delta, mundo.get_processor(sistema_control.SistemaControl))
+
+        reloj.tick(FPS)
+        if perfilador:
+            perfilador.nuevo_cuadro()
+
+def main():
+    parser = argparse.ArgumentParser(description="Cheese Chase")
+    parser.add_argument("--semilla", type=int, default=None, help="fija el azar de cada partida")
+    parser.add_argument("--perfilar", action="store_true", help="muestra el tiempo de cada sistema por cuadro, el de cada subida a la GPU y los redibujos del menú")
+    parser.add_argument("--traza", metavar="RUTA", default=None, help="con --perfilar, guarda la traza en formato Chrome al salir de la partida")
+    parser.add_argument("--resolucion-dinamica", type=float, metavar="MS", default=None,
+                        help="baja la resolución de la escena 3D para que tarde unos MS ms de GPU por cuadro")
+    parser.add_argument("--grabar", metavar="RUTA", default=None, help="graba la partida para reproducirla sin GPU (python grabacion.py RUTA)")
+    argumentos = parser.parse_args()
+
+    # Búfer de mezcla corto: los efectos suenan con menos latencia
+    pygame.mixer.pre_init(44100, -16, 2, 512)
+    pygame.init()
+    pygame.display.init()
+    # Decodifica los efectos en segundo plano mientras se muestra el menú
+    audio = ServicioAudio.obtener()
+    
+    pygame.display.set_mode(RESOLUCION, pygame.DOUBLEBUF | pygame.OPENGL | pygame.RESIZABLE)
+    pygame.display.set_caption("CHEESE CHASE")
+    
+    # Inicializar fuente para el menú
+    pygame.font.init()
+
+    while True:
+        # Preparar recursos en segundo plano mientras se muestra el menú
+        precarga = CargadorAsincrono(semilla=argumentos.semilla)
+
+        # Mostrar menú
+        pygame.mouse.set_visible(True)
+        menu = Menu(resolucion_ventana(), depurar=argumentos.perfilar)
+        nivel = menu.ejecutar()
+        menu.limpiar()
+
+        if nivel == 4: # Salir
+            precarga.cerrar()
+            break
+            
+        # Ejecutar juego
+        pygame.mouse.set_visible(False)
+        # Al grabar, el jugador se mueve con la misma máscara que se guarda (ver grabacion.py)
+        mundo = cargar_mundo(nivel, precarga, entrada_repetible=bool(argumentos.grabar),
+                             perfilar=argumentos.perfilar)
+        precarga.cerrar()
+        if mundo is None: # Ventana cerrada durante la carga
+            break
+        if argumentos.resolucion_dinamica:
+            mundo.activar_resolucion_dinamica(objetivo_ms=argumentos.resolucion_dinamica)
+        grabador = None
+        if argumentos.grabar:
+            grabador = GrabadorSesion.para_mundo(argumentos.grabar, mundo)
+        perfilador, overlay = activar_perfilador(mundo) if argumentos.perfilar else (None, None)
+        try:
+            bucle_juego(mundo, grabador, perfilador, overlay)
+        finally:
+            # Aunque el bucle falle, el archivo queda completo y se puede reproducir hasta ahí
+            if grabador:
+                grabador.cerrar(mundo.hash_estado())
+        if perfilador:
+            if argumentos.traza:
+                perfilador.exportar_traza_chrome(argumentos.traza)
+            perfilador.limpiar()
+            overlay.limpiar()
+        mundo.limpiar()
+
+    audio.cerrar()
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,167 +1,198 @@
-import pygame
-from OpenGL import GL as gl
-import glm
-from graficos_2d import ShaderUI
-from clases_renderizado import ElementoInterfaz
-
-class Menu:
-    def __init__(self, resolucion):
-        self.resolucion = resolucion
-        self.shader = ShaderUI()
-        self.quad = ElementoInterfaz.crear_quad_interfaz()
-        self.fuente = pygame.font.SysFont("Arial", 48)
-        self.opciones = [
-            {"texto": "Principiante", "archivo": "Principiante.png", "nivel": 1},
-            {"texto": "Intermedio", "archivo": "Intermedio.png", "nivel": 2},
-            {"texto": "Avanzado", "archivo": "Avanzado.png", "nivel": 3},
-            {"texto": "Salir", "archivo": "Salir.png", "nivel": 4}
-        ]
-        self.texturas_opciones = {}
-        self._cargar_recursos()
-        
-        # Cargar fondo
-        try:
-            import os
-            ruta_base = os.path.dirname(__file__)
-            ruta_fondo = os.path.join(ruta_base, "recursos", "Menu", "menu.png")
-            imagen_fondo = pygame.image.load(ruta_fondo)
-            self.textura_fondo, _, _ = self._convertir_superficie(imagen_fondo)
-        except Exception as error:
-            print(f"No se pudo cargar el fondo: {error}")
-            self.textura_fondo = None
-
-    def _cargar_recursos(self):
-        """Carga las texturas para las opciones del menú"""
-        import os
-        ruta_base = os.path.dirname(__file__)
-        ruta_menu = os.path.join(ruta_base, "recursos", "Menu")
-        
-        for opcion in self.opciones:
-            ruta_imagen = os.path.join(ruta_menu, opcion["archivo"])
-            try:
-                superficie_imagen = pygame.image.load(ruta_imagen).convert_alpha()
-                self.texturas_opciones[opcion["texto"]] = self._convertir_superficie(superficie_imagen)
-            except Exception as error:
-                print(f"Error cargando {ruta_imagen}: {error}")
-                # Usar texto como respaldo si falla la imagen
-                superficie_texto = self.fuente.render(opcion["texto"], True, (255, 255, 255))
-                self.texturas_opciones[opcion["texto"]] = self._convertir_superficie(superficie_texto)
-
-    def _convertir_superficie(self, superficie):
-        """Convierte una superficie de Pygame a una textura OpenGL"""
-        superficie = pygame.transform.flip(superficie, False, True)
-        ancho, alto = superficie.get_size()
-        datos_imagen = pygame.image.tostring(superficie, "RGBA", 1)
-        
-        id_textura = gl.glGenTextures(1)
-        gl.glBindTexture(gl.GL_TEXTURE_2D, id_textura)
-        gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, ancho, alto, 0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, datos_imagen)
-        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
-        gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
-        return id_textura, ancho, alto
-
-    def ejecutar(self):
-        reloj = pygame.time.Clock()
-        while True:
-            for evento in pygame.event.get():
-                if evento.type == pygame.QUIT:
-                    return 4
-                if evento.type == pygame.MOUSEBUTTONDOWN:
-                    x, y = pygame.mouse.get_pos()
-                    # Convertir a coordenadas normalizadas si es necesario, o chequear colisión simple
-                    # Verificar si se seleccionó alguna opción
-                    seleccion = self._detectar_click(x, y)
-                    if seleccion:
-                        return seleccion
-
-            self._renderizar()
-            pygame.display.flip()
-            reloj.tick(60)
-
-    def _detectar_click(self, mouse_x, mouse_y):
-        """Detecta si se hizo clic en alguna opción"""
-        # Posición inicial y separación vertical
-        inicio_y = 0.2
-        separacion = 0.2
-        
-        # Convertir coordenadas del mouse a espacio normalizado (-1 a 1)
-        x_normalizada = (mouse_x / self.resolucion[0]) * 2 - 1
-        y_normalizada = -((mouse_y / self.resolucion[1]) * 2 - 1) # Invertir Y
-
-        for i, opcion in enumerate(self.opciones):
-            posicion_y = inicio_y - i * separacion
-            # Dimensiones aproximadas del área de clic
-            ancho_boton = 1.2
-            alto_boton = 0.35
-            
-            # Verificar si el clic está dentro del botón
-            if -ancho_boton/2 < x_normalizada < ancho_boton/2 and posicion_y - alto_boton/2 < y_normalizada < posicion_y + alto_boton/2:
-                return opcion["nivel"]
-        return None
-
-    def _renderizar(self):
-        gl.glClearColor(0.1, 0.1, 0.1, 1.0)
-        gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
-        
-        gl.glDisable(gl.GL_DEPTH_TEST)
-        gl.glEnable(gl.GL_BLEND)
-        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
-        
-        self.shader.activar()
-        gl.glBindVertexArray(self.quad.id_contenedor)
-        gl.glEnableVertexAttribArray(0)
-        gl.glEnableVertexAttribArray(1)
-
-        # Renderizar fondo
-        if self.textura_fondo:
-            gl.glActiveTexture(gl.GL_TEXTURE0)
-            gl.glBindTexture(gl.GL_TEXTURE_2D, self.textura_fondo)
-            
-            # Escalar para cubrir toda la pantalla (-1 a 1)
-            # El quad es 0 a 1.
-            # Trasladar a -1, -1 y escalar por 2.
-            matriz = glm.mat4(1.0)
-            matriz = glm.translate(matriz, glm.vec3(-1.0, -1.0, 0.0))
-            matriz = glm.scale(matriz, glm.vec3(2.0, 2.0, 1.0))
-            
-            self.shader.set_transformacion(matriz)
-            gl.glDrawArrays(gl.GL_TRIANGLES, 0, self.quad.num_vertices)
-
-        inicio_y = 0.2
-        separacion = 0.2
-
-        for i, opcion in enumerate(self.opciones):
-            id_textura, ancho, alto = self.texturas_opciones[opcion["texto"]]
-            
-            # Calcular escala para mantener la proporción de la imagen
-            relacion_aspecto = ancho / alto
-            escala_y = 0.35
-            escala_x = escala_y * relacion_aspecto * (self.resolucion[1] / self.resolucion[0])
-
-            posicion_y = inicio_y - i * separacion
-            
-            matriz = glm.mat4(1.0)
-            # Centrar la imagen
-            matriz = glm.translate(matriz, glm.vec3(-escala_x / 2.0, posicion_y - escala_y / 2.0, 0.0))
-            matriz = glm.scale(matriz, glm.vec3(escala_x, escala_y, 1.0))
-            
-            gl.glActiveTexture(gl.GL_TEXTURE0)
-            gl.glBindTexture(gl.GL_TEXTURE_2D, id_textura)
-            self.shader.set_transformacion(matriz)
-            
-            gl.glDrawArrays(gl.GL_TRIANGLES, 0, self.quad.num_vertices)
-
-        gl.glDisableVertexAttribArray(0)
-        gl.glDisableVertexAttribArray(1)
-        gl.glBindVertexArray(0)
-        self.shader.desactivar()
-        gl.glDisable(gl.GL_BLEND)
-        gl.glEnable(gl.GL_DEPTH_TEST)
-
-    def limpiar(self):
-        self.shader.liberar_recursos()
-        self.quad.limpiar()
-        for id_textura, _, _ in self.texturas_opciones.values():
-            gl.glDeleteTextures(1, [id_textura])
-        if self.textura_fondo:
-            gl.glDeleteTextures(1, [self.textura_fondo])
+import time
+import pygame
+from OpenGL import GL as gl
+from lote_sprites import LoteSprites
+from widgets_interfaz import CapaWidgets, Widget
+
+class Menu:
+    """
+    Menú principal. Solo se redibuja cuando algo cambia (clic, cursor sobre otra opción,
+    ventana expuesta o redimensionada, o una llamada a invalidar()); el resto del tiempo
+    el bucle queda bloqueado en pygame.event.wait sin gastar CPU ni GPU.
+    """
+
+    FPS_ANIMACION = 60
+    # Espera máxima sin eventos: solo para llevar la cuenta del tiempo inactivo
+    ESPERA_MAXIMA_MS = 500
+    # Sin entrada del usuario durante este tiempo el menú se considera inactivo
+    UMBRAL_INACTIVIDAD = 1.0
+    COLOR_RESALTADO = (1.0, 0.9, 0.6, 1.0)
+    # Columna de opciones en fracciones de la pantalla (origen arriba a la izquierda)
+    INICIO_OPCIONES_Y = 0.4
+    SEPARACION_OPCIONES = 0.1
+    ALTO_OPCION = 0.175
+    # Eventos que obligan a redibujar (el contenido de la ventana puede haberse perdido)
+    EVENTOS_REDIBUJO = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED,
+                        pygame.WINDOWSIZECHANGED, pygame.WINDOWFOCUSGAINED)
+
+    def __init__(self, resolucion, depurar=False):
+        self.resolucion = resolucion
+        # Con 'depurar' se imprimen las estadísticas de redibujo al cerrar el menú
+        self.depurar = depurar
+        # Redibujo a demanda: ver invalidar() y animar()
+        self.invalido = True
+        self.fin_animacion = 0.0
+        # Estadísticas de redibujo (ver cuadros_por_minuto_inactivo)
+        self.cuadros_dibujados = 0
+        self.cuadros_inactivos = 0
+        self.tiempo_inactivo = 0.0
+        # Fondo y botones comparten el atlas del lote: dos llamadas de dibujo por cuadro
+        self.lote = LoteSprites()
+        self.fuente = pygame.font.SysFont("Arial", 48)
+        self.opciones = [
+            {"texto": "Principiante", "archivo": "Principiante.png", "nivel": 1},
+            {"texto": "Intermedio", "archivo": "Intermedio.png", "nivel": 2},
+            {"texto": "Avanzado", "archivo": "Avanzado.png", "nivel": 3},
+            {"texto": "Salir", "archivo": "Salir.png", "nivel": 4}
+        ]
+        self.regiones_opciones = {}
+        self._cargar_recursos()
+        self.widgets = self._crear_widgets()
+        
+        # Cargar fondo
+        try:
+            import os
+            ruta_base = os.path.dirname(__file__)
+            ruta_fondo = os.path.join(ruta_base, "recursos", "Menu", "menu.png")
+            imagen_fondo = pygame.image.load(ruta_fondo)
+            self.region_fondo = self.lote.atlas.agregar(imagen_fondo)
+        except Exception as error:
+            print(f"No se pudo cargar el fondo: {error}")
+            self.region_fondo = None
+
+    def _cargar_recursos(self):
+        """Agrega al atlas las imágenes de las opciones del menú"""
+        import os
+        ruta_base = os.path.dirname(__file__)
+        ruta_menu = os.path.join(ruta_base, "recursos", "Menu")
+        
+        for opcion in self.opciones:
+            ruta_imagen = os.path.join(ruta_menu, opcion["archivo"])
+            try:
+                superficie_imagen = pygame.image.load(ruta_imagen).convert_alpha()
+                self.regiones_opciones[opcion["texto"]] = self.lote.atlas.agregar(superficie_imagen)
+            except Exception as error:
+                print(f"Error cargando {ruta_imagen}: {error}")
+                # Usar texto como respaldo si falla la imagen
+                superficie_texto = self.fuente.render(opcion["texto"], True, (255, 255, 255))
+                self.regiones_opciones[opcion["texto"]] = self.lote.atlas.agregar(superficie_texto)
+
+    def invalidar(self):
+        """Pide redibujar el menú una vez en la próxima vuelta del bucle"""
+        self.invalido = True
+
+    def animar(self, segundos):
+        """Redibuja a FPS_ANIMACION durante 'segundos' (para transiciones o efectos animados)"""
+        self.fin_animacion = max(self.fin_animacion, time.perf_counter() + segundos)
+        self.invalido = True
+
+    def cuadros_por_minuto_inactivo(self):
+        """Cuadros dibujados por minuto sin entrada del usuario (idealmente cerca de 0)"""
+        if self.tiempo_inactivo <= 0.0:
+            return 0.0
+        return self.cuadros_inactivos * 60.0 / self.tiempo_inactivo
+
+    def imprimir_estadisticas(self):
+        print(f"Menú: {self.cuadros_dibujados} cuadros dibujados, "
+              f"{self.cuadros_por_minuto_inactivo():.1f} por minuto inactivo "
+              f"({self.tiempo_inactivo:.1f} s inactivo)")
+
+    def _procesar_evento(self, evento):
+        """Atiende un evento; devuelve el nivel elegido o None"""
+        if evento.type == pygame.QUIT:
+            return 4
+        if evento.type == pygame.MOUSEBUTTONDOWN:
+            x, y = evento.pos
+            seleccion = self._detectar_click(x, y)
+            if seleccion:
+                return seleccion
+        elif evento.type == pygame.MOUSEMOTION:
+            resaltado = self.widgets.widget_en(*evento.pos)
+            if resaltado is not self.widgets.resaltado:
+                self.widgets.resaltado = resaltado
+                self.invalidar()
+        elif evento.type == pygame.VIDEORESIZE:
+            self.resolucion = evento.size
+            self.widgets.disponer(self.resolucion)
+            gl.glViewport(0, 0, evento.w, evento.h)
+            self.invalidar()
+        elif evento.type in self.EVENTOS_REDIBUJO:
+            self.invalidar()
+        return None
+
+    def _crear_widgets(self):
+        """Un botón por opción; el área clicable mide lo que la separación para que no se solapen"""
+        capa = CapaWidgets()
+        for i, opcion in enumerate(self.opciones):
+            capa.agregar(Widget(
+                self.regiones_opciones[opcion["texto"]],
+                centro_x=0.5,
+                centro_y=self.INICIO_OPCIONES_Y + i * self.SEPARACION_OPCIONES,
+                alto=self.ALTO_OPCION,
+                alto_impacto=self.SEPARACION_OPCIONES,
+                valor=opcion["nivel"],
+                color_resaltado=self.COLOR_RESALTADO))
+        capa.disponer(self.resolucion)
+        return capa
+
+    def ejecutar(self):
+        reloj = pygame.time.Clock()
+        ultima_entrada = time.perf_counter()
+        anterior = ultima_entrada
+        try:
+            while True:
+                ahora = time.perf_counter()
+                animando = ahora < self.fin_animacion
+                if animando or self.invalido:
+                    # No bloquear: hay algo que dibujar
+                    eventos = pygame.event.get()
+                else:
+                    eventos = [pygame.event.wait(self.ESPERA_MAXIMA_MS)] + pygame.event.get()
+
+                ahora = time.perf_counter()
+                if ahora - ultima_entrada >= self.UMBRAL_INACTIVIDAD:
+                    self.tiempo_inactivo += ahora - anterior
+                anterior = ahora
+                for evento in eventos:
+                    if evento.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN):
+                        ultima_entrada = ahora
+                    seleccion = self._procesar_evento(evento)
+                    if seleccion:
+                        return seleccion
+
+                if not (self.invalido or ahora < self.fin_animacion):
+                    continue
+                self.invalido = False
+                self._renderizar()
+                pygame.display.flip()
+                self.cuadros_dibujados += 1
+                if ahora - ultima_entrada >= self.UMBRAL_INACTIVIDAD:
+                    self.cuadros_inactivos += 1
+                # Sin animación el límite casi nunca actúa: solo se dibuja tras un evento
+                reloj.tick(self.FPS_ANIMACION)
+        finally:
+            if self.depurar:
+                self.imprimir_estadisticas()
+
+    def _detectar_click(self, mouse_x, mouse_y):
+        """Nivel de la opción bajo el cursor, o None"""
+        widget = self.widgets.widget_en(mouse_x, mouse_y)
+        return widget.valor if widget else None
+
+    def _renderizar(self):
+        gl.glClearColor(0.1, 0.1, 0.1, 1.0)
+        gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
+
+        ancho_pantalla, alto_pantalla = self.resolucion
+        self.lote.comenzar(self.resolucion)
+
+        # Fondo cubriendo toda la pantalla
+        if self.region_fondo:
+            self.lote.region(self.region_fondo, 0, 0, ancho_pantalla, alto_pantalla, capa=0)
+
+        # Rectángulos ya calculados por CapaWidgets.disponer (los mismos del clic)
+        self.widgets.dibujar(self.lote, capa=1)
+        self.lote.terminar()
+
+    def limpiar(self):
+        self.lote.limpiar()
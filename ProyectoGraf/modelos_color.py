@@ -1,40 +1,176 @@
-import glm
-
-def hsv_a_rgb(h, s, v):
-    """
-    Convierte un color de modelo HSV a RGB.
-    
-    Parámetros:
-    h (float): Matiz (Hue) [0.0 - 360.0]
-    s (float): Saturación [0.0 - 1.0]
-    v (float): Valor (Brillo) [0.0 - 1.0]
-    
-    Retorna:
-    glm.vec3: Color en formato RGB con valores entre 0.0 y 1.0
-    """
-    c = v * s
-    x = c * (1 - abs(((h / 60.0) % 2) - 1))
-    m = v - c
-    
-    r_temp, g_temp, b_temp = 0.0, 0.0, 0.0
-    
-    if 0 <= h < 60:
-        r_temp, g_temp, b_temp = c, x, 0
-    elif 60 <= h < 120:
-        r_temp, g_temp, b_temp = x, c, 0
-    elif 120 <= h < 180:
-        r_temp, g_temp, b_temp = 0, c, x
-    elif 180 <= h < 240:
-        r_temp, g_temp, b_temp = 0, x, c
-    elif 240 <= h < 300:
-        r_temp, g_temp, b_temp = x, 0, c
-    elif 300 <= h < 360:
-        r_temp, g_temp, b_temp = c, 0, x
-        
-    return glm.vec3(r_temp + m, g_temp + m, b_temp + m)
-
-def rgb_a_cmy(r, g, b):
-    """
-    Convierte RGB a CMY.
-    """
-    return glm.vec3(1.0 - r, 1.0 - g, 1.0 - b)
+import glm
+import numpy as np
+
+def hsv_a_rgb(h, s, v):
+    """
+    Convierte un color de modelo HSV a RGB.
+    
+    Parámetros:
+    h (float): Matiz (Hue) [0.0 - 360.0]
+    s (float): Saturación [0.0 - 1.0]
+    v (float): Valor (Brillo) [0.0 - 1.0]
+    
+    Retorna:
+    glm.vec3: Color en formato RGB con valores entre 0.0 y 1.0
+    """
+    c = v * s
+    x = c * (1 - abs(((h / 60.0) % 2) - 1))
+    m = v - c
+    
+    r_temp, g_temp, b_temp = 0.0, 0.0, 0.0
+    
+    if 0 <= h < 60:
+        r_temp, g_temp, b_temp = c, x, 0
+    elif 60 <= h < 120:
+        r_temp, g_temp, b_temp = x, c, 0
+    elif 120 <= h < 180:
+        r_temp, g_temp, b_temp = 0, c, x
+    elif 180 <= h < 240:
+        r_temp, g_temp, b_temp = 0, x, c
+    elif 240 <= h < 300:
+        r_temp, g_temp, b_temp = x, 0, c
+    elif 300 <= h < 360:
+        r_temp, g_temp, b_temp = c, 0, x
+        
+    return glm.vec3(r_temp + m, g_temp + m, b_temp + m)
+
+def rgb_a_cmy(r, g, b):
+    """
+    Convierte RGB a CMY.
+    """
+    return glm.vec3(1.0 - r, 1.0 - g, 1.0 - b)
+
+def cmy_a_rgb(c, m, y):
+    """
+    Convierte CMY a RGB.
+    """
+    return glm.vec3(1.0 - c, 1.0 - m, 1.0 - y)
+
+def rgb_a_hsv(r, g, b):
+    """
+    Convierte un color RGB (valores entre 0.0 y 1.0) a HSV.
+    
+    Retorna:
+    glm.vec3: (h [0.0 - 360.0), s [0.0 - 1.0], v [0.0 - 1.0])
+    """
+    return glm.vec3(*_rgb_a_hsv(r, g, b))
+
+def _rgb_a_hsv(r, g, b):
+    """rgb_a_hsv en floats de Python (sin redondear a glm.vec3) para encadenar conversiones"""
+    maximo = max(r, g, b)
+    minimo = min(r, g, b)
+    delta = maximo - minimo
+    
+    # El matiz depende de qué canal es el mayor
+    if delta == 0:
+        h = 0.0
+    elif maximo == r:
+        h = 60.0 * (((g - b) / delta) % 6)
+    elif maximo == g:
+        h = 60.0 * ((b - r) / delta + 2)
+    else:
+        h = 60.0 * ((r - g) / delta + 4)
+        
+    s = 0.0 if maximo == 0 else delta / maximo
+    return h, s, maximo
+
+def hsl_a_rgb(h, s, l):
+    """
+    Convierte un color de modelo HSL a RGB.
+    
+    Parámetros:
+    h (float): Matiz (Hue) [0.0 - 360.0]
+    s (float): Saturación [0.0 - 1.0]
+    l (float): Luminosidad [0.0 - 1.0]
+    """
+    # HSL es HSV con otro valor y otra saturación
+    v = l + s * min(l, 1 - l)
+    s_v = 0.0 if v == 0 else 2 * (1 - l / v)
+    return hsv_a_rgb(h, s_v, v)
+
+def rgb_a_hsl(r, g, b):
+    """
+    Convierte RGB a HSL: glm.vec3(h [0.0 - 360.0), s, l)
+    """
+    h, s_v, v = _rgb_a_hsv(r, g, b)
+    l = v * (1 - s_v / 2)
+    s = 0.0 if l == 0 or l == 1 else (v - l) / min(l, 1 - l)
+    return glm.vec3(h, s, l)
+
+#
+# Versiones para arreglos de NumPy: reciben (N, 3) y devuelven (N, 3), con las mismas
+# fórmulas (y el mismo orden de operaciones) que las de un solo color
+#
+
+# Para cada sector de hsv_a_rgb, qué valor lleva cada canal (r, g, b): 0 = c, 1 = x, 2 = cero
+_COMPONENTES_SECTOR = np.array([
+    (0, 1, 2),
+    (1, 0, 2),
+    (2, 0, 1),
+    (2, 1, 0),
+    (1, 2, 0),
+    (0, 2, 1),
+    (2, 2, 2),
+])
+
+def hsv_a_rgb_lote(hsv):
+    """hsv_a_rgb para un arreglo (N, 3) de colores (h, s, v)"""
+    hsv = np.asarray(hsv, dtype=np.float64)
+    h, s, v = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+    c = v * s
+    # En [0, 360) h / 60 no es negativo y fmod da lo mismo que % (y es bastante más rápido);
+    # fuera de ese rango x no se usa
+    sextos = h / 60.0
+    x = c * (1 - np.abs(np.fmod(sextos, 2) - 1))
+    m = v - c
+    
+    # Sector de 60 grados; fuera de [0, 360) (o NaN) se usa la fila 6 y el color es gris (m, m, m),
+    # como en la versión escalar. Esos matices no se convierten a entero: NaN daría un índice inválido
+    fuera = ~np.isfinite(h) | (h < 0) | (h >= 360)
+    sector = np.minimum(np.where(fuera, 0.0, sextos).astype(np.intp), 5)
+    sector[fuera] = 6
+    componentes = np.stack((c, x, np.zeros_like(c)), axis=-1)
+    temporal = np.take_along_axis(componentes, _COMPONENTES_SECTOR[sector], axis=-1)
+    return temporal + m[..., None]
+
+def rgb_a_cmy_lote(rgb):
+    """rgb_a_cmy para un arreglo (N, 3)"""
+    return 1.0 - np.asarray(rgb, dtype=np.float64)
+
+def cmy_a_rgb_lote(cmy):
+    """cmy_a_rgb para un arreglo (N, 3)"""
+    return 1.0 - np.asarray(cmy, dtype=np.float64)
+
+def rgb_a_hsv_lote(rgb):
+    """rgb_a_hsv para un arreglo (N, 3) de colores (r, g, b)"""
+    rgb = np.asarray(rgb, dtype=np.float64)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    # Por columnas: max/min a lo largo de un eje de tamaño 3 es mucho más lento
+    maximo = np.maximum(np.maximum(r, g), b)
+    minimo = np.minimum(np.minimum(r, g), b)
+    delta = maximo - minimo
+    divisor = np.where(delta == 0, 1.0, delta)
+    
+    # Mismo orden de prioridad que la versión escalar: r, luego g, luego b
+    h = np.where(maximo == r, 60.0 * (((g - b) / divisor) % 6),
+                 np.where(maximo == g, 60.0 * ((b - r) / divisor + 2), 60.0 * ((r - g) / divisor + 4)))
+    h[delta == 0] = 0.0
+    s = np.where(maximo == 0, 0.0, delta / np.where(maximo == 0, 1.0, maximo))
+    return np.stack((h, s, maximo), axis=-1)
+
+def hsl_a_rgb_lote(hsl):
+    """hsl_a_rgb para un arreglo (N, 3) de colores (h, s, l)"""
+    hsl = np.asarray(hsl, dtype=np.float64)
+    h, s, l = hsl[..., 0], hsl[..., 1], hsl[..., 2]
+    v = l + s * np.minimum(l, 1 - l)
+    s_v = np.where(v == 0, 0.0, 2 * (1 - l / np.where(v == 0, 1.0, v)))
+    return hsv_a_rgb_lote(np.stack((h, s_v, v), axis=-1))
+
+def rgb_a_hsl_lote(rgb):
+    """rgb_a_hsl para un arreglo (N, 3)"""
+    hsv = rgb_a_hsv_lote(rgb)
+    h, s_v, v = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+    l = v * (1 - s_v / 2)
+    extremo = (l == 0) | (l == 1)
+    s = np.where(extremo, 0.0, (v - l) / np.where(extremo, 1.0, np.minimum(l, 1 - l)))
+    return np.stack((h, s, l), axis=-1)
@@ -1,486 +1,765 @@
-import math
-import random
-import esper
-import glm
-import pygame
-from sonido import Sonido
-import componentes_3d as componentes
-import sistema_control as sistemas_control
-import sistemas_fisicos as sistemas_fisicos
-import sistemas_renderizado as sistemas_renderizado
-import sistemas_renderizado_3d as sistemas_renderizado_3d
-import recursos
-from laberinto import _configurar_laberinto
-from graficos_3d import ShaderEstandar
-from clases_renderizado import Modelo3D
-import sistema_animacion as sistema_animacion
-from sistema_interfaz import SistemaUI
-from curvas_bezier import CurvaBezier
-from curvas_bspline import CurvaBSpline
-import modelos_color
-
-class Mundo(esper.World):
-    def __init__(self, resolucion, nivel):
-        super().__init__()
-        self.sonido = Sonido()
-        self.resolucion = resolucion
-        self.estado = recursos.ESTADO_INTRO
-        self.vida = 3
-        self.nivel = nivel
-        self.shader_estandar = ShaderEstandar()
-        self.delta = 0.00001
-        self.tiempo = 0.0
-        self.tiempo_intro = 0.0
-        self.duracion_intro = 4.0 # Segundos
-        
-        # Puntos de control para la intro (Curva de Bézier)
-        # Inicio (Arriba y lejos, centrado en X)
-        self.punto_inicio = glm.vec3(15.0, -30.0, 60.0)
-        # Primer punto de control: Bajando hacia el laberinto
-        self.punto_control_1 = glm.vec3(15.0, 0.0, 45.0)
-        # Segundo punto de control: Acercándose al jugador (desde arriba)
-        self.punto_control_2 = glm.vec3(2.0, 2.0, 25.0)
-        # El punto final se calculará dinámicamente basado en la posición inicial de la cámara del jugador
-        # P3 se calculará dinámicamente basado en la posición inicial de la cámara del jugador
-        
-        self.curva_intro = None # Se inicializa en _configurar_entidades
-        
-        # Variables para la victoria
-        self.curva_victoria = None
-        self.tiempo_victoria = 0.0
-        self.duracion_vuelta_victoria = 30.0 # Segundos por vuelta (Aún más lento)
-
-        self.configuracion_luz = recursos.ConfiguracionIluminacion(ambiente_global=glm.vec3(0.6, 0.6, 0.6))
-        self.controles = recursos.ControlJuego()
-        self.registro_modelos = recursos.GestorRecursos()
-        self.id_camara = 0
-        self.matriz_vista = glm.mat4(1.0)
-        self.ancho_laberinto = 30
-        self.largo_laberinto = 30
-        self.laberinto = _configurar_laberinto(self, self.ancho_laberinto, self.largo_laberinto, profundidad=1.5)
-        self._inicializar_sistemas()
-        self._crear_entidades_base()
-        self._crear_nivel()
-        self.actualizar_resolucion(resolucion)
-
-    def process(self, dt=0):
-        # Procesar intro
-        if self.estado == recursos.ESTADO_INTRO:
-            self.tiempo_intro += self.delta
-            t = min(self.tiempo_intro / self.duracion_intro, 1.0)
-            
-            # Actualizar posición de cámara libre
-            if self.curva_intro:
-                # Calcular nueva posición en la curva
-                nueva_pos = self.curva_intro.calcular_punto(t)
-                transformacion_camara = self.component_for_entity(self.cam_libre, componentes.Transformacion)
-                transformacion_camara.posicion = nueva_pos
-                
-                # Mirar siempre al centro o interpolar hacia donde mira el jugador
-                centro = glm.vec3(15, 15, 0)
-                jugador_pos = glm.vec3(2.0, 2.0, 1.0) # Posición conocida del jugador
-                
-                # Interpolación lineal del objetivo de la cámara
-                # Al principio mira al centro, al final mira al jugador
-                mirar_a = centro * (1.0 - t) + jugador_pos * t
-                
-                self.component_for_entity(self.cam_libre, componentes.OrientacionCamara).mirar_a = mirar_a
-
-            if t >= 1.0:
-                self.estado = recursos.ESTADO_EJECUTANDO
-                self.id_camara = self.cam_jugador
-                self.controles.modo_control = recursos.ControlJuego.MODO_JUGADOR
-        
-        # Procesar Victoria o Derrota (Cámara B-Spline + Luces HSV)
-        elif self.estado == recursos.ESTADO_VICTORIA or self.estado == recursos.ESTADO_DERROTA:
-            self.tiempo_victoria += self.delta
-            
-            # 1. Movimiento de Cámara (B-Spline)
-            if self.curva_victoria:
-                # t cíclico de 0.0 a 1.0
-                t = (self.tiempo_victoria % self.duracion_vuelta_victoria) / self.duracion_vuelta_victoria
-                
-                nueva_pos = self.curva_victoria.calcular_punto(t)
-                transformacion_camara = self.component_for_entity(self.cam_libre, componentes.Transformacion)
-                transformacion_camara.posicion = nueva_pos
-                
-                # Mirar siempre al centro del laberinto
-                centro = glm.vec3(self.laberinto.centro.x, self.laberinto.centro.y, 0)
-                self.component_for_entity(self.cam_libre, componentes.OrientacionCamara).mirar_a = centro
-
-            # 2. Luces de Fiesta (Modelo HSV)
-            # Variar el matiz (Hue) con el tiempo
-            hue = (self.tiempo_victoria * 30.0) % 360.0 # Más lento: 30 grados por segundo
-            
-            # Usar menor saturación (0.4) para colores pastel y buen brillo (0.8)
-            # Esto evita que se vea "quemado" o muy oscuro
-            color_fiesta = modelos_color.hsv_a_rgb(hue, 0.4, 0.8) 
-            
-            # Aplicar a la luz ambiental global
-            self.configuracion_luz.ambiente_global = color_fiesta
-            
-            # Opcional: Aplicar a la luz central
-            # (Asumiendo que la luz central es la primera entidad con componente Luz creada en _crear_nivel)
-            # Pero modificar el ambiente global es más efectivo para "llenar" la escena de color.
-
-
-        super().process()
-
-    def limpiar(self):
-        # Limpiar recursos de OpenGL explícitamente
-        # Es necesario hacerlo antes de que PyOpenGL se destruya al salir
-        for _entidad, vbo in self.get_component(Modelo3D):
-            vbo.limpiar()
-        self.registro_modelos.limpiar()
-        self.shader_estandar.liberar_recursos()
-        for processor in self._processors:
-            if hasattr(processor, 'limpiar'):
-                processor.limpiar()
-
-
-    def _inicializar_sistemas(self):
-        """Inicializa y agrega todos los sistemas del juego al mundo"""
-        # Física
-        sistemas_control.agregar_sistemas_control(self)
-        sistemas_fisicos.agregar_sistemas(self)
-        
-        # Animación
-        self.add_processor(sistema_animacion.SistemaAnimacion())
-
-        # Renderizado
-        sistemas_control.agregar_sistemas_camara(self)
-        self.add_processor(sistemas_renderizado.SistemaInicioCuadro())
-        sistemas_renderizado_3d.agregar_sistemas(self)
-        self.add_processor(SistemaUI())
-        self.add_processor(sistemas_renderizado.SistemaFinCuadro())
-
-    def _crear_entidades_base(self):
-        """Crea las entidades básicas como el jugador y las cámaras"""
-        # Configurar entidad del jugador (Ratón)
-        
-        # Obtener textura del registro (cargada desde GLB)
-        id_textura_raton = self.registro_modelos.obtener_textura(recursos.GestorRecursos.RATON)
-        color_raton = self.registro_modelos.obtener_color(recursos.GestorRecursos.RATON)
-        
-        color_difuso = glm.vec3(1.0, 1.0, 1.0)
-        if color_raton:
-             color_difuso = glm.vec3(color_raton[0], color_raton[1], color_raton[2])
-        posicion = glm.vec3(2.0, 2.0, 1.0)
-        
-        rotacion = glm.vec3(1.57, 0.0, 0.0)
-        
-        self.objeto_jugador = self.create_entity(
-            componentes.Modelo3D(self.registro_modelos.obtener_id(recursos.GestorRecursos.RATON)),
-            componentes.Transformacion(posicion=posicion, rotacion=rotacion, escala=glm.vec3(0.7, 0.7, 0.7)),
-            componentes.MatrizTransformacion(),
-            componentes.MaterialObjeto(difuso=color_difuso, id_textura=id_textura_raton),
-            componentes.Velocidad(a_lo_largo_eje_mundo=True),
-            componentes.Casa(posicion, rotacion),
-            componentes.CajaDelimitadora(componentes.Rectangulo3D(0.7, 0.7, 0.7)),
-            componentes.ComponenteColision(),
-            componentes.ObjetoFisico(),
-            componentes.Luz(atenuacion=glm.vec3(0.1, 0.0, 1.0)),
-            componentes.AnimacionLuz(color_base=glm.vec3(1.0, 0.0, 0.5), color_agregar=glm.vec3(0.1, 0.1, 0.1), factor_delta=0.5)
-        )
-        
-        # Agregar Esqueleto si está disponible
-        datos_esqueleto = self.registro_modelos.obtener_esqueleto(recursos.GestorRecursos.RATON)
-        if datos_esqueleto:
-            self.add_component(self.objeto_jugador, componentes.Esqueleto(datos_esqueleto))
-
-
-        self.cam_jugador = self.create_entity(
-            componentes.CamaraTerceraPersona(self.objeto_jugador, distancia=3.0, inclinacion=-0.5),
-            componentes.OrientacionCamara(),
-            componentes.Transformacion()
-        )
-        
-        # Objeto nariz de depuración (Invisible pero funcional)
-        self.objeto_nariz = self.create_entity(
-            componentes.Transformacion(escala=glm.vec3(0.1, 0.1, 0.1)), 
-            componentes.MatrizTransformacion(),
-            componentes.Casa()
-        )
-        posicion = glm.vec3(-5.0, -5.0, 20.0)
-        rotacion = glm.vec3(-0.5, 0.0, 0.9)
-        self.cam_libre = self.create_entity(
-            componentes.Transformacion(posicion=posicion, rotacion=rotacion),
-            componentes.Velocidad(a_lo_largo_eje_mundo=True, permitir_pausa=True),
-            componentes.CamaraLibre(),
-            componentes.OrientacionCamara(),
-            componentes.Casa(posicion, rotacion))
-
-
-
-        self.id_camara = self.cam_jugador
-        
-        # Configurar curva de intro
-        # Punto final: Posición final estimada de la cámara (detrás del jugador)
-        # El jugador está en (2, 2, 1). La cámara suele estar atrás y arriba.
-        punto_final = glm.vec3(2.0, -1.0, 3.0) 
-        
-        self.curva_intro = CurvaBezier(self.punto_inicio, self.punto_control_1, self.punto_control_2, punto_final)
-        
-        # Cámara inicial es la libre para la intro
-        self.id_camara = self.cam_libre
-        transformacion_camara_libre = self.component_for_entity(self.cam_libre, componentes.Transformacion)
-        transformacion_camara_libre.posicion = self.punto_inicio
-        # Orientar hacia el centro aprox
-        self.component_for_entity(self.cam_libre, componentes.OrientacionCamara).mirar_a = glm.vec3(15, 15, 0)
-
-    def _crear_nivel(self):
-        """Crea los objetos del nivel: luces, enemigos (gatos), objetivo (queso) y decoración"""
-        # Luz central
-        self.create_entity(
-            componentes.Transformacion(posicion=glm.vec3(self.laberinto.centro.x, self.laberinto.centro.y, 20.0)),
-            componentes.Luz(color=glm.vec3(0.5, 0.4, 0.4))
-        )
-
-        # Configuración de gatos
-        max_luces_gatos = self.configuracion_luz.MAX_CONTEO_LUZ - 2 - 1
-        valor_min = min(self.ancho_laberinto, self.largo_laberinto)
-        cantidad_gatos = self.nivel * valor_min * 0.2
-        
-        # Mínimo de gatos
-        if cantidad_gatos < 5:
-            cantidad_gatos = 5
-        
-        # Obtener textura del registro (cargada desde GLB)
-        id_textura_gato = self.registro_modelos.obtener_textura(recursos.GestorRecursos.GATO)
-        color_gato = self.registro_modelos.obtener_color(recursos.GestorRecursos.GATO)
-        
-        # Color por defecto si no se encuentra nada (blanco)
-        color_difuso = glm.vec3(1.0, 1.0, 1.0)
-        if color_gato:
-             color_difuso = glm.vec3(color_gato[0], color_gato[1], color_gato[2])
-
-        # Asegurar ubicaciones de aparición únicas
-        lugares_disponibles = len(self.laberinto.areas_vacias)
-        cantidad_final = int(cantidad_gatos)
-        if cantidad_final > lugares_disponibles:
-            cantidad_final = lugares_disponibles
-            
-        indices_elegidos = random.sample(range(lugares_disponibles), cantidad_final)
-
-        for i, idx in enumerate(indices_elegidos):
-            x, y = self.laberinto.areas_vacias[idx]
-            posicion = glm.vec3(x, y, 3.0)
-            self.gato = self.create_entity(
-                componentes.Modelo3D(self.registro_modelos.obtener_id(recursos.GestorRecursos.GATO)),
-                componentes.Gato(),
-                componentes.Transformacion(posicion=posicion, rotacion=glm.vec3(1.57, 0.0, 0.0), escala=glm.vec3(0.12, 0.12, 0.12)),
-                componentes.MatrizTransformacion(),
-                componentes.MaterialObjeto(difuso=glm.vec3(1.0, 1.0, 1.0), id_textura=id_textura_gato),
-                componentes.Velocidad(random.uniform(-1, 1), random.uniform(-1, 1), 0, a_lo_largo_eje_mundo=True),
-                componentes.CajaDelimitadora(componentes.Rectangulo3D(1.7, 1.7, 1.5)),
-                componentes.ReporteColision(),
-                componentes.ComponenteColision(),
-                componentes.ObjetoFisico(),
-                componentes.Casa(posicion=posicion, rotacion=glm.vec3(1.57, 0.0, 0.0)),
-                componentes.Luz(atenuacion=glm.vec3(0.1, 0.0, 0.8), habilitado=(i < max_luces_gatos)),
-                componentes.AnimacionLuz(color_base=glm.vec3(2.0, 0.0, 0.0), color_agregar=glm.vec3(0.5, 0.0, 0.0), factor_delta=random.uniform(0.8, 1.4))
-            )
-            
-            # Agregar Esqueleto si está disponible
-            esqueleto_gato = self.registro_modelos.obtener_esqueleto(recursos.GestorRecursos.GATO)
-            if esqueleto_gato:
-                self.add_component(self.gato, componentes.Esqueleto(esqueleto_gato))
-
-        # Obtener textura del registro (cargada desde GLB)
-        id_textura_queso = self.registro_modelos.obtener_textura(recursos.GestorRecursos.QUESO)
-        color_queso = self.registro_modelos.obtener_color(recursos.GestorRecursos.QUESO)
-        
-        # Color por defecto si no se encuentra nada (amarillento)
-        color_difuso = glm.vec3(1.0, 0.8, 0.0)
-        if color_queso:
-             color_difuso = glm.vec3(color_queso[0], color_queso[1], color_queso[2])
-
-        self.objeto_victoria = self.create_entity(
-            componentes.Modelo3D(self.registro_modelos.obtener_id(recursos.GestorRecursos.QUESO)),
-            componentes.Transformacion(posicion=glm.vec3(self.laberinto.centro.x, self.laberinto.centro.y, 1.0), rotacion=glm.vec3(1.57, 0.0, 0.0), escala=glm.vec3(0.20, 0.20, 0.24)),
-            componentes.MatrizTransformacion(),
-            componentes.MaterialObjeto(difuso=color_difuso, id_textura=id_textura_queso),
-            componentes.Victoria(),
-            componentes.Velocidad(),
-            componentes.CajaDelimitadora(componentes.Rectangulo3D(1.0, 1.0, 1.0)),
-            componentes.ReporteColision(),
-            componentes.Luz(atenuacion=glm.vec3(0.35, -0.36, 0.1)),
-            componentes.AnimacionLuz(color_base=glm.vec3(1.0, 0.8, 0.0), color_agregar=glm.vec3(0.1, 0.1, 0.1))
-        )
-        
-        # Agregar Esqueleto si está disponible
-        esqueleto_queso = self.registro_modelos.obtener_esqueleto(recursos.GestorRecursos.QUESO)
-        if esqueleto_queso:
-            self.add_component(self.objeto_victoria, componentes.Esqueleto(esqueleto_queso))
-
-        # --- Generar Nubes Fractales ---
-        
-        # Centro del laberinto (aprox 30.5, 30.5)
-        centro_mapa_x = 30.5
-        centro_mapa_y = 30.5
-        
-        # 1. Nubes de Horizonte (Bajas y lejanas)
-        # Generar en un anillo exterior para asegurar que rodeen el mapa
-        nubes_horizonte = 60
-        radio_minimo = 50.0
-        radio_maximo = 110.0
-        
-        for i in range(nubes_horizonte):
-            angulo = random.uniform(0, math.pi * 2)
-            distancia = random.uniform(radio_minimo, radio_maximo)
-            
-            pos_x = centro_mapa_x + math.cos(angulo) * distancia
-            pos_y = centro_mapa_y + math.sin(angulo) * distancia
-            
-            # Altura baja para horizonte
-            pos_z = random.uniform(-5.0, 10.0)
-            escala = random.uniform(4.0, 9.0) # Un poco más grandes
-            
-            self._crear_nube(pos_x, pos_y, pos_z, escala)
-
-    def _crear_nube(self, x, y, z, escala):
-        self.create_entity(
-            componentes.Modelo3D(self.registro_modelos.obtener_id(recursos.GestorRecursos.FRACTAL)),
-            componentes.Transformacion(
-                posicion=glm.vec3(x, y, z),
-                rotacion=glm.vec3(random.random(), random.random(), random.random()),
-                escala=glm.vec3(escala, escala, escala)
-            ),
-            componentes.MatrizTransformacion(),
-            componentes.MaterialObjeto(difuso=glm.vec3(1.0, 1.0, 1.0)),
-            componentes.Velocidad(a_lo_largo_eje_mundo=False) 
-        )
-
-    def recibir_dano(self):
-        """Maneja la lógica cuando el jugador recibe daño"""
-        self.vida -= 1
-
-        if self.vida > 0:
-            self.sonido.reproducir('daño')
-            # Reiniciar posiciones
-            self.reiniciar_posiciones()
-            # Limpiar colisiones para evitar muerte instantánea al reaparecer
-            for _id, colision in self.get_component(componentes.ReporteColision):
-                colision.fallido.clear()
-        else:
-            self.sonido.pausar_musica()
-            self.sonido.reproducir('daño')
-            
-            # Limpiar colisiones
-            for _id, colision in self.get_component(componentes.ReporteColision):
-                colision.fallido.clear()
-                
-            # Activar estado de derrota
-            self.estado = recursos.ESTADO_DERROTA
-            
-            # Configurar cámara para la derrota (Igual que victoria)
-            self.id_camara = self.cam_libre
-            self.controles.permitir_cambio_camara = False
-            self.controles.modo_control = recursos.ControlJuego.MODO_CAMARA_LIBRE
-            
-            # Crear ruta B-Spline alrededor del centro
-            cx, cy = self.laberinto.centro.x, self.laberinto.centro.y
-            radio = 25.0
-            altura = 15.0
-            
-            # 8 Puntos de control formando un círculo
-            puntos = []
-            for i in range(8):
-                angulo = (i / 8.0) * math.pi * 2
-                x = cx + math.cos(angulo) * radio
-                y = cy + math.sin(angulo) * radio
-                z = altura + math.sin(angulo * 3) * 5.0 
-                puntos.append(glm.vec3(x, y, z))
-                
-            self.curva_victoria = CurvaBSpline(puntos, cerrada=True)
-                
-            # Desactivar animación de victoria si estaba activa
-            self.component_for_entity(self.objeto_victoria, componentes.AnimacionLuz).habilitado = False
-            self.component_for_entity(self.objeto_victoria, componentes.Victoria).juego_terminado = True
-            
-            # Cambiar color de nubes a gris oscuro/negro (Tormenta)
-            id_modelo_nube = self.registro_modelos.obtener_id(recursos.GestorRecursos.FRACTAL)
-            for _id, (modelo, material) in self.get_components(componentes.Modelo3D, componentes.MaterialObjeto):
-                if modelo.id_modelo == id_modelo_nube:
-                    material.difuso = glm.vec3(0.2, 0.2, 0.25) # Gris azulado oscuro
-
-    def toggle_vista_mapa(self):
-        controles: recursos.ControlJuego = self.controles
-        
-        if controles.modo_control == recursos.ControlJuego.MODO_JUGADOR:
-            # Cambiar a MODO MAPA (Vista superior estática)
-            self.id_camara = self.cam_libre
-            controles.modo_control = recursos.ControlJuego.MODO_MAPA
-            
-            # Posicionar cámara libre arriba del centro
-            try:
-                trans_cam_libre = self.component_for_entity(self.cam_libre, componentes.Transformacion)
-                orient_cam_libre = self.component_for_entity(self.cam_libre, componentes.OrientacionCamara)
-                
-                # Centro del laberinto (aprox 30x30, centro en 15,15)
-                # Altura 45 para ver todo
-                trans_cam_libre.posicion = glm.vec3(15.0, 15.0, 45.0)
-                
-                # Mirar hacia abajo (Pitch -90 grados)
-                # IMPORTANTE: SistemaOrientacionCamara usa trans.rotacion para calcular mirar_a.
-                # Debemos setear la rotación explícitamente.
-                trans_cam_libre.rotacion.x = -math.pi / 2.0
-                trans_cam_libre.rotacion.z = 0.0
-                
-                # CAMBIO CRÍTICO: Cambiar vector 'Arriba' a Y (0, 1, 0) para evitar singularidad
-                # al mirar hacia abajo en Z.
-                orient_cam_libre.arriba = glm.vec3(0.0, 1.0, 0.0)
-                
-            except KeyError:
-                pass
-
-        elif controles.modo_control == recursos.ControlJuego.MODO_MAPA:
-            # Volver a MODO JUGADOR
-            self.id_camara = self.cam_jugador
-            controles.modo_control = recursos.ControlJuego.MODO_JUGADOR
-            
-            # Restaurar vector 'Arriba' a Z (0, 0, 1) para la cámara libre (por si se usa en otro lado)
-            try:
-                orient_cam_libre = self.component_for_entity(self.cam_libre, componentes.OrientacionCamara)
-                orient_cam_libre.arriba = glm.vec3(0.0, 0.0, 1.0)
-            except KeyError:
-                pass
-
-    def reiniciar_posiciones(self):
-        """Devuelve todas las entidades con componente Casa a su posición original"""
-        for _id, (casa, transformacion, velocidad) in self.get_components(
-                componentes.Casa,
-                componentes.Transformacion,
-                componentes.Velocidad):
-            transformacion.posicion = casa.posicion
-            transformacion.rotacion = casa.rotacion
-            velocidad.valor = glm.vec3()
-
-    def actualizar_resolucion(self, resolucion):
-        self.resolucion = resolucion
-        self.shader_estandar.actualizar_proyeccion(resolucion)
-        
-    def juego_ganado(self):
-        self.sonido.reproducir('victoria')
-        self.estado = recursos.ESTADO_VICTORIA
-        
-        # Configurar cámara para la victoria
-        self.id_camara = self.cam_libre
-        self.controles.modo_control = recursos.ControlJuego.MODO_CAMARA_LIBRE
-        
-        # Crear ruta B-Spline alrededor del centro
-        cx, cy = self.laberinto.centro.x, self.laberinto.centro.y
-        radio = 25.0
-        altura = 15.0
-        
-        # 8 Puntos de control formando un círculo
-        puntos = []
-        for i in range(8):
-            angulo = (i / 8.0) * math.pi * 2
-            x = cx + math.cos(angulo) * radio
-            y = cy + math.sin(angulo) * radio
-            # Ondular un poco la altura
-            z = altura + math.sin(angulo * 3) * 5.0 
-            puntos.append(glm.vec3(x, y, z))
-            
-        self.curva_victoria = CurvaBSpline(puntos, cerrada=True)
+import hashlib
+import math
+import random
+import struct
+import esper
+import glm
+import pygame
+from OpenGL import GL as gl
+from servicio_audio import ServicioAudio
+import componentes_3d as componentes
+import sistema_control as sistemas_control
+import sistemas_fisicos as sistemas_fisicos
+import sistemas_renderizado as sistemas_renderizado
+import sistemas_renderizado_3d as sistemas_renderizado_3d
+import recursos
+from laberinto import _configurar_laberinto
+from graficos_3d import ShaderEstandar
+from clases_renderizado import Modelo3D
+import sistema_animacion as sistema_animacion
+from sistema_interfaz import SistemaUI
+from curvas_bezier import CurvaBezier
+from curvas_bspline import CurvaBSpline
+from generador_fractales import FractalNube
+from cargador_glb import CargadorGlb
+from sistema_nivel_detalle import SistemaNivelDetalle
+from sistema_persecucion import SistemaPersecucion
+from sistema_patrulla import SistemaPatrulla
+from rutas_patrulla import TablaRutas, crear_ruta_patrulla
+from planificador_aparicion import planificar_apariciones
+from recursos_sin_gpu import RegistroSinGpu, SonidoSilencioso
+from entrada_jugador import SistemaEntradaJugador
+from resolucion_dinamica import ResolucionDinamica, SistemaInicioEscena, SistemaFinEscena
+
+class Mundo(esper.World):
+    RUTA_MODELO_GATO = "recursos/modelos/gato.glb"
+    # Resolución de la rejilla de agrupamiento de cada nivel de detalle simplificado del gato
+    RESOLUCIONES_DETALLE_GATO = (24, 10)
+    # Simulación a paso fijo (control y física)
+    FRECUENCIA_SIMULACION = 120
+    # Evita la espiral de la muerte: si un cuadro lento acumula más pasos, el resto se descarta
+    MAX_PASOS_POR_CUADRO = 8
+    # Posición (x, y) en la que aparece el jugador
+    POSICION_INICIO_JUGADOR = (2.0, 2.0)
+
+    def __init__(self, resolucion, nivel, precarga=None, sin_gpu=False, semilla=None, tamano_laberinto=(30, 30),
+                 entrada_repetible=False, con_intro=None):
+        """
+        sin_gpu: construye solo la simulación (laberinto, entidades, colisiones y movimiento)
+        sin ninguna llamada a OpenGL ni audio; no se agregan los sistemas de cámara ni de dibujo.
+        entrada_repetible: con ventana, el jugador se mueve con self.entrada (la máscara que se
+        graba) en lugar de con sistema_control, que queda solo para la cámara; así la partida
+        se puede reproducir sin GPU. Sin GPU siempre es así.
+        con_intro: empieza por la intro (por omisión solo con ventana); la reproducción de una
+        partida grabada con ventana la necesita para simular los mismos pasos.
+        semilla: fija todo el azar del mundo (laberinto, aparición, velocidades, nubes)
+        para poder repetir exactamente una partida.
+        tamano_laberinto: (ancho, largo) del laberinto en celdas.
+        """
+        super().__init__()
+        self.sin_gpu = sin_gpu
+        self.entrada_repetible = entrada_repetible or sin_gpu
+        self.con_intro = not sin_gpu if con_intro is None else con_intro
+        if semilla is None:
+            semilla = precarga.semilla if precarga else random.randrange(2 ** 32)
+        self.semilla = semilla
+        self.rng = random.Random(semilla)
+        # Estado de entrada del cuadro actual (ver entrada_jugador)
+        self.entrada = 0
+        # El servicio de audio es del proceso: sus muestras ya decodificadas sirven para todas las partidas
+        self.sonido = SonidoSilencioso() if sin_gpu else ServicioAudio.obtener()
+        self.resolucion = resolucion
+        self.estado = recursos.ESTADO_INTRO
+        self.vida = 3
+        self.nivel = nivel
+        self.shader_estandar = None if sin_gpu else ShaderEstandar()
+        self.delta = 0.00001
+        # Posición y rotación antes del último paso fijo (para interpolar al dibujar)
+        self.estado_anterior = {}
+        self.acumulador = 0.0
+        self.tiempo = 0.0
+        self.tiempo_intro = 0.0
+        self.duracion_intro = 4.0 # Segundos
+        
+        # Puntos de control para la intro (Curva de Bézier)
+        # Inicio (Arriba y lejos, centrado en X)
+        self.punto_inicio = glm.vec3(15.0, -30.0, 60.0)
+        # Primer punto de control: Bajando hacia el laberinto
+        self.punto_control_1 = glm.vec3(15.0, 0.0, 45.0)
+        # Segundo punto de control: Acercándose al jugador (desde arriba)
+        self.punto_control_2 = glm.vec3(2.0, 2.0, 25.0)
+        # El punto final se calculará dinámicamente basado en la posición inicial de la cámara del jugador
+        # P3 se calculará dinámicamente basado en la posición inicial de la cámara del jugador
+        
+        self.curva_intro = None # Se inicializa en _configurar_entidades
+        
+        # Variables para la victoria
+        self.curva_victoria = None
+        self.tiempo_victoria = 0.0
+        self.duracion_vuelta_victoria = 30.0 # Segundos por vuelta (Aún más lento)
+
+        self.configuracion_luz = recursos.ConfiguracionIluminacion(ambiente_global=glm.vec3(0.6, 0.6, 0.6))
+        # Animaciones de color calculadas en el shader: cambiar una de estas instancias recolorea
+        # de una vez todo lo que la comparte (el ambiente, o el material de todas las nubes)
+        self.configuracion_luz.animacion_ambiente = componentes.AnimacionColor()
+        self.animacion_nubes = componentes.AnimacionColor()
+        self.controles = recursos.ControlJuego()
+        self.ancho_laberinto, self.largo_laberinto = tamano_laberinto
+        # Si el menú dejó trabajando un CargadorAsincrono, aquí solo quedan las subidas a OpenGL
+        laberinto_precargado = None
+        if precarga and precarga.semilla == self.semilla:
+            precarga.esperar()
+            laberinto_precargado = precarga.obtener_laberinto(self.ancho_laberinto, self.largo_laberinto)
+        self.registro_modelos = RegistroSinGpu() if sin_gpu else recursos.GestorRecursos()
+        self.id_camara = 0
+        self.matriz_vista = glm.mat4(1.0)
+        self.laberinto = _configurar_laberinto(
+            self, self.ancho_laberinto, self.largo_laberinto, profundidad=1.5,
+            laberinto=laberinto_precargado, rng=random.Random(self.semilla))
+        self._inicializar_sistemas()
+        self._crear_entidades_base()
+        self._crear_nivel()
+        self.actualizar_resolucion(resolucion)
+        if not self.con_intro:
+            # Sin intro (sin ventana no hay nada que mostrar) se empieza jugando
+            self.estado = recursos.ESTADO_EJECUTANDO
+            self.id_camara = self.cam_jugador
+            self.controles.modo_control = recursos.ControlJuego.MODO_JUGADOR
+
+    def process(self, dt=0):
+        """Cuadro completo con paso variable: secuencias de cámara y todos los sistemas juntos"""
+        self._actualizar_secuencias()
+        self._actualizar_tiempo_shader()
+        super().process()
+
+    def avanzar_simulacion(self, delta_cuadro):
+        """
+        Acumula el tiempo del cuadro y ejecuta los pasos fijos que correspondan.
+        Devuelve alfa (fracción del siguiente paso ya transcurrida) para renderizar().
+        """
+        paso = 1.0 / self.FRECUENCIA_SIMULACION
+        self.acumulador += delta_cuadro
+        pasos = 0
+        while self.acumulador >= paso and pasos < self.MAX_PASOS_POR_CUADRO:
+            self.simular_paso(paso)
+            self.acumulador -= paso
+            pasos += 1
+        if pasos == self.MAX_PASOS_POR_CUADRO:
+            self.acumulador = min(self.acumulador, paso)
+        return self.acumulador / paso
+
+    def hash_estado(self):
+        """
+        Huella (SHA-256) del estado de la simulación: transformación y velocidad de lo que se
+        mueve, vida y estado. Solo entra lo que decide el paso fijo: las cámaras quedan fuera
+        y del jugador solo cuenta la posición, porque con ventana el control por cuadro
+        (ratón, sistema_control) también gira al jugador y retoca su velocidad.
+        """
+        camaras = (self.cam_jugador, self.cam_libre)
+        huella = hashlib.sha256()
+        huella.update(struct.pack("<iq", self.vida, len(self._entities)))
+        huella.update(repr(self.estado).encode())
+        for entidad, (transformacion, velocidad) in sorted(
+                self.get_components(componentes.Transformacion, componentes.Velocidad), key=lambda par: par[0]):
+            if entidad in camaras:
+                continue
+            posicion = transformacion.posicion
+            if entidad == self.objeto_jugador:
+                huella.update(struct.pack("<i3d", entidad, posicion.x, posicion.y, posicion.z))
+                continue
+            rotacion = transformacion.rotacion
+            huella.update(struct.pack("<i6d", entidad, posicion.x, posicion.y, posicion.z, rotacion.x, rotacion.y, rotacion.z))
+            huella.update(struct.pack("<3d", velocidad.valor.x, velocidad.valor.y, velocidad.valor.z))
+        return huella.hexdigest()
+
+    def simular_paso(self, paso):
+        """Avanza los sistemas de control y física un paso fijo de 'paso' segundos"""
+        self._clear_dead_entities()
+        self._guardar_estado_anterior()
+        self.delta = paso
+        for sistema in self.sistemas_simulacion:
+            sistema.process()
+
+    def renderizar(self, alfa, delta_cuadro):
+        """
+        Ejecuta los sistemas de cuadro (cámara, animación, dibujo) una vez, con las
+        transformaciones interpoladas entre los dos últimos pasos de simulación
+        (alfa = fracción del paso siguiente ya transcurrida).
+        """
+        self.delta = delta_cuadro
+        actuales = self._interpolar_transformaciones(alfa)
+        self._actualizar_secuencias()
+        self._actualizar_tiempo_shader()
+        for sistema in self.sistemas_cuadro:
+            sistema.process()
+        # La simulación sigue desde el estado real, no desde el interpolado
+        for transformacion, posicion, rotacion in actuales:
+            transformacion.posicion = posicion
+            transformacion.rotacion = rotacion
+
+    def _actualizar_tiempo_shader(self):
+        """Las animaciones de color (AnimacionColor) se calculan en la GPU a partir de este tiempo"""
+        if self.shader_estandar:
+            self.shader_estandar.tiempo = self.tiempo
+
+    def _guardar_estado_anterior(self):
+        """Guarda posición y rotación de los objetos que se mueven antes de cada paso"""
+        self.estado_anterior = {
+            entidad: (glm.vec3(transformacion.posicion), glm.vec3(transformacion.rotacion))
+            for entidad, (transformacion, _velocidad) in self.get_components(componentes.Transformacion, componentes.Velocidad)
+        }
+
+    def _interpolar_transformaciones(self, alfa):
+        """Mezcla el estado anterior con el actual y devuelve los valores reales para restaurarlos"""
+        actuales = []
+        for entidad, (transformacion, _velocidad) in self.get_components(componentes.Transformacion, componentes.Velocidad):
+            anterior = self.estado_anterior.get(entidad)
+            if anterior is None:
+                continue
+            actuales.append((transformacion, transformacion.posicion, transformacion.rotacion))
+            transformacion.posicion = glm.mix(anterior[0], transformacion.posicion, alfa)
+            transformacion.rotacion = glm.mix(anterior[1], transformacion.rotacion, alfa)
+        return actuales
+
+    def _actualizar_secuencias(self):
+        """Cámaras animadas de la intro y del final (dependen del tiempo real del cuadro)"""
+        # Procesar intro
+        if self.estado == recursos.ESTADO_INTRO:
+            self.tiempo_intro += self.delta
+            t = min(self.tiempo_intro / self.duracion_intro, 1.0)
+            
+            # Actualizar posición de cámara libre
+            if self.curva_intro:
+                # Calcular nueva posición en la curva (a velocidad constante)
+                nueva_pos = self.curva_intro.punto_uniforme(t)
+                transformacion_camara = self.component_for_entity(self.cam_libre, componentes.Transformacion)
+                transformacion_camara.posicion = nueva_pos
+                
+                # Mirar siempre al centro o interpolar hacia donde mira el jugador
+                centro = glm.vec3(15, 15, 0)
+                jugador_pos = glm.vec3(*self.POSICION_INICIO_JUGADOR, 1.0) # Posición conocida del jugador
+                
+                # Interpolación lineal del objetivo de la cámara
+                # Al principio mira al centro, al final mira al jugador
+                mirar_a = centro * (1.0 - t) + jugador_pos * t
+                
+                self.component_for_entity(self.cam_libre, componentes.OrientacionCamara).mirar_a = mirar_a
+
+            if t >= 1.0:
+                self.estado = recursos.ESTADO_EJECUTANDO
+                self.id_camara = self.cam_jugador
+                self.controles.modo_control = recursos.ControlJuego.MODO_JUGADOR
+        
+        # Procesar Victoria o Derrota (Cámara B-Spline + Luces HSV)
+        elif self.estado == recursos.ESTADO_VICTORIA or self.estado == recursos.ESTADO_DERROTA:
+            self.tiempo_victoria += self.delta
+            
+            # 1. Movimiento de Cámara (B-Spline)
+            if self.curva_victoria:
+                # t cíclico de 0.0 a 1.0
+                t = (self.tiempo_victoria % self.duracion_vuelta_victoria) / self.duracion_vuelta_victoria
+                
+                nueva_pos = self.curva_victoria.punto_uniforme(t)
+                transformacion_camara = self.component_for_entity(self.cam_libre, componentes.Transformacion)
+                transformacion_camara.posicion = nueva_pos
+                
+                # Mirar siempre al centro del laberinto
+                centro = glm.vec3(self.laberinto.centro.x, self.laberinto.centro.y, 0)
+                self.component_for_entity(self.cam_libre, componentes.OrientacionCamara).mirar_a = centro
+
+            # 2. Las luces de fiesta (ciclo de matiz HSV) las calcula el shader: ver _iniciar_luces_fiesta
+
+    def _iniciar_luces_fiesta(self, gatos=False):
+        """
+        Configura una sola vez el ciclo de matiz del final: el ambiente (30 grados por segundo,
+        colores pastel) y, si 'gatos', un matiz distinto para la luz de cada gato y una onda de
+        color que cruza las nubes. Cada cuadro solo se sube el tiempo al shader.
+        """
+        # Fase para que el matiz empiece en 0 ahora
+        fase = -30.0 * self.tiempo
+        self.configuracion_luz.animacion_ambiente.ciclo_matiz(velocidad=30.0, fase=fase, saturacion=0.4, valor=0.8)
+        if not gatos:
+            return
+        luces = [luz for _id, (_gato, luz) in self.get_components(componentes.Gato, componentes.Luz)]
+        for i, luz in enumerate(luces):
+            # Las luces de los gatos tienen intensidad 2.0 (ver _crear_nivel)
+            luz.animacion = componentes.AnimacionColor().ciclo_matiz(
+                velocidad=30.0, fase=fase + 360.0 * i / len(luces), saturacion=0.8, intensidad=2.0)
+        self.animacion_nubes.ciclo_matiz(velocidad=30.0, fase=fase, saturacion=0.4, onda=4.0)
+
+    def limpiar(self):
+        # El servicio de audio sigue vivo después de la partida: que no se oiga en el menú
+        self.sonido.detener()
+        # Limpiar recursos de OpenGL explícitamente
+        # Es necesario hacerlo antes de que PyOpenGL se destruya al salir
+        if self.sin_gpu:
+            return
+        for _entidad, vbo in self.get_component(Modelo3D):
+            vbo.limpiar()
+        self.registro_modelos.limpiar()
+        self.shader_estandar.liberar_recursos()
+        for processor in self._processors:
+            if hasattr(processor, 'limpiar'):
+                processor.limpiar()
+
+
+    def _inicializar_sistemas(self):
+        """Inicializa y agrega todos los sistemas del juego al mundo"""
+        # Física (se ejecutan a paso fijo desde simular_paso)
+        if self.sin_gpu:
+            # El control lee teclado y ratón de la ventana: sin ella el jugador se mueve con self.entrada
+            self.add_processor(SistemaEntradaJugador())
+            self.add_processor(SistemaPersecucion())
+            self.add_processor(SistemaPatrulla())
+            sistemas_fisicos.agregar_sistemas(self)
+            self.sistemas_simulacion = list(self._processors)
+            self.sistemas_cuadro = []
+            return
+        sistemas_control.agregar_sistemas_control(self)
+        control = []
+        if self.entrada_repetible:
+            # El control de ventana pasa a ejecutarse una vez por cuadro (cámara, pausa, mapa)
+            # y el jugador se mueve a paso fijo con la misma máscara que se graba
+            control = list(self._processors)
+            self.add_processor(SistemaEntradaJugador())
+        self.add_processor(SistemaPersecucion())
+        self.add_processor(SistemaPatrulla())
+        sistemas_fisicos.agregar_sistemas(self)
+        self.sistemas_simulacion = [sistema for sistema in self._processors if sistema not in control]
+        
+        # Animación
+        self.add_processor(sistema_animacion.SistemaAnimacion())
+
+        # Renderizado
+        sistemas_control.agregar_sistemas_camara(self)
+        self.add_processor(SistemaNivelDetalle())
+        self.add_processor(sistemas_renderizado.SistemaInicioCuadro())
+        # La escena 3D puede dibujarse a menor resolución (ver activar_resolucion_dinamica); la UI no
+        self.resolucion_dinamica = ResolucionDinamica()
+        self.add_processor(SistemaInicioEscena(self.resolucion_dinamica))
+        sistemas_renderizado_3d.agregar_sistemas(self)
+        self.add_processor(SistemaFinEscena(self.resolucion_dinamica))
+        self.add_processor(SistemaUI())
+        self.add_processor(sistemas_renderizado.SistemaFinCuadro())
+
+        # El resto se ejecuta una vez por cuadro desde renderizar
+        self.sistemas_cuadro = [sistema for sistema in self._processors if sistema not in self.sistemas_simulacion]
+
+    def _crear_entidades_base(self):
+        """Crea las entidades básicas como el jugador y las cámaras"""
+        # Configurar entidad del jugador (Ratón)
+        
+        # Obtener textura del registro (cargada desde GLB)
+        id_textura_raton = self.registro_modelos.obtener_textura(recursos.GestorRecursos.RATON)
+        color_raton = self.registro_modelos.obtener_color(recursos.GestorRecursos.RATON)
+        
+        color_difuso = glm.vec3(1.0, 1.0, 1.0)
+        if color_raton:
+             color_difuso = glm.vec3(color_raton[0], color_raton[1], color_raton[2])
+        posicion = glm.vec3(*self.POSICION_INICIO_JUGADOR, 1.0)
+        
+        rotacion = glm.vec3(1.57, 0.0, 0.0)
+        
+        self.objeto_jugador = self.create_entity(
+            componentes.Modelo3D(self.registro_modelos.obtener_id(recursos.GestorRecursos.RATON)),
+            componentes.Transformacion(posicion=posicion, rotacion=rotacion, escala=glm.vec3(0.7, 0.7, 0.7)),
+            componentes.MatrizTransformacion(),
+            componentes.MaterialObjeto(difuso=color_difuso, id_textura=id_textura_raton),
+            componentes.Velocidad(a_lo_largo_eje_mundo=True),
+            componentes.Casa(posicion, rotacion),
+            componentes.CajaDelimitadora(componentes.Rectangulo3D(0.7, 0.7, 0.7)),
+            componentes.ComponenteColision(),
+            componentes.ObjetoFisico(),
+            componentes.Luz(
+                color=glm.vec3(1.0, 0.0, 0.5), atenuacion=glm.vec3(0.1, 0.0, 1.0),
+                animacion=componentes.AnimacionColor().pulso(glm.vec3(1.0, 0.0, 0.5), glm.vec3(0.1, 0.1, 0.1), factor=0.5))
+        )
+        
+        # Agregar Esqueleto si está disponible
+        datos_esqueleto = self.registro_modelos.obtener_esqueleto(recursos.GestorRecursos.RATON)
+        if datos_esqueleto:
+            self.add_component(self.objeto_jugador, componentes.Esqueleto(datos_esqueleto))
+
+
+        self.cam_jugador = self.create_entity(
+            componentes.CamaraTerceraPersona(self.objeto_jugador, distancia=3.0, inclinacion=-0.5),
+            componentes.OrientacionCamara(),
+            componentes.Transformacion()
+        )
+        
+        # Objeto nariz de depuración (Invisible pero funcional)
+        self.objeto_nariz = self.create_entity(
+            componentes.Transformacion(escala=glm.vec3(0.1, 0.1, 0.1)), 
+            componentes.MatrizTransformacion(),
+            componentes.Casa()
+        )
+        posicion = glm.vec3(-5.0, -5.0, 20.0)
+        rotacion = glm.vec3(-0.5, 0.0, 0.9)
+        self.cam_libre = self.create_entity(
+            componentes.Transformacion(posicion=posicion, rotacion=rotacion),
+            componentes.Velocidad(a_lo_largo_eje_mundo=True, permitir_pausa=True),
+            componentes.CamaraLibre(),
+            componentes.OrientacionCamara(),
+            componentes.Casa(posicion, rotacion))
+
+
+
+        self.id_camara = self.cam_jugador
+        
+        # Configurar curva de intro
+        # Punto final: Posición final estimada de la cámara (detrás del jugador)
+        # El jugador está en (2, 2, 1). La cámara suele estar atrás y arriba.
+        punto_final = glm.vec3(2.0, -1.0, 3.0) 
+        
+        self.curva_intro = CurvaBezier(self.punto_inicio, self.punto_control_1, self.punto_control_2, punto_final)
+        
+        # Cámara inicial es la libre para la intro
+        self.id_camara = self.cam_libre
+        transformacion_camara_libre = self.component_for_entity(self.cam_libre, componentes.Transformacion)
+        transformacion_camara_libre.posicion = self.punto_inicio
+        # Orientar hacia el centro aprox
+        self.component_for_entity(self.cam_libre, componentes.OrientacionCamara).mirar_a = glm.vec3(15, 15, 0)
+
+    def _crear_nivel(self):
+        """Crea los objetos del nivel: luces, enemigos (gatos), objetivo (queso) y decoración"""
+        # Luz central
+        self.create_entity(
+            componentes.Transformacion(posicion=glm.vec3(self.laberinto.centro.x, self.laberinto.centro.y, 20.0)),
+            componentes.Luz(color=glm.vec3(0.5, 0.4, 0.4))
+        )
+
+        # Configuración de gatos
+        max_luces_gatos = self.configuracion_luz.MAX_CONTEO_LUZ - 2 - 1
+        valor_min = min(self.ancho_laberinto, self.largo_laberinto)
+        cantidad_gatos = self.nivel * valor_min * 0.2
+        
+        # Mínimo de gatos
+        if cantidad_gatos < 5:
+            cantidad_gatos = 5
+        
+        # Obtener textura del registro (cargada desde GLB)
+        id_textura_gato = self.registro_modelos.obtener_textura(recursos.GestorRecursos.GATO)
+        color_gato = self.registro_modelos.obtener_color(recursos.GestorRecursos.GATO)
+        
+        # Color por defecto si no se encuentra nada (blanco)
+        color_difuso = glm.vec3(1.0, 1.0, 1.0)
+        if color_gato:
+             color_difuso = glm.vec3(color_gato[0], color_gato[1], color_gato[2])
+
+        # Asegurar ubicaciones de aparición únicas
+        lugares_disponibles = len(self.laberinto.areas_vacias)
+        cantidad_final = int(cantidad_gatos)
+        if cantidad_final > lugares_disponibles:
+            cantidad_final = lugares_disponibles
+            
+        # Lejos del inicio del jugador por camino y separados entre sí
+        posiciones_gatos = planificar_apariciones(self.laberinto, self.POSICION_INICIO_JUGADOR, cantidad_final, self.rng)
+        ids_detalle_gato, triangulos_gato = self._crear_niveles_detalle_gato()
+
+        # Rutas de patrulla: los gatos que tienen una no necesitan colisión con paredes ni gravedad
+        self.rutas_patrulla = TablaRutas()
+        for i, (x, y) in enumerate(posiciones_gatos):
+            rapidez = self.rng.uniform(1.2, 1.8)
+            curva = crear_ruta_patrulla(self.laberinto, self.laberinto.celda_en(x, y), self.rng)
+            if curva is not None:
+                patrulla = componentes.Patrulla(self.rutas_patrulla.agregar(curva), rapidez=rapidez * 0.6)
+                posicion = self.rutas_patrulla.punto(patrulla.ruta, patrulla.fraccion)
+                fisica = (patrulla,)
+            else:
+                posicion = glm.vec3(x, y, 3.0)
+                fisica = (componentes.ComponenteColision(), componentes.ObjetoFisico())
+            self.gato = self.create_entity(
+                componentes.Modelo3D(ids_detalle_gato[0]),
+                componentes.NivelDetalle(ids_detalle_gato, triangulos_gato),
+                componentes.Gato(),
+                componentes.Perseguidor(rapidez=rapidez),
+                componentes.Transformacion(posicion=posicion, rotacion=glm.vec3(1.57, 0.0, 0.0), escala=glm.vec3(0.12, 0.12, 0.12)),
+                componentes.MatrizTransformacion(),
+                componentes.MaterialObjeto(difuso=glm.vec3(1.0, 1.0, 1.0), id_textura=id_textura_gato),
+                componentes.Velocidad(a_lo_largo_eje_mundo=True),
+                componentes.CajaDelimitadora(componentes.Rectangulo3D(1.7, 1.7, 1.5)),
+                componentes.ReporteColision(),
+                *fisica,
+                componentes.Casa(posicion=posicion, rotacion=glm.vec3(1.57, 0.0, 0.0)),
+                componentes.Luz(
+                    color=glm.vec3(2.0, 0.0, 0.0), atenuacion=glm.vec3(0.1, 0.0, 0.8), habilitado=(i < max_luces_gatos),
+                    animacion=componentes.AnimacionColor().pulso(
+                        glm.vec3(2.0, 0.0, 0.0), glm.vec3(0.5, 0.0, 0.0),
+                        factor=self.rng.uniform(0.8, 1.4), fase=self.rng.uniform(0.0, 6.28)))
+            )
+            
+            # Agregar Esqueleto si está disponible
+            esqueleto_gato = self.registro_modelos.obtener_esqueleto(recursos.GestorRecursos.GATO)
+            if esqueleto_gato:
+                self.add_component(self.gato, componentes.Esqueleto(esqueleto_gato))
+
+        # Obtener textura del registro (cargada desde GLB)
+        id_textura_queso = self.registro_modelos.obtener_textura(recursos.GestorRecursos.QUESO)
+        color_queso = self.registro_modelos.obtener_color(recursos.GestorRecursos.QUESO)
+        
+        # Color por defecto si no se encuentra nada (amarillento)
+        color_difuso = glm.vec3(1.0, 0.8, 0.0)
+        if color_queso:
+             color_difuso = glm.vec3(color_queso[0], color_queso[1], color_queso[2])
+
+        self.objeto_victoria = self.create_entity(
+            componentes.Modelo3D(self.registro_modelos.obtener_id(recursos.GestorRecursos.QUESO)),
+            componentes.Transformacion(posicion=glm.vec3(self.laberinto.centro.x, self.laberinto.centro.y, 1.0), rotacion=glm.vec3(1.57, 0.0, 0.0), escala=glm.vec3(0.20, 0.20, 0.24)),
+            componentes.MatrizTransformacion(),
+            componentes.MaterialObjeto(difuso=color_difuso, id_textura=id_textura_queso),
+            componentes.Victoria(),
+            componentes.Velocidad(),
+            componentes.CajaDelimitadora(componentes.Rectangulo3D(1.0, 1.0, 1.0)),
+            componentes.ReporteColision(),
+            componentes.Luz(
+                color=glm.vec3(1.0, 0.8, 0.0), atenuacion=glm.vec3(0.35, -0.36, 0.1),
+                animacion=componentes.AnimacionColor().pulso(glm.vec3(1.0, 0.8, 0.0), glm.vec3(0.1, 0.1, 0.1)))
+        )
+        
+        # Agregar Esqueleto si está disponible
+        esqueleto_queso = self.registro_modelos.obtener_esqueleto(recursos.GestorRecursos.QUESO)
+        if esqueleto_queso:
+            self.add_component(self.objeto_victoria, componentes.Esqueleto(esqueleto_queso))
+
+        # --- Generar Nubes Fractales ---
+        
+        # Centro del laberinto (aprox 30.5, 30.5)
+        centro_mapa_x = 30.5
+        centro_mapa_y = 30.5
+        
+        # Grupo de mallas distintas para que no todas las nubes sean iguales
+        self.variantes_nube = self._crear_variantes_nube()
+        self.ids_modelos_nube = {id_modelo for ids, _triangulos, _radio in self.variantes_nube for id_modelo in ids}
+
+        # 1. Nubes de Horizonte (Bajas y lejanas)
+        # Generar en un anillo exterior para asegurar que rodeen el mapa
+        nubes_horizonte = 60
+        radio_minimo = 50.0
+        radio_maximo = 110.0
+        
+        for i in range(nubes_horizonte):
+            angulo = self.rng.uniform(0, math.pi * 2)
+            distancia = self.rng.uniform(radio_minimo, radio_maximo)
+            
+            pos_x = centro_mapa_x + math.cos(angulo) * distancia
+            pos_y = centro_mapa_y + math.sin(angulo) * distancia
+            
+            # Altura baja para horizonte
+            pos_z = self.rng.uniform(-5.0, 10.0)
+            escala = self.rng.uniform(4.0, 9.0) # Un poco más grandes
+            
+            self._crear_nube(pos_x, pos_y, pos_z, escala)
+
+    def _crear_variantes_nube(self):
+        """
+        Registra FractalNube.VARIANTES nubes con semillas fijas, cada una con sus niveles de detalle
+        (menos niveles de recursión). Devuelve (ids_modelo, triangulos, radio) por variante.
+        """
+        variantes = []
+        for semilla in range(FractalNube.VARIANTES):
+            nube = FractalNube(semilla=semilla, eliminar_caras_ocultas=True)
+            ids = []
+            triangulos = []
+            for niveles in range(nube.profundidad, 0, -1):
+                detalle = nube if niveles == nube.profundidad else nube.reducir(niveles)
+                nombre = f"{recursos.GestorRecursos.FRACTAL}_{semilla}_{niveles}"
+                ids.append(self._registrar_modelo(nombre, detalle.crear_modelo))
+                triangulos.append(detalle.contar_triangulos())
+            variantes.append((ids, triangulos, nube.radio()))
+        return variantes
+
+    def _crear_niveles_detalle_gato(self):
+        """Registra versiones simplificadas del gato y devuelve (ids_modelo, triangulos)"""
+        ids = [self.registro_modelos.obtener_id(recursos.GestorRecursos.GATO)]
+        if self.sin_gpu:
+            return ids, [0]
+        cargador = CargadorGlb.obtener_decodificado(self.RUTA_MODELO_GATO)
+        triangulos = [len(cargador.vertices) // 9]
+        for resolucion in self.RESOLUCIONES_DETALLE_GATO:
+            modelo = cargador.crear_modelo_decimado(resolucion)
+            nombre = f"{recursos.GestorRecursos.GATO}_{resolucion}"
+            self.registro_modelos.registrar_modelo(nombre, modelo)
+            ids.append(self.registro_modelos.obtener_id(nombre))
+            triangulos.append(modelo.num_vertices // 3)
+        return ids, triangulos
+
+    def _registrar_modelo(self, nombre, crear_modelo):
+        """Registra el modelo que devuelve crear_modelo() (sin GPU solo se registra el nombre)"""
+        if self.sin_gpu:
+            self.registro_modelos.registrar_modelo(nombre)
+        else:
+            self.registro_modelos.registrar_modelo(nombre, crear_modelo())
+        return self.registro_modelos.obtener_id(nombre)
+
+    def _crear_nube(self, x, y, z, escala):
+        ids_modelo, triangulos, radio = self.rng.choice(self.variantes_nube)
+        self.create_entity(
+            componentes.Modelo3D(ids_modelo[0]),
+            componentes.NivelDetalle(ids_modelo, triangulos, radio),
+            componentes.Transformacion(
+                posicion=glm.vec3(x, y, z),
+                rotacion=glm.vec3(self.rng.random(), self.rng.random(), self.rng.random()),
+                escala=glm.vec3(escala, escala, escala)
+            ),
+            componentes.MatrizTransformacion(),
+            componentes.MaterialObjeto(difuso=glm.vec3(1.0, 1.0, 1.0), animacion=self.animacion_nubes),
+            componentes.Velocidad(a_lo_largo_eje_mundo=False) 
+        )
+
+    def recibir_dano(self):
+        """Maneja la lógica cuando el jugador recibe daño"""
+        self.vida -= 1
+
+        if self.vida > 0:
+            self.sonido.reproducir('daño')
+            # Reiniciar posiciones
+            self.reiniciar_posiciones()
+            # Limpiar colisiones para evitar muerte instantánea al reaparecer
+            for _id, colision in self.get_component(componentes.ReporteColision):
+                colision.fallido.clear()
+        else:
+            self.sonido.pausar_musica()
+            self.sonido.reproducir('daño')
+            
+            # Limpiar colisiones
+            for _id, colision in self.get_component(componentes.ReporteColision):
+                colision.fallido.clear()
+                
+            # Activar estado de derrota
+            self.estado = recursos.ESTADO_DERROTA
+            
+            # Configurar cámara para la derrota (Igual que victoria)
+            self.id_camara = self.cam_libre
+            self.controles.permitir_cambio_camara = False
+            self.controles.modo_control = recursos.ControlJuego.MODO_CAMARA_LIBRE
+            
+            # Ruta B-Spline alrededor del centro
+            self.curva_victoria = self.crear_curva_victoria()
+                
+            # Desactivar animación de victoria si estaba activa
+            self.component_for_entity(self.objeto_victoria, componentes.Luz).animacion = None
+            self.component_for_entity(self.objeto_victoria, componentes.Victoria).juego_terminado = True
+            
+            # Luces de fiesta solo en el ambiente (los gatos siguen en rojo)
+            self._iniciar_luces_fiesta()
+
+            # Nubes gris azulado oscuro con un parpadeo lento (Tormenta): todas comparten la animación
+            self.animacion_nubes.pulso(glm.vec3(0.2, 0.2, 0.25), glm.vec3(0.05, 0.05, 0.1), factor=0.8)
+
+    def toggle_vista_mapa(self):
+        controles: recursos.ControlJuego = self.controles
+        
+        if controles.modo_control == recursos.ControlJuego.MODO_JUGADOR:
+            # Cambiar a MODO MAPA (Vista superior estática)
+            self.id_camara = self.cam_libre
+            controles.modo_control = recursos.ControlJuego.MODO_MAPA
+            
+            # Posicionar cámara libre arriba del centro
+            try:
+                trans_cam_libre = self.component_for_entity(self.cam_libre, componentes.Transformacion)
+                orient_cam_libre = self.component_for_entity(self.cam_libre, componentes.OrientacionCamara)
+                
+                # Centro del laberinto (aprox 30x30, centro en 15,15)
+                # Altura 45 para ver todo
+                trans_cam_libre.posicion = glm.vec3(15.0, 15.0, 45.0)
+                
+                # Mirar hacia abajo (Pitch -90 grados)
+                # IMPORTANTE: SistemaOrientacionCamara usa trans.rotacion para calcular mirar_a.
+                # Debemos setear la rotación explícitamente.
+                trans_cam_libre.rotacion.x = -math.pi / 2.0
+                trans_cam_libre.rotacion.z = 0.0
+                
+                # CAMBIO CRÍTICO: Cambiar vector 'Arriba' a Y (0, 1, 0) para evitar singularidad
+                # al mirar hacia abajo en Z.
+                orient_cam_libre.arriba = glm.vec3(0.0, 1.0, 0.0)
+                
+            except KeyError:
+                pass
+
+        elif controles.modo_control == recursos.ControlJuego.MODO_MAPA:
+            # Volver a MODO JUGADOR
+            self.id_camara = self.cam_jugador
+            controles.modo_control = recursos.ControlJuego.MODO_JUGADOR
+            
+            # Restaurar vector 'Arriba' a Z (0, 0, 1) para la cámara libre (por si se usa en otro lado)
+            try:
+                orient_cam_libre = self.component_for_entity(self.cam_libre, componentes.OrientacionCamara)
+                orient_cam_libre.arriba = glm.vec3(0.0, 0.0, 1.0)
+            except KeyError:
+                pass
+
+    def reiniciar_posiciones(self):
+        """Devuelve todas las entidades con componente Casa a su posición original"""
+        # Es un salto: no interpolar desde la posición anterior
+        self.estado_anterior = {}
+        for _id, (casa, transformacion, velocidad) in self.get_components(
+                componentes.Casa,
+                componentes.Transformacion,
+                componentes.Velocidad):
+            transformacion.posicion = casa.posicion
+            transformacion.rotacion = casa.rotacion
+            velocidad.valor = glm.vec3()
+        self.reanudar_patrullas()
+
+    def dejar_patrulla(self, entidad):
+        """El gato deja su ruta para perseguir: vuelve a chocar con paredes y a caer con la gravedad"""
+        self.component_for_entity(entidad, componentes.Patrulla).activa = False
+        self.add_component(entidad, componentes.ComponenteColision())
+        self.add_component(entidad, componentes.ObjetoFisico())
+
+    def reanudar_patrullas(self):
+        """Devuelve a su ruta a los gatos que estaban persiguiendo (su Casa es el inicio de la ruta)"""
+        for entidad, patrulla in self.get_component(componentes.Patrulla):
+            patrulla.fraccion = patrulla.fraccion_inicial
+            if not patrulla.activa:
+                patrulla.activa = True
+                self.remove_component(entidad, componentes.ComponenteColision)
+                self.remove_component(entidad, componentes.ObjetoFisico)
+
+    def actualizar_resolucion(self, resolucion):
+        """Tamaño de la ventana (p. ej. tras VIDEORESIZE): proyección y viewport nativo"""
+        self.resolucion = resolucion
+        if self.shader_estandar:
+            self.shader_estandar.actualizar_proyeccion(resolucion)
+            gl.glViewport(0, 0, int(resolucion[0]), int(resolucion[1]))
+
+    def activar_resolucion_dinamica(self, objetivo_ms=12.0, escala_minima=0.5):
+        """Ajusta la resolución de la escena 3D para que su tiempo de GPU ronde objetivo_ms"""
+        if self.sin_gpu:
+            return
+        control = self.resolucion_dinamica.control
+        control.objetivo_ms = objetivo_ms
+        control.escala_minima = escala_minima
+        self.resolucion_dinamica.activa = True
+        
+    def crear_curva_victoria(self):
+        """Ruta B-Spline cerrada alrededor del centro del laberinto (victoria y derrota)"""
+        cx, cy = self.laberinto.centro.x, self.laberinto.centro.y
+        radio = 25.0
+        altura = 15.0
+        
+        # 8 Puntos de control formando un círculo
+        puntos = []
+        for i in range(8):
+            angulo = (i / 8.0) * math.pi * 2
+            x = cx + math.cos(angulo) * radio
+            y = cy + math.sin(angulo) * radio
+            # Ondular un poco la altura
+            z = altura + math.sin(angulo * 3) * 5.0 
+            puntos.append(glm.vec3(x, y, z))
+            
+        return CurvaBSpline(puntos, cerrada=True)
+
+    def juego_ganado(self):
+        self.sonido.reproducir('victoria')
+        self.estado = recursos.ESTADO_VICTORIA
+        
+        # Configurar cámara para la victoria
+        self.id_camara = self.cam_libre
+        self.controles.modo_control = recursos.ControlJuego.MODO_CAMARA_LIBRE
+        
+        # Ruta B-Spline alrededor del centro
+        self.curva_victoria = self.crear_curva_victoria()
+
+        # Luces de fiesta: ambiente, luz de cada gato y nubes (calculadas en el shader)
+        self._iniciar_luces_fiesta(gatos=True)
@@ -0,0 +1,37 @@
+from OpenGL import GL as gl
+from lote_sprites import LoteSprites
+
+class PantallaCarga:
+    """Barra de progreso dibujada con LoteSprites mientras se vacía la cola de subida"""
+
+    # Tamaño de la barra en fracciones de la pantalla
+    ANCHO_BARRA = 0.6
+    ALTO_BARRA = 0.03
+    COLOR_FONDO = (60 / 255, 60 / 255, 60 / 255, 1.0)
+    COLOR_RELLENO = (1.0, 200 / 255, 0.0, 1.0)
+
+    def __init__(self, resolucion):
+        # Se crea antes de activar la cola para que su buffer y su atlas no pasen por ella
+        self.resolucion = resolucion
+        self.lote = LoteSprites()
+
+    def dibujar(self, progreso):
+        """Dibuja la barra con 'progreso' entre 0.0 y 1.0 (fondo y relleno en una sola llamada)"""
+        gl.glClearColor(0.1, 0.1, 0.1, 1.0)
+        gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
+
+        progreso = min(max(progreso, 0.0), 1.0)
+        ancho_pantalla, alto_pantalla = self.resolucion
+        ancho = self.ANCHO_BARRA * ancho_pantalla
+        alto = self.ALTO_BARRA * alto_pantalla
+        x = (ancho_pantalla - ancho) / 2.0
+        y = (alto_pantalla - alto) / 2.0
+
+        self.lote.comenzar(self.resolucion)
+        self.lote.rectangulo(x, y, ancho, alto, self.COLOR_FONDO, capa=0)
+        if progreso > 0.0:
+            self.lote.rectangulo(x, y, ancho * progreso, alto, self.COLOR_RELLENO, capa=0)
+        self.lote.terminar()
+
+    def limpiar(self):
+        self.lote.limpiar()
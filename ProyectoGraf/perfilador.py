@@ -0,0 +1,237 @@
+"""
+Perfilador de tiempo por cuadro: mide cada sistema del Mundo (CPU y, opcionalmente,
+GPU con consultas GL_TIME_ELAPSED), guarda los últimos cuadros en un buffer circular,
+muestra percentiles en pantalla y exporta la traza en formato Chrome (chrome://tracing).
+
+    perfilador = Perfilador()
+    perfilador.envolver(mundo)
+    ...cada cuadro: perfilador.nuevo_cuadro()
+    perfilador.exportar_traza_chrome("traza.json")
+"""
+import json
+import time
+from collections import deque
+import esper
+import numpy as np
+from OpenGL import GL as gl
+from lote_sprites import LoteSprites, FuenteAtlas
+
+class Perfilador:
+    """Tiempos por sistema y por cuadro en un buffer circular de 'capacidad' cuadros"""
+
+    # Consultas de GPU en vuelo por sistema (se leen dos cuadros después, sin bloquear)
+    CONSULTAS_EN_VUELO = 3
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, capacidad=240, medir_gpu=True):
+        self.capacidad = capacidad
+        self.medir_gpu = medir_gpu
+        self.nombres = []
+        self.sistemas = []
+        self.cuadro = 0
+        self.inicio_cuadro = time.perf_counter()
+        self.tiempos_cpu = None
+        self.tiempos_gpu = None
+        self.tiempos_cuadro = np.zeros(capacidad)
+        self.eventos = deque(maxlen=capacidad * 32)
+        self._consultas = {}
+        self._originales = {}
+
+    def envolver(self, mundo):
+        """Reemplaza process() de cada sistema del mundo por una versión cronometrada"""
+        sistemas_gpu = set(map(id, getattr(mundo, "sistemas_cuadro", []))) if self.medir_gpu else set()
+        for sistema in list(mundo._processors):
+            if id(sistema) in self._originales:
+                continue
+            indice = len(self.sistemas)
+            self.sistemas.append(sistema)
+            self.nombres.append(type(sistema).__name__)
+            self._originales[id(sistema)] = sistema.process
+            if id(sistema) in sistemas_gpu:
+                ids = np.ravel(gl.glGenQueries(self.CONSULTAS_EN_VUELO))
+                # Por ranura: id de consulta, cuadro en que se usó y marca de tiempo CPU
+                self._consultas[indice] = [[int(id_consulta), -1, 0.0] for id_consulta in ids]
+            sistema.process = self._crear_envoltura(indice, sistema.process)
+
+        self.tiempos_cpu = np.zeros((self.capacidad, len(self.sistemas)))
+        self.tiempos_gpu = np.full((self.capacidad, len(self.sistemas)), np.nan)
+
+    def _crear_envoltura(self, indice, process):
+        consultas = self._consultas.get(indice)
+
+        def process_medido(*args, **kwargs):
+            inicio = time.perf_counter()
+            ranura = None
+            if consultas is not None:
+                ranura = consultas[self.cuadro % self.CONSULTAS_EN_VUELO]
+                if ranura[1] == self.cuadro:
+                    # Ya se midió en este cuadro (p. ej. se llamó dos veces): solo CPU
+                    ranura = None
+                else:
+                    self._leer_consulta(indice, ranura)
+                    gl.glBeginQuery(gl.GL_TIME_ELAPSED, ranura[0])
+            try:
+                return process(*args, **kwargs)
+            finally:
+                if ranura is not None:
+                    gl.glEndQuery(gl.GL_TIME_ELAPSED)
+                    ranura[1] = self.cuadro
+                    ranura[2] = inicio
+                fin = time.perf_counter()
+                # Los sistemas de paso fijo pueden ejecutarse varias veces por cuadro: se suman
+                self.tiempos_cpu[self.cuadro % self.capacidad, indice] += (fin - inicio) * 1000.0
+                self.eventos.append((self.nombres[indice], "cpu", inicio, fin - inicio))
+
+        return process_medido
+
+    def _leer_consulta(self, indice, ranura):
+        """Guarda el resultado de una consulta de GPU anterior si ya está disponible"""
+        id_consulta, cuadro, inicio = ranura
+        if cuadro < 0 or self.cuadro - cuadro >= self.capacidad:
+            return
+        if not int(np.ravel(gl.glGetQueryObjectiv(id_consulta, gl.GL_QUERY_RESULT_AVAILABLE))[0]):
+            return
+        nanosegundos = int(np.ravel(gl.glGetQueryObjectui64v(id_consulta, gl.GL_QUERY_RESULT))[0])
+        self.tiempos_gpu[cuadro % self.capacidad, indice] = nanosegundos / 1e6
+        self.eventos.append((self.nombres[indice], "gpu", inicio, nanosegundos / 1e9))
+        ranura[1] = -1
+
+    def nuevo_cuadro(self):
+        """Cierra el cuadro actual y prepara la fila del siguiente en el buffer"""
+        ahora = time.perf_counter()
+        self.tiempos_cuadro[self.cuadro % self.capacidad] = (ahora - self.inicio_cuadro) * 1000.0
+        self.inicio_cuadro = ahora
+        self.cuadro += 1
+        fila = self.cuadro % self.capacidad
+        if self.tiempos_cpu is not None:
+            self.tiempos_cpu[fila] = 0.0
+            self.tiempos_gpu[fila] = np.nan
+
+    def _filas_completas(self):
+        """Índices de los cuadros ya cerrados que siguen en el buffer"""
+        cantidad = min(self.cuadro, self.capacidad - 1)
+        return [(self.cuadro - 1 - i) % self.capacidad for i in range(cantidad)]
+
+    def percentiles(self):
+        """{nombre: (p50, p95, p99) en ms de CPU}, más 'cuadro' con el tiempo total"""
+        filas = self._filas_completas()
+        if not filas or self.tiempos_cpu is None:
+            return {}
+        resultado = {}
+        valores_cpu = np.percentile(self.tiempos_cpu[filas], self.PERCENTILES, axis=0)
+        for indice, nombre in enumerate(self.nombres):
+            resultado[nombre] = tuple(valores_cpu[:, indice])
+        resultado["cuadro"] = tuple(np.percentile(self.tiempos_cuadro[filas], self.PERCENTILES))
+        return resultado
+
+    def percentiles_gpu(self):
+        """{nombre: (p50, p95, p99) en ms de GPU} para los sistemas medidos con consultas"""
+        filas = self._filas_completas()
+        resultado = {}
+        for indice in self._consultas:
+            valores = self.tiempos_gpu[filas, indice]
+            valores = valores[~np.isnan(valores)]
+            if len(valores):
+                resultado[self.nombres[indice]] = tuple(np.percentile(valores, self.PERCENTILES))
+        return resultado
+
+    def exportar_traza_chrome(self, ruta):
+        """Escribe los eventos guardados como traza JSON de Chrome (una pista CPU y otra GPU)"""
+        if not self.eventos:
+            return
+        origen = min(evento[2] for evento in self.eventos)
+        eventos = []
+        for nombre, categoria, inicio, duracion in self.eventos:
+            eventos.append({
+                "name": nombre,
+                "cat": categoria,
+                "ph": "X",
+                "ts": (inicio - origen) * 1e6,
+                "dur": duracion * 1e6,
+                "pid": 0,
+                "tid": 0 if categoria == "cpu" else 1,
+            })
+        eventos.append({"name": "thread_name", "ph": "M", "pid": 0, "tid": 0, "args": {"name": "CPU"}})
+        eventos.append({"name": "thread_name", "ph": "M", "pid": 0, "tid": 1, "args": {"name": "GPU"}})
+        with open(ruta, "w") as archivo:
+            json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, archivo)
+
+    def limpiar(self):
+        """Devuelve a los sistemas su process() original y libera las consultas"""
+        for sistema in self.sistemas:
+            if id(sistema) in self._originales:
+                del sistema.process
+        for consultas in self._consultas.values():
+            gl.glDeleteQueries(len(consultas), [ranura[0] for ranura in consultas])
+        self._consultas = {}
+        self._originales = {}
+
+class OverlayPerfilador(esper.Processor):
+    """
+    Panel con los percentiles del perfilador dibujado con LoteSprites.
+    Se inserta en Mundo.sistemas_cuadro justo antes de SistemaFinCuadro.
+    Las líneas se recalculan solo cada INTERVALO_ACTUALIZACION segundos; el texto sale
+    de los glifos del atlas, así que no se compone ni se sube ninguna textura por cuadro.
+    """
+
+    INTERVALO_ACTUALIZACION = 0.25
+    ANCHO_PANEL = 420
+    ALTO_LINEA = 16
+    # Escala de las barras: este tiempo ocupa todo el ancho disponible
+    MS_BARRA_COMPLETA = 16.7
+    COLOR_PANEL = (0.0, 0.0, 0.0, 180 / 255)
+    COLOR_P95 = (120 / 255, 40 / 255, 40 / 255, 200 / 255)
+    COLOR_P50 = (40 / 255, 120 / 255, 40 / 255, 220 / 255)
+    COLOR_ENCABEZADO = (1.0, 200 / 255, 0.0, 1.0)
+    COLOR_TEXTO = (1.0, 1.0, 1.0, 1.0)
+
+    def __init__(self, perfilador, resolucion):
+        self.perfilador = perfilador
+        self.resolucion = resolucion
+        self.visible = True
+        self.lote = LoteSprites()
+        self.fuente = FuenteAtlas(self.lote.atlas, "Consolas", 13)
+        # (texto, p50, p95) por fila, recalculadas en _actualizar_lineas
+        self.lineas = None
+        self.ultima_actualizacion = 0.0
+
+    def _actualizar_lineas(self):
+        cpu = self.perfilador.percentiles()
+        gpu = self.perfilador.percentiles_gpu()
+        self.lineas = []
+        for nombre in self.perfilador.nombres + ["cuadro"]:
+            p50, p95, p99 = cpu.get(nombre, (0.0, 0.0, 0.0))
+            texto_gpu = f"{gpu[nombre][0]:6.2f}" if nombre in gpu else "     -"
+            texto = f"{nombre[:18]:<18} {p50:6.2f} {p95:6.2f} {p99:6.2f}   {texto_gpu}"
+            self.lineas.append((texto, p50, p95))
+
+    def process(self, *args):
+        self.dibujar()
+
+    def dibujar(self):
+        """Dibuja el panel en la esquina superior izquierda (llamar antes de cambiar de buffer)"""
+        if not self.visible:
+            return
+        ahora = time.perf_counter()
+        if self.lineas is None or ahora - self.ultima_actualizacion >= self.INTERVALO_ACTUALIZACION:
+            self._actualizar_lineas()
+            self.ultima_actualizacion = ahora
+
+        lote = self.lote
+        lote.comenzar((int(self.resolucion[0]), int(self.resolucion[1])))
+        alto = (len(self.lineas) + 2) * self.ALTO_LINEA
+        lote.rectangulo(0, 0, self.ANCHO_PANEL, alto, self.COLOR_PANEL, capa=0)
+        encabezado = "sistema              p50    p95    p99   gpu p50 (ms)"
+        lote.texto(self.fuente, encabezado, 6, 2, self.COLOR_ENCABEZADO, capa=2)
+        ancho_barras = self.ANCHO_PANEL - 12
+        for fila, (texto, p50, p95) in enumerate(self.lineas):
+            y = (fila + 1) * self.ALTO_LINEA + 2
+            lote.rectangulo(6, y + 2, int(min(p95 / self.MS_BARRA_COMPLETA, 1.0) * ancho_barras),
+                            self.ALTO_LINEA - 4, self.COLOR_P95, capa=1)
+            lote.rectangulo(6, y + 2, int(min(p50 / self.MS_BARRA_COMPLETA, 1.0) * ancho_barras),
+                            self.ALTO_LINEA - 4, self.COLOR_P50, capa=1)
+            lote.texto(self.fuente, texto, 6, y, self.COLOR_TEXTO, capa=2)
+        lote.terminar()
+
+    def limpiar(self):
+        self.lote.limpiar()
@@ -0,0 +1,62 @@
+"""
+Elige dónde aparecen los enemigos: lejos del jugador por camino (no en línea recta, para
+que una pared delgada no cuente como distancia) y separados entre sí al estilo
+Poisson-disk. Todo se evalúa con NumPy sobre las áreas vacías del laberinto.
+"""
+import numpy as np
+from campo_flujo import CampoFlujo
+
+# Celdas de camino mínimas entre el inicio del jugador y cualquier enemigo
+DISTANCIA_MINIMA_CAMINO = 12
+# Distancia mínima (unidades del mundo) entre dos enemigos
+SEPARACION_MINIMA = 4.0
+
+def distancias_desde(laberinto, posicion):
+    """Campo de distancias por camino (en celdas) desde una posición (x, y) del mundo"""
+    campo = CampoFlujo(laberinto)
+    campo.actualizar(laberinto.celda_en(posicion[0], posicion[1]))
+    return campo.distancias
+
+def planificar_apariciones(laberinto, posicion_jugador, cantidad, rng,
+                           distancia_minima=DISTANCIA_MINIMA_CAMINO, separacion=SEPARACION_MINIMA):
+    """
+    Devuelve hasta 'cantidad' posiciones (x, y) de areas_vacias que están al menos a
+    'distancia_minima' celdas de camino del jugador. La separación entre ellas se
+    reduce a la mitad si no alcanza para todos; la distancia al jugador nunca se relaja,
+    así que puede devolver menos posiciones si el laberinto es pequeño.
+    """
+    candidatas = np.asarray(laberinto.areas_vacias, dtype=np.float64).reshape(-1, 2)
+    if cantidad <= 0 or len(candidatas) == 0:
+        return []
+
+    distancias = distancias_desde(laberinto, posicion_jugador)
+    filas, columnas = laberinto.celdas_en(candidatas[:, 0], candidatas[:, 1])
+    distancia_camino = distancias[filas, columnas]
+    candidatas = candidatas[distancia_camino >= distancia_minima]
+    if len(candidatas) == 0:
+        return []
+
+    # Orden aleatorio reproducible con el generador del mundo
+    orden = list(range(len(candidatas)))
+    rng.shuffle(orden)
+    candidatas = candidatas[orden]
+
+    elegidas = []
+    disponibles = np.ones(len(candidatas), dtype=bool)
+    while len(elegidas) < cantidad and disponibles.any():
+        # Cada elegida bloquea de una vez a todas las candidatas dentro de su radio
+        limite = separacion * separacion
+        permitidas = disponibles.copy()
+        for indice in elegidas:
+            permitidas &= np.sum((candidatas - candidatas[indice]) ** 2, axis=1) >= limite
+        while len(elegidas) < cantidad:
+            libres = np.flatnonzero(permitidas)
+            if len(libres) == 0:
+                break
+            indice = libres[0]
+            elegidas.append(indice)
+            disponibles[indice] = False
+            permitidas &= np.sum((candidatas - candidatas[indice]) ** 2, axis=1) >= limite
+            permitidas[indice] = False
+        separacion *= 0.5
+    return [(float(candidatas[indice, 0]), float(candidatas[indice, 1])) for indice in elegidas]
@@ -0,0 +1,49 @@
+"""
+Sustitutos sin OpenGL ni audio para ejecutar el Mundo en modo sin GPU
+(pruebas de resistencia y mediciones de la simulación en máquinas sin ventana).
+"""
+
+class RegistroSinGpu:
+    """Reemplaza a recursos.GestorRecursos: asigna ids y guarda metadatos, sin subir nada a la GPU"""
+
+    def __init__(self):
+        self.ids = {}
+        self.metadatos = {}
+
+    def obtener_id(self, nombre):
+        return self.ids.setdefault(nombre, len(self.ids))
+
+    def registrar_modelo(self, nombre, modelo=None, **metadatos):
+        self.obtener_id(nombre)
+        self.metadatos[nombre] = metadatos
+
+    def obtener_textura(self, nombre):
+        return None
+
+    def obtener_color(self, nombre):
+        return None
+
+    def obtener_esqueleto(self, nombre):
+        return None
+
+    def limpiar(self):
+        pass
+
+class SonidoSilencioso:
+    """Reemplaza a Sonido: solo anota lo que se habría reproducido"""
+
+    def __init__(self):
+        self.reproducidos = []
+        self.musica_activa = False
+
+    def reproducir(self, nombre):
+        self.reproducidos.append(nombre)
+
+    def iniciar_musica(self):
+        self.musica_activa = True
+
+    def pausar_musica(self):
+        self.musica_activa = False
+
+    def detener(self):
+        self.musica_activa = False
@@ -0,0 +1,212 @@
+"""
+Resolución dinámica de la escena 3D.
+
+SistemaInicioEscena y SistemaFinEscena encierran a los sistemas de dibujo 3D: mientras la
+escala es menor que 1 la escena se dibuja en un framebuffer propio de (escala * ventana)
+píxeles y al final se amplía a la ventana con glBlitFramebuffer. La interfaz se dibuja
+después, directamente en la ventana, así que siempre queda a resolución nativa.
+
+El tiempo de GPU de la escena se mide con dos marcas GL_TIMESTAMP por cuadro (no con
+GL_TIME_ELAPSED, que no admite consultas anidadas y la usa el perfilador) y se lee unos
+cuadros después sin bloquear. ControlEscala ajusta la escala para acercarlo a un objetivo.
+"""
+import math
+import esper
+import numpy as np
+from OpenGL import GL as gl
+
+class ControlEscala:
+    """
+    Elige la escala de la escena a partir del tiempo de GPU medido. El costo se supone
+    proporcional a los píxeles (escala al cuadrado), así que la escala cambia con la raíz
+    de objetivo / tiempo. Se redondea a pasos de PASO y se espera ESPERA_CAMBIO cuadros
+    entre cambios para que no oscile.
+    """
+
+    PASO = 0.05
+    ESPERA_CAMBIO = 30
+    # Suavizado exponencial del tiempo medido
+    SUAVIZADO = 0.1
+    # Por encima de objetivo * MARGEN_BAJAR se baja la escala; por debajo de objetivo * MARGEN_SUBIR se sube
+    MARGEN_BAJAR = 1.05
+    MARGEN_SUBIR = 0.8
+
+    def __init__(self, objetivo_ms=12.0, escala_minima=0.5, escala_maxima=1.0):
+        self.objetivo_ms = objetivo_ms
+        self.escala_minima = escala_minima
+        self.escala_maxima = escala_maxima
+        self.escala = escala_maxima
+        self.tiempo_ms = None
+        self.cuadros_desde_cambio = 0
+
+    def registrar(self, tiempo_ms):
+        """Agrega una medición de GPU (ms) y devuelve True si la escala cambió"""
+        if self.tiempo_ms is None:
+            self.tiempo_ms = tiempo_ms
+        else:
+            self.tiempo_ms += (tiempo_ms - self.tiempo_ms) * self.SUAVIZADO
+        self.cuadros_desde_cambio += 1
+        if self.cuadros_desde_cambio < self.ESPERA_CAMBIO or self.tiempo_ms <= 0.0:
+            return False
+
+        if self.tiempo_ms > self.objetivo_ms * self.MARGEN_BAJAR:
+            deseada = self.escala * math.sqrt(self.objetivo_ms / self.tiempo_ms)
+            nueva = math.floor(deseada / self.PASO) * self.PASO
+        elif self.tiempo_ms < self.objetivo_ms * self.MARGEN_SUBIR:
+            # Se sube de a un paso: subir de más se nota más que quedarse corto
+            nueva = self.escala + self.PASO
+        else:
+            return False
+        nueva = round(min(max(nueva, self.escala_minima), self.escala_maxima), 4)
+        if nueva == self.escala:
+            return False
+        self.escala = nueva
+        self.cuadros_desde_cambio = 0
+        # Las mediciones anteriores eran de otra resolución
+        self.tiempo_ms = None
+        return True
+
+class DestinoEscena:
+    """Framebuffer con color y profundidad (renderbuffers) al que se dibuja la escena reducida"""
+
+    def __init__(self):
+        self.id_framebuffer = None
+        self.id_color = None
+        self.id_profundidad = None
+        self.tamano = None
+
+    def preparar(self, ancho, alto):
+        """Crea o redimensiona el framebuffer; devuelve False si el driver no lo acepta"""
+        if self.tamano == (ancho, alto):
+            return True
+        if self.id_framebuffer is None:
+            self.id_framebuffer = gl.glGenFramebuffers(1)
+            self.id_color, self.id_profundidad = np.ravel(gl.glGenRenderbuffers(2)).tolist()
+        gl.glBindRenderbuffer(gl.GL_RENDERBUFFER, self.id_color)
+        gl.glRenderbufferStorage(gl.GL_RENDERBUFFER, gl.GL_RGBA8, ancho, alto)
+        gl.glBindRenderbuffer(gl.GL_RENDERBUFFER, self.id_profundidad)
+        gl.glRenderbufferStorage(gl.GL_RENDERBUFFER, gl.GL_DEPTH_COMPONENT24, ancho, alto)
+        gl.glBindRenderbuffer(gl.GL_RENDERBUFFER, 0)
+
+        gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, self.id_framebuffer)
+        gl.glFramebufferRenderbuffer(gl.GL_FRAMEBUFFER, gl.GL_COLOR_ATTACHMENT0, gl.GL_RENDERBUFFER, self.id_color)
+        gl.glFramebufferRenderbuffer(gl.GL_FRAMEBUFFER, gl.GL_DEPTH_ATTACHMENT, gl.GL_RENDERBUFFER, self.id_profundidad)
+        estado = gl.glCheckFramebufferStatus(gl.GL_FRAMEBUFFER)
+        gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, 0)
+        if estado != gl.GL_FRAMEBUFFER_COMPLETE:
+            print(f"Framebuffer de la escena incompleto ({estado}): se desactiva la resolución dinámica")
+            return False
+        self.tamano = (ancho, alto)
+        return True
+
+    def limpiar(self):
+        if self.id_framebuffer is None:
+            return
+        gl.glDeleteFramebuffers(1, [self.id_framebuffer])
+        gl.glDeleteRenderbuffers(2, [self.id_color, self.id_profundidad])
+        self.id_framebuffer = None
+        self.tamano = None
+
+class ResolucionDinamica:
+    """Estado compartido por SistemaInicioEscena y SistemaFinEscena"""
+
+    # Pares de marcas de tiempo en vuelo (se leen CONSULTAS_EN_VUELO cuadros después)
+    CONSULTAS_EN_VUELO = 3
+
+    def __init__(self, control=None):
+        self.control = control or ControlEscala()
+        self.activa = False
+        self.destino = DestinoEscena()
+        self.cuadro = 0
+        # Por ranura: ids (inicio, fin) y si tiene un resultado pendiente de leer
+        self._consultas = None
+        self.usando_destino = False
+
+    @property
+    def escala(self):
+        return self.control.escala if self.activa else 1.0
+
+    def tamano_escena(self, resolucion):
+        """Píxeles en que se dibuja la escena para una ventana de 'resolucion'"""
+        escala = self.escala
+        return max(1, int(resolucion[0] * escala)), max(1, int(resolucion[1] * escala))
+
+    def _leer_consulta(self, ranura):
+        id_inicio, id_fin, pendiente = ranura
+        if not pendiente:
+            return
+        if not int(np.ravel(gl.glGetQueryObjectiv(id_fin, gl.GL_QUERY_RESULT_AVAILABLE))[0]):
+            return
+        inicio = int(np.ravel(gl.glGetQueryObjectui64v(id_inicio, gl.GL_QUERY_RESULT))[0])
+        fin = int(np.ravel(gl.glGetQueryObjectui64v(id_fin, gl.GL_QUERY_RESULT))[0])
+        ranura[2] = False
+        self.control.registrar((fin - inicio) / 1e6)
+
+    def comenzar(self, resolucion):
+        if not self.activa:
+            self.usando_destino = False
+            return
+        if self._consultas is None:
+            ids = np.ravel(gl.glGenQueries(2 * self.CONSULTAS_EN_VUELO)).tolist()
+            self._consultas = [[ids[2 * i], ids[2 * i + 1], False] for i in range(self.CONSULTAS_EN_VUELO)]
+        ranura = self._consultas[self.cuadro % self.CONSULTAS_EN_VUELO]
+        self._leer_consulta(ranura)
+        gl.glQueryCounter(ranura[0], gl.GL_TIMESTAMP)
+
+        ancho, alto = self.tamano_escena(resolucion)
+        self.usando_destino = (ancho, alto) != (int(resolucion[0]), int(resolucion[1]))
+        if self.usando_destino and not self.destino.preparar(ancho, alto):
+            # El driver no acepta el framebuffer: se dibuja a resolución nativa sin volver a intentarlo
+            self.usando_destino = False
+            self.activa = False
+            self.destino.limpiar()
+        if self.usando_destino:
+            gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, self.destino.id_framebuffer)
+            gl.glViewport(0, 0, ancho, alto)
+            # Mismo color de fondo que ya dejó puesto SistemaInicioCuadro
+            gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
+
+    def terminar(self, resolucion):
+        if not self.activa:
+            return
+        ancho_ventana, alto_ventana = int(resolucion[0]), int(resolucion[1])
+        if self.usando_destino:
+            ancho, alto = self.destino.tamano
+            gl.glBindFramebuffer(gl.GL_READ_FRAMEBUFFER, self.destino.id_framebuffer)
+            gl.glBindFramebuffer(gl.GL_DRAW_FRAMEBUFFER, 0)
+            gl.glBlitFramebuffer(0, 0, ancho, alto, 0, 0, ancho_ventana, alto_ventana,
+                                 gl.GL_COLOR_BUFFER_BIT, gl.GL_LINEAR)
+            gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, 0)
+            gl.glViewport(0, 0, ancho_ventana, alto_ventana)
+        ranura = self._consultas[self.cuadro % self.CONSULTAS_EN_VUELO]
+        gl.glQueryCounter(ranura[1], gl.GL_TIMESTAMP)
+        ranura[2] = True
+        self.cuadro += 1
+
+    def limpiar(self):
+        self.destino.limpiar()
+        if self._consultas is not None:
+            ids = [id_consulta for ranura in self._consultas for id_consulta in ranura[:2]]
+            gl.glDeleteQueries(len(ids), ids)
+            self._consultas = None
+
+class SistemaInicioEscena(esper.Processor):
+    """Va antes de los sistemas de dibujo 3D: redirige la escena al framebuffer reducido"""
+
+    def __init__(self, resolucion_dinamica):
+        self.resolucion_dinamica = resolucion_dinamica
+
+    def process(self, *args):
+        self.resolucion_dinamica.comenzar(self.world.resolucion)
+
+class SistemaFinEscena(esper.Processor):
+    """Va después de los sistemas de dibujo 3D y antes de la interfaz: amplía la escena a la ventana"""
+
+    def __init__(self, resolucion_dinamica):
+        self.resolucion_dinamica = resolucion_dinamica
+
+    def process(self, *args):
+        self.resolucion_dinamica.terminar(self.world.resolucion)
+
+    def limpiar(self):
+        self.resolucion_dinamica.limpiar()
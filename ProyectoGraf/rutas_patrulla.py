@@ -0,0 +1,143 @@
+"""
+Rutas de patrulla de los gatos: un paseo aleatorio por el grafo de pasillos del laberinto
+(ver GrafoLaberinto) da una secuencia de celdas libres y vecinas; sus centros son los
+puntos de control de una CurvaBSpline cerrada.
+
+La curva se muestrea densamente contra el mapa con un margen del tamaño del gato. Si algún
+punto queda cerca de una pared se triplican los puntos de control: con cada punto repetido
+tres veces la B-Spline cúbica pasa por los centros de las celdas y va en línea recta entre
+ellos, así que nunca sale del pasillo.
+
+Todas las rutas se guardan muestreadas a velocidad constante en una TablaRutas para que
+SistemaPatrulla avance a todos los gatos con NumPy.
+"""
+import math
+import glm
+import numpy as np
+from curvas_bspline import CurvaBSpline
+
+# Celdas mínimas del paseo aleatorio (antes de cerrar la ruta)
+CELDAS_RUTA = 24
+# Distancia mínima (unidades del mundo) entre la ruta y una pared: media caja del gato
+MARGEN_PARED = 0.85
+# Altura a la que patrullan los gatos (sin gravedad): media altura de su caja
+ALTURA_PATRULLA = 0.75
+# Muestras de la tabla por unidad de longitud de la ruta
+MUESTRAS_POR_UNIDAD = 4
+
+def recorrido_celdas(grafo, inicio, rng, celdas_minimas=CELDAS_RUTA):
+    """
+    Celdas de un paseo aleatorio por las aristas del grafo desde la celda libre 'inicio'.
+    En cada cruce se elige un pasillo distinto del que se llegó (salvo en callejones).
+    Devuelve la lista de celdas, vecinas dos a dos.
+    """
+    celdas = [inicio]
+    llegada = None
+    if inicio in grafo.indice_nodo:
+        nodo = grafo.indice_nodo[inicio]
+    else:
+        # Desde un pasillo: primero hasta uno de sus extremos
+        llegada, pasos = grafo.ubicacion_pasillo[inicio]
+        nodo_a, nodo_b, _longitud, intermedias = grafo.aristas[llegada]
+        if rng.random() < 0.5:
+            celdas += intermedias[pasos - 2::-1] if pasos > 1 else []
+            nodo = nodo_a
+        else:
+            celdas += intermedias[pasos:]
+            nodo = nodo_b
+        celdas.append(grafo.nodos[nodo])
+
+    while len(celdas) < celdas_minimas and grafo.aristas_nodo[nodo]:
+        opciones = [opcion for opcion in grafo.aristas_nodo[nodo] if opcion[0] != llegada] or grafo.aristas_nodo[nodo]
+        llegada, desde_a = opciones[rng.randrange(len(opciones))]
+        nodo_a, nodo_b, _longitud, intermedias = grafo.aristas[llegada]
+        if desde_a:
+            celdas += intermedias
+            nodo = nodo_b
+        else:
+            celdas += intermedias[::-1]
+            nodo = nodo_a
+        celdas.append(grafo.nodos[nodo])
+    return celdas
+
+def cerrar_recorrido(celdas):
+    """Secuencia cíclica de celdas: el recorrido si volvió al inicio, o ida y vuelta por el mismo camino"""
+    if len(celdas) > 2 and celdas[-1] == celdas[0]:
+        return celdas[:-1]
+    return celdas + celdas[-2:0:-1]
+
+def ruta_valida(laberinto, libre, puntos, margen=MARGEN_PARED):
+    """True si todos los puntos (N, 2 o 3) están a más de 'margen' de cualquier pared"""
+    for desplazamiento_x, desplazamiento_y in ((-margen, -margen), (-margen, margen), (margen, -margen), (margen, margen)):
+        filas, columnas = laberinto.celdas_en(puntos[:, 0] + desplazamiento_x, puntos[:, 1] + desplazamiento_y)
+        if not libre[filas, columnas].all():
+            return False
+    return True
+
+def crear_ruta_patrulla(laberinto, celda_inicio, rng, celdas_minimas=CELDAS_RUTA, margen=MARGEN_PARED):
+    """
+    CurvaBSpline cerrada que patrulla desde 'celda_inicio' sin tocar paredes,
+    o None si la celda no tiene vecinas libres.
+    """
+    grafo = laberinto.grafo()
+    celdas = cerrar_recorrido(recorrido_celdas(grafo, celda_inicio, rng, celdas_minimas))
+    if len(celdas) < 2:
+        return None
+    controles = [glm.vec3(*laberinto.centro_celda(*celda), ALTURA_PATRULLA) for celda in celdas]
+    # La B-Spline cúbica necesita al menos 4 puntos
+    while len(controles) < 4:
+        controles = controles * 2
+
+    curva = CurvaBSpline(controles, cerrada=True)
+    if ruta_valida(laberinto, grafo.libre, _muestras(curva), margen):
+        return curva
+    triplicados = [glm.vec3(control) for control in controles for _ in range(3)]
+    return CurvaBSpline(triplicados, cerrada=True)
+
+def _muestras(curva):
+    """Puntos a velocidad constante cada 1 / MUESTRAS_POR_UNIDAD unidades (incluye el cierre)"""
+    cantidad = max(2, int(math.ceil(curva.longitud() * MUESTRAS_POR_UNIDAD)) + 1)
+    return curva.puntos_uniformes(np.linspace(0.0, 1.0, cantidad))
+
+class TablaRutas:
+    """Rutas de patrulla muestreadas a velocidad constante en un único arreglo de NumPy"""
+
+    def __init__(self):
+        self.curvas = []
+        self._partes = []
+        self._pendiente = False
+        self.puntos = np.zeros((0, 3))
+        self.inicios = np.zeros(0, dtype=np.intp)
+        self.muestras = np.zeros(0, dtype=np.intp)
+        self.longitudes = np.zeros(0)
+
+    def agregar(self, curva):
+        """Registra una ruta cerrada y devuelve su índice"""
+        self.curvas.append(curva)
+        self._partes.append(_muestras(curva))
+        self._pendiente = True
+        return len(self.curvas) - 1
+
+    def preparar(self):
+        """Une las rutas agregadas en los arreglos de la tabla (se hace una vez, no por cada ruta)"""
+        if not self._pendiente:
+            return
+        self.muestras = np.array([len(parte) for parte in self._partes], dtype=np.intp)
+        self.inicios = np.concatenate(([0], np.cumsum(self.muestras)[:-1])).astype(np.intp)
+        self.longitudes = np.array([curva.longitud() for curva in self.curvas])
+        self.puntos = np.concatenate(self._partes)
+        self._pendiente = False
+
+    def posiciones(self, rutas, fracciones):
+        """Puntos (N, 3) de cada ruta tras recorrer 'fracciones' (0.0 a 1.0) de su longitud"""
+        self.preparar()
+        rutas = np.asarray(rutas, dtype=np.intp)
+        escalado = np.asarray(fracciones, dtype=np.float64) * (self.muestras[rutas] - 1)
+        anterior = np.minimum(np.floor(escalado).astype(np.intp), self.muestras[rutas] - 2)
+        mezcla = (escalado - anterior)[:, None]
+        anterior += self.inicios[rutas]
+        return self.puntos[anterior] + mezcla * (self.puntos[anterior + 1] - self.puntos[anterior])
+
+    def punto(self, ruta, fraccion):
+        x, y, z = self.posiciones([ruta], [fraccion])[0]
+        return glm.vec3(x, y, z)
@@ -0,0 +1,167 @@
+"""
+Servicio de audio único para todo el proceso (reemplaza al Sonido que creaba cada Mundo).
+
+- Los efectos cortos se decodifican una sola vez, en segundo plano, a un conjunto compartido
+  de pygame.mixer.Sound que reutilizan todas las partidas.
+- Las pistas largas no se cargan enteras: se reproducen con pygame.mixer.music, que las lee
+  del disco por partes mientras suenan.
+- reproducir / iniciar_musica / pausar_musica / detener solo encolan la orden; un hilo de audio la
+  ejecuta, así que el hilo del juego nunca espera a disco ni al mezclador.
+- Hay como mucho MAX_VOCES efectos a la vez: si no queda un canal libre se reutiliza el que
+  lleva más tiempo sonando.
+
+    audio = ServicioAudio.obtener()
+    audio.reproducir('daño')
+"""
+import os
+import queue
+import threading
+import pygame
+
+CARPETA_SONIDO = os.path.join(os.path.dirname(__file__), "recursos", "sonido")
+
+# Efectos cortos: nombre -> archivo (se decodifican al iniciar el servicio)
+MUESTRAS = {
+    "inicio": "inicio.wav",
+    "daño": "daño.wav",
+}
+# Pistas largas que se leen por partes: nombre -> archivos posibles (se usa el primero que exista)
+PISTAS = {
+    "victoria": ("jganado.wav",),
+    "derrota": ("jperdido.wav",),
+    # No viene con el juego: sin alguno de estos archivos no hay música de fondo (se avisa al cargar)
+    "musica": ("musica.ogg", "musica.mp3", "musica.wav"),
+}
+
+class ServicioAudio:
+    """Conjunto de muestras compartido y un hilo que ejecuta las órdenes de reproducción"""
+
+    MAX_VOCES = 8
+    _instancia = None
+
+    @classmethod
+    def obtener(cls):
+        """Instancia única del proceso (se crea la primera vez: la carga ocurre en segundo plano)"""
+        if cls._instancia is None:
+            cls._instancia = cls()
+        return cls._instancia
+
+    def __init__(self, carpeta=CARPETA_SONIDO):
+        self.carpeta = carpeta
+        self.muestras = {}
+        self.pistas = {}
+        self.pista_actual = None
+        # Estadísticas
+        self.voces_robadas = 0
+        self.ordenes_descartadas = 0
+
+        self.habilitado = self._iniciar_mezclador()
+        self._ordenes = queue.Queue()
+        self._hilo = threading.Thread(target=self._trabajar, name="audio", daemon=True)
+        self._hilo.start()
+        self._ordenes.put((self._cargar,))
+
+    def _iniciar_mezclador(self):
+        if pygame.mixer.get_init() is None:
+            try:
+                pygame.mixer.init()
+            except pygame.error as error:
+                print(f"Audio deshabilitado: {error}")
+                return False
+        pygame.mixer.set_num_channels(self.MAX_VOCES)
+        return True
+
+    #
+    # Interfaz para el juego (no bloquea)
+    #
+    def reproducir(self, nombre):
+        """Efecto corto o pista larga por nombre"""
+        self._ordenes.put((self._reproducir, nombre))
+
+    def iniciar_musica(self):
+        self._ordenes.put((self._reproducir_pista, "musica", -1))
+
+    def pausar_musica(self):
+        self._ordenes.put((self._pausar_musica,))
+
+    def detener(self):
+        """Corta todos los efectos y la pista que suene (al terminar una partida)"""
+        self._ordenes.put((self._detener,))
+
+    def esperar(self):
+        """Bloquea hasta que se hayan ejecutado las órdenes ya encoladas (para pruebas)"""
+        self._ordenes.join()
+
+    def cerrar(self):
+        """Detiene el hilo y el sonido; la próxima llamada a obtener() crea un servicio nuevo"""
+        self._ordenes.put(None)
+        self._hilo.join(timeout=1.0)
+        if self.habilitado:
+            pygame.mixer.stop()
+            pygame.mixer.music.stop()
+        if ServicioAudio._instancia is self:
+            ServicioAudio._instancia = None
+
+    #
+    # Hilo de audio
+    #
+    def _trabajar(self):
+        while True:
+            orden = self._ordenes.get()
+            try:
+                if orden is None:
+                    return
+                if self.habilitado:
+                    funcion, *argumentos = orden
+                    funcion(*argumentos)
+                else:
+                    self.ordenes_descartadas += 1
+            except (pygame.error, OSError) as error:
+                print(f"Error de audio: {error}")
+            finally:
+                self._ordenes.task_done()
+
+    def _cargar(self):
+        """Decodifica las muestras cortas y ubica las pistas largas (sin leerlas)"""
+        for nombre, archivo in MUESTRAS.items():
+            ruta = os.path.join(self.carpeta, archivo)
+            try:
+                self.muestras[nombre] = pygame.mixer.Sound(ruta)
+            except (pygame.error, FileNotFoundError) as error:
+                print(f"Error cargando {ruta}: {error}")
+        for nombre, archivos in PISTAS.items():
+            for archivo in archivos:
+                ruta = os.path.join(self.carpeta, archivo)
+                if os.path.isfile(ruta):
+                    self.pistas[nombre] = ruta
+                    break
+            else:
+                print(f"Sin pista '{nombre}': no se encontró {' ni '.join(archivos)} en {self.carpeta}")
+
+    def _reproducir(self, nombre):
+        if nombre in self.muestras:
+            canal = pygame.mixer.find_channel(False)
+            if canal is None:
+                # Límite de voces: se corta el efecto más antiguo
+                canal = pygame.mixer.find_channel(True)
+                self.voces_robadas += 1
+            canal.play(self.muestras[nombre])
+        elif nombre in self.pistas:
+            self._reproducir_pista(nombre, 0)
+
+    def _reproducir_pista(self, nombre, repeticiones):
+        ruta = self.pistas.get(nombre)
+        if ruta is None:
+            return
+        pygame.mixer.music.load(ruta)
+        pygame.mixer.music.play(repeticiones)
+        self.pista_actual = nombre
+
+    def _pausar_musica(self):
+        if self.pista_actual == "musica":
+            pygame.mixer.music.pause()
+
+    def _detener(self):
+        pygame.mixer.stop()
+        pygame.mixer.music.stop()
+        self.pista_actual = None
@@ -0,0 +1,229 @@
+"""
+Ejecuta muchas partidas sin GPU en paralelo (un proceso por núcleo) para balancear la
+dificultad de cada nivel y hacer pruebas de carga:
+
+    python simulacion_lotes.py --niveles 1 2 3 --partidas 1000 --politica aleatoria --salida lotes.csv
+
+Cada partida usa su propia semilla (semilla base + índice), así que cualquier fila del
+reporte se puede repetir exactamente. Además del CSV por partida se escribe un resumen
+por nivel y política; con --parquet también se guarda en Parquet (requiere pandas y pyarrow).
+"""
+import argparse
+import csv
+import math
+import multiprocessing
+import os
+import random
+import time
+
+RESOLUCION = 1024, 720
+PASO = 1.0 / 120.0
+# Duración máxima de una partida simulada (segundos de juego)
+DURACION_MAXIMA = 180.0
+# Cada cuántos pasos decide la política una nueva entrada
+PASOS_POR_DECISION = 12
+
+CAMPOS = (
+    "nivel", "politica", "semilla", "resultado", "tiempo_juego", "vidas_restantes",
+    "tiempo_primera_captura", "pasos", "ms_por_paso", "gatos",
+)
+
+class PoliticaQuieta:
+    """No se mueve: mide cuánto tardan los gatos en encontrar al jugador"""
+
+    def __init__(self, rng):
+        pass
+
+    def decidir(self, mundo):
+        return 0
+
+class PoliticaAleatoria:
+    """Mantiene una dirección aleatoria durante PASOS_POR_DECISION pasos"""
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def decidir(self, mundo):
+        return self.rng.randrange(16)
+
+class PoliticaDirecta:
+    """Va en línea recta hacia el queso; si lleva un rato sin avanzar prueba una dirección al azar"""
+
+    DISTANCIA_MINIMA_AVANCE = 0.05
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.posicion_anterior = None
+        self.desvio = 0
+
+    def decidir(self, mundo):
+        import componentes_3d as componentes
+        import entrada_jugador
+
+        jugador = mundo.component_for_entity(mundo.objeto_jugador, componentes.Transformacion).posicion
+        queso = mundo.component_for_entity(mundo.objeto_victoria, componentes.Transformacion).posicion
+        atascado = (self.posicion_anterior is not None
+                    and math.dist((jugador.x, jugador.y), self.posicion_anterior) < self.DISTANCIA_MINIMA_AVANCE)
+        self.posicion_anterior = (jugador.x, jugador.y)
+        if atascado:
+            self.desvio = 4
+        if self.desvio > 0:
+            self.desvio -= 1
+            return self.rng.randrange(1, 16)
+
+        entrada = 0
+        if queso.x > jugador.x + 0.5:
+            entrada |= entrada_jugador.DERECHA
+        elif queso.x < jugador.x - 0.5:
+            entrada |= entrada_jugador.IZQUIERDA
+        if queso.y > jugador.y + 0.5:
+            entrada |= entrada_jugador.ARRIBA
+        elif queso.y < jugador.y - 0.5:
+            entrada |= entrada_jugador.ABAJO
+        return entrada
+
+POLITICAS = {
+    "quieta": PoliticaQuieta,
+    "aleatoria": PoliticaAleatoria,
+    "directa": PoliticaDirecta,
+}
+
+def _iniciar_proceso():
+    # pygame no necesita ventana ni dispositivo de audio en los procesos de trabajo
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+def jugar_partida(tarea):
+    """Simula una partida completa; 'tarea' es (nivel, politica, semilla). Devuelve una fila del reporte"""
+    nivel, nombre_politica, semilla = tarea
+    import glm
+    import componentes_3d as componentes
+    import recursos
+    from mundo import Mundo
+
+    mundo = Mundo(glm.vec2(RESOLUCION), nivel, sin_gpu=True, semilla=semilla)
+    # La política tiene su propio generador para no alterar el azar de la simulación
+    politica = POLITICAS[nombre_politica](random.Random(semilla ^ 0x5EED))
+    gatos = len(mundo.get_component(componentes.Gato))
+
+    vidas_iniciales = mundo.vida
+    tiempo_primera_captura = None
+    pasos = 0
+    pasos_maximos = int(DURACION_MAXIMA / PASO)
+    inicio = time.perf_counter()
+    while pasos < pasos_maximos:
+        if pasos % PASOS_POR_DECISION == 0:
+            mundo.entrada = politica.decidir(mundo)
+        mundo.tiempo += PASO
+        mundo.simular_paso(PASO)
+        pasos += 1
+        if tiempo_primera_captura is None and mundo.vida < vidas_iniciales:
+            tiempo_primera_captura = pasos * PASO
+        if mundo.estado in (recursos.ESTADO_VICTORIA, recursos.ESTADO_DERROTA):
+            break
+    duracion = time.perf_counter() - inicio
+
+    if mundo.estado == recursos.ESTADO_VICTORIA:
+        resultado = "victoria"
+    elif mundo.estado == recursos.ESTADO_DERROTA:
+        resultado = "derrota"
+    else:
+        resultado = "tiempo_agotado"
+    fila = {
+        "nivel": nivel,
+        "politica": nombre_politica,
+        "semilla": semilla,
+        "resultado": resultado,
+        "tiempo_juego": pasos * PASO,
+        "vidas_restantes": mundo.vida,
+        "tiempo_primera_captura": tiempo_primera_captura,
+        "pasos": pasos,
+        "ms_por_paso": duracion * 1000.0 / max(pasos, 1),
+        "gatos": gatos,
+    }
+    mundo.limpiar()
+    return fila
+
+def resumir(filas):
+    """Agrupa por (nivel, política): tasas de victoria/derrota, tiempo a la primera captura y costo por paso"""
+    grupos = {}
+    for fila in filas:
+        grupos.setdefault((fila["nivel"], fila["politica"]), []).append(fila)
+
+    resumen = []
+    for (nivel, politica), grupo in sorted(grupos.items()):
+        capturas = [fila["tiempo_primera_captura"] for fila in grupo if fila["tiempo_primera_captura"] is not None]
+        resumen.append({
+            "nivel": nivel,
+            "politica": politica,
+            "partidas": len(grupo),
+            "tasa_victoria": sum(fila["resultado"] == "victoria" for fila in grupo) / len(grupo),
+            "tasa_derrota": sum(fila["resultado"] == "derrota" for fila in grupo) / len(grupo),
+            "tasa_tiempo_agotado": sum(fila["resultado"] == "tiempo_agotado" for fila in grupo) / len(grupo),
+            "tiempo_primera_captura_medio": sum(capturas) / len(capturas) if capturas else None,
+            "ms_por_paso_medio": sum(fila["ms_por_paso"] for fila in grupo) / len(grupo),
+        })
+    return resumen
+
+def escribir_csv(ruta, filas, campos):
+    with open(ruta, "w", newline="") as archivo:
+        escritor = csv.DictWriter(archivo, fieldnames=campos)
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+def escribir_parquet(ruta, filas):
+    try:
+        import pandas as pd
+        pd.DataFrame(filas).to_parquet(ruta)
+    except ImportError as error:
+        print(f"No se pudo escribir {ruta} (se necesitan pandas y pyarrow): {error}")
+
+def ejecutar_lote(niveles, partidas, politica="aleatoria", semilla_base=0, procesos=None):
+    """Reparte las partidas entre 'procesos' procesos y devuelve las filas ordenadas por semilla"""
+    tareas = [(nivel, politica, semilla_base + indice) for nivel in niveles for indice in range(partidas)]
+    procesos = procesos or os.cpu_count() or 1
+    # Trozos pequeños para repartir bien la carga (las partidas duran distinto)
+    tamano_trozo = max(1, len(tareas) // (procesos * 8))
+    filas = []
+    with multiprocessing.Pool(procesos, initializer=_iniciar_proceso) as pool:
+        for fila in pool.imap_unordered(jugar_partida, tareas, chunksize=tamano_trozo):
+            filas.append(fila)
+            if len(filas) % 100 == 0:
+                print(f"{len(filas)}/{len(tareas)} partidas")
+    filas.sort(key=lambda fila: (fila["nivel"], fila["semilla"]))
+    return filas
+
+def main():
+    parser = argparse.ArgumentParser(description="Partidas sin GPU en paralelo para balancear niveles")
+    parser.add_argument("--niveles", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--partidas", type=int, default=100, help="partidas por nivel")
+    parser.add_argument("--politica", choices=sorted(POLITICAS), default="aleatoria")
+    parser.add_argument("--semilla", type=int, default=0, help="semilla de la primera partida de cada nivel")
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--salida", default="simulacion_lotes.csv")
+    parser.add_argument("--parquet", action="store_true", help="guarda también las filas en Parquet")
+    argumentos = parser.parse_args()
+    # Sin partidas no hay resumen que escribir (--niveles ya exige al menos un nivel)
+    if argumentos.partidas < 1:
+        parser.error("--partidas debe ser al menos 1")
+
+    inicio = time.perf_counter()
+    filas = ejecutar_lote(argumentos.niveles, argumentos.partidas, argumentos.politica,
+                          argumentos.semilla, argumentos.procesos)
+    duracion = time.perf_counter() - inicio
+
+    resumen = resumir(filas)
+    base, _ = os.path.splitext(argumentos.salida)
+    escribir_csv(argumentos.salida, filas, CAMPOS)
+    escribir_csv(f"{base}_resumen.csv", resumen, list(resumen[0].keys()))
+    if argumentos.parquet:
+        escribir_parquet(f"{base}.parquet", filas)
+
+    print(f"{len(filas)} partidas en {duracion:.1f} s ({len(filas) / duracion:.1f} partidas/s)")
+    for grupo in resumen:
+        print(f"nivel {grupo['nivel']} ({grupo['politica']}): "
+              f"victoria {grupo['tasa_victoria']:.1%}, derrota {grupo['tasa_derrota']:.1%}, "
+              f"{grupo['ms_por_paso_medio']:.3f} ms/paso")
+
+if __name__ == "__main__":
+    main()
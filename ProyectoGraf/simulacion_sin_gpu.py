@@ -0,0 +1,64 @@
+"""
+Ejecuta el Mundo sin ventana, sin OpenGL y sin audio para probar y medir la simulación:
+
+    python simulacion_sin_gpu.py --nivel 2 --cuadros 20000
+"""
+import argparse
+import os
+import time
+import glm
+
+# pygame no necesita ventana ni dispositivo de audio en este modo
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from mundo import Mundo
+import recursos
+
+RESOLUCION = 1024, 720
+PASO = 1.0 / 120.0
+
+def ejecutar_simulacion(nivel=1, cuadros=10000, paso=PASO, detener_al_terminar=False):
+    """Crea un Mundo sin GPU, llama a process() 'cuadros' veces y devuelve las estadísticas"""
+    inicio_creacion = time.perf_counter()
+    mundo = Mundo(glm.vec2(RESOLUCION), nivel, sin_gpu=True)
+    duracion_creacion = time.perf_counter() - inicio_creacion
+
+    inicio = time.perf_counter()
+    cuadros_ejecutados = 0
+    for _ in range(cuadros):
+        mundo.delta = paso
+        mundo.tiempo += paso
+        mundo.process()
+        cuadros_ejecutados += 1
+        if detener_al_terminar and mundo.estado in (recursos.ESTADO_VICTORIA, recursos.ESTADO_DERROTA):
+            break
+    duracion = time.perf_counter() - inicio
+
+    estadisticas = {
+        "nivel": nivel,
+        "cuadros": cuadros_ejecutados,
+        "entidades": len(mundo._entities),
+        "segundos_creacion": duracion_creacion,
+        "segundos_simulacion": duracion,
+        "cuadros_por_segundo": cuadros_ejecutados / duracion if duracion > 0 else float("inf"),
+        "estado_final": mundo.estado,
+        "vida": mundo.vida,
+    }
+    mundo.limpiar()
+    return estadisticas
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulación del juego sin GPU")
+    parser.add_argument("--nivel", type=int, default=1)
+    parser.add_argument("--cuadros", type=int, default=10000)
+    parser.add_argument("--paso", type=float, default=PASO)
+    parser.add_argument("--detener-al-terminar", action="store_true")
+    argumentos = parser.parse_args()
+
+    estadisticas = ejecutar_simulacion(argumentos.nivel, argumentos.cuadros, argumentos.paso, argumentos.detener_al_terminar)
+    for clave, valor in estadisticas.items():
+        print(f"{clave}: {valor}")
+
+if __name__ == "__main__":
+    main()
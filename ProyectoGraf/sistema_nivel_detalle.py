@@ -0,0 +1,63 @@
+import math
+import esper
+import glm
+import componentes_3d as componentes
+from graficos_3d import ShaderEstandar
+
+class SistemaNivelDetalle(esper.Processor):
+    """
+    Elige en cada cuadro el modelo de NivelDetalle según el tamaño aproximado
+    (en píxeles) del objeto en pantalla: radio de la caja / distancia a la cámara.
+    """
+
+    def __init__(self, umbrales_pixeles=(90.0, 30.0)):
+        # Por debajo de umbrales_pixeles[i] se usa el nivel i + 1
+        self.umbrales_pixeles = umbrales_pixeles
+        # Estadísticas del último cuadro
+        self.triangulos_enviados = 0
+        self.triangulos_sin_lod = 0
+        self.objetos_por_nivel = []
+
+    def process(self, *args):
+        mundo = self.world
+        try:
+            posicion_camara = mundo.component_for_entity(mundo.id_camara, componentes.Transformacion).posicion
+        except KeyError:
+            return
+
+        # Píxeles que ocupa un objeto de radio 1 a distancia 1
+        factor_pantalla = (mundo.resolucion[1] * 0.5) / math.tan(math.radians(ShaderEstandar.CAMPO_VISION) * 0.5)
+
+        triangulos_enviados = 0
+        triangulos_sin_lod = 0
+        objetos_por_nivel = [0] * (len(self.umbrales_pixeles) + 1)
+
+        for entidad, (nivel, modelo, transformacion) in mundo.get_components(
+                componentes.NivelDetalle,
+                componentes.Modelo3D,
+                componentes.Transformacion):
+            caja = mundo.try_component(entidad, componentes.CajaDelimitadora)
+            if caja is not None:
+                radio = caja.radio
+            else:
+                escala = transformacion.escala
+                radio = nivel.radio * max(abs(escala.x), abs(escala.y), abs(escala.z))
+
+            distancia = max(glm.distance(transformacion.posicion, posicion_camara), 0.001)
+            pixeles = radio / distancia * factor_pantalla
+
+            indice = 0
+            for umbral in self.umbrales_pixeles:
+                if pixeles < umbral:
+                    indice += 1
+            indice = min(indice, len(nivel.ids_modelo) - 1)
+
+            nivel.nivel_actual = indice
+            modelo.id_modelo = nivel.ids_modelo[indice]
+            triangulos_enviados += nivel.triangulos[indice]
+            triangulos_sin_lod += nivel.triangulos[0]
+            objetos_por_nivel[indice] += 1
+
+        self.triangulos_enviados = triangulos_enviados
+        self.triangulos_sin_lod = triangulos_sin_lod
+        self.objetos_por_nivel = objetos_por_nivel
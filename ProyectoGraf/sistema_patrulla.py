@@ -0,0 +1,35 @@
+import esper
+import glm
+import numpy as np
+import componentes_3d as componentes
+import recursos
+
+class SistemaPatrulla(esper.Processor):
+    """
+    Avanza a todos los gatos con Patrulla activa por sus rutas (TablaRutas del mundo)
+    en una sola operación de NumPy. Las rutas ya evitan las paredes, así que estos gatos
+    no llevan ComponenteColision ni ObjetoFisico hasta que empiezan a perseguir.
+    """
+
+    def process(self, *args):
+        mundo = self.world
+        if mundo.estado != recursos.ESTADO_EJECUTANDO:
+            return
+        activos = [(patrulla, transformacion) for _entidad, (patrulla, transformacion)
+                   in mundo.get_components(componentes.Patrulla, componentes.Transformacion)
+                   if patrulla.activa]
+        if not activos:
+            return
+
+        tabla = mundo.rutas_patrulla
+        tabla.preparar()
+        cantidad = len(activos)
+        rutas = np.fromiter((patrulla.ruta for patrulla, _transformacion in activos), dtype=np.intp, count=cantidad)
+        fracciones = np.fromiter((patrulla.fraccion for patrulla, _transformacion in activos), dtype=np.float64, count=cantidad)
+        rapideces = np.fromiter((patrulla.rapidez for patrulla, _transformacion in activos), dtype=np.float64, count=cantidad)
+
+        fracciones = (fracciones + rapideces * mundo.delta / tabla.longitudes[rutas]) % 1.0
+        puntos = tabla.posiciones(rutas, fracciones)
+        for (patrulla, transformacion), fraccion, (x, y, z) in zip(activos, fracciones.tolist(), puntos.tolist()):
+            patrulla.fraccion = fraccion
+            transformacion.posicion = glm.vec3(x, y, z)
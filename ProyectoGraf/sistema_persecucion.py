@@ -0,0 +1,67 @@
+import esper
+import glm
+import numpy as np
+import componentes_3d as componentes
+import recursos
+from campo_flujo import CampoFlujo
+
+# Celdas de camino a las que un gato de patrulla detecta al jugador y empieza a perseguirlo
+DISTANCIA_DETECCION = 8
+
+class SistemaPersecucion(esper.Processor):
+    """
+    Dirige a cada Perseguidor hacia el centro de la siguiente celda del campo de flujo.
+    El campo (BFS desde la celda del jugador) solo se recalcula cuando el jugador cambia de celda.
+    Los gatos con Patrulla activa no persiguen hasta que el jugador queda a DISTANCIA_DETECCION
+    celdas de camino (ver Mundo.dejar_patrulla).
+    """
+
+    def __init__(self):
+        self.campo = None
+
+    def process(self, *args):
+        mundo = self.world
+        if mundo.estado != recursos.ESTADO_EJECUTANDO:
+            return
+        laberinto = mundo.laberinto
+        if self.campo is None or self.campo.laberinto is not laberinto:
+            self.campo = CampoFlujo(laberinto)
+
+        posicion_jugador = mundo.component_for_entity(mundo.objeto_jugador, componentes.Transformacion).posicion
+        self.campo.actualizar(laberinto.celda_en(posicion_jugador.x, posicion_jugador.y))
+        patrullando = self._detectar(mundo)
+
+        for entidad, (perseguidor, transformacion, velocidad) in mundo.get_components(
+                componentes.Perseguidor,
+                componentes.Transformacion,
+                componentes.Velocidad):
+            if entidad in patrullando:
+                continue
+            posicion = transformacion.posicion
+            siguiente = self.campo.paso(*laberinto.celda_en(posicion.x, posicion.y))
+            if siguiente is None:
+                # En la celda del jugador (o fuera del campo): ir directo hacia él
+                objetivo = glm.vec2(posicion_jugador.x, posicion_jugador.y)
+            else:
+                objetivo = glm.vec2(*laberinto.centro_celda(*siguiente))
+            direccion = objetivo - glm.vec2(posicion.x, posicion.y)
+            if glm.length(direccion) > 0.0001:
+                direccion = glm.normalize(direccion) * perseguidor.rapidez
+            # La componente z la maneja la gravedad
+            velocidad.valor = glm.vec3(direccion.x, direccion.y, velocidad.valor.z)
+
+    def _detectar(self, mundo):
+        """Saca de la patrulla a los gatos cercanos al jugador; devuelve las entidades que siguen patrullando"""
+        patrullas = [(entidad, transformacion.posicion) for entidad, (patrulla, transformacion)
+                     in mundo.get_components(componentes.Patrulla, componentes.Transformacion)
+                     if patrulla.activa]
+        if not patrullas:
+            return set()
+        xs = np.fromiter((posicion.x for _entidad, posicion in patrullas), dtype=np.float64, count=len(patrullas))
+        ys = np.fromiter((posicion.y for _entidad, posicion in patrullas), dtype=np.float64, count=len(patrullas))
+        filas, columnas = mundo.laberinto.celdas_en(xs, ys)
+        distancias = self.campo.distancias[filas, columnas]
+        detectan = (distancias != CampoFlujo.SIN_CAMINO) & (distancias <= DISTANCIA_DETECCION)
+        for indice in np.flatnonzero(detectan):
+            mundo.dejar_patrulla(patrullas[indice][0])
+        return {entidad for (entidad, _posicion), detecta in zip(patrullas, detectan.tolist()) if not detecta}
@@ -0,0 +1,146 @@
+"""
+Capa de widgets de interfaz en modo retenido: cada widget describe su posición en fracciones
+de la pantalla y CapaWidgets.disponer() la convierte a rectángulos en píxeles una sola vez por
+resolución. Esos rectángulos se usan tanto para dibujar (con LoteSprites) como para saber qué
+widget está bajo el cursor, así que lo que se ve y lo que se puede clicar nunca se separan.
+
+La búsqueda bajo el cursor usa una rejilla de celdas de TAMANO_CELDA píxeles: cada celda guarda
+los widgets que la tocan y una consulta solo revisa los de una celda, sin importar cuántos
+widgets tenga la capa.
+"""
+import math
+
+BLANCO = (1.0, 1.0, 1.0, 1.0)
+
+class Widget:
+    """
+    Imagen (región del atlas) centrada en (centro_x, centro_y), en fracciones de la pantalla con
+    origen arriba a la izquierda. 'alto' es fracción del alto de la pantalla; 'ancho' es fracción
+    del ancho o None para conservar la proporción de la imagen. 'alto_impacto' (fracción del alto)
+    permite un área clicable distinta de la dibujada, por ejemplo para que no se solapen botones.
+    """
+
+    def __init__(self, region, centro_x, centro_y, alto, ancho=None, valor=None,
+                 alto_impacto=None, color=BLANCO, color_resaltado=BLANCO):
+        self.region = region
+        self.centro_x = centro_x
+        self.centro_y = centro_y
+        self.alto = alto
+        self.ancho = ancho
+        self.alto_impacto = alto_impacto
+        self.valor = valor
+        self.color = color
+        self.color_resaltado = color_resaltado
+        self.visible = True
+        # (x, y, ancho, alto) en píxeles, calculados en disponer()
+        self.rectangulo = None
+        self.rectangulo_impacto = None
+
+    def disponer(self, resolucion):
+        ancho_pantalla, alto_pantalla = resolucion
+        alto = self.alto * alto_pantalla
+        if self.ancho is None:
+            ancho = alto * self.region.ancho / self.region.alto
+        else:
+            ancho = self.ancho * ancho_pantalla
+        centro_x = self.centro_x * ancho_pantalla
+        centro_y = self.centro_y * alto_pantalla
+        self.rectangulo = (centro_x - ancho / 2.0, centro_y - alto / 2.0, ancho, alto)
+        if self.alto_impacto is None:
+            self.rectangulo_impacto = self.rectangulo
+        else:
+            alto_impacto = self.alto_impacto * alto_pantalla
+            self.rectangulo_impacto = (centro_x - ancho / 2.0, centro_y - alto_impacto / 2.0, ancho, alto_impacto)
+
+class IndiceRejilla:
+    """Rejilla uniforme sobre la pantalla: celda -> índices de los rectángulos que la tocan"""
+
+    TAMANO_CELDA = 32
+
+    def __init__(self, tamano_celda=TAMANO_CELDA):
+        self.tamano_celda = tamano_celda
+        self.celdas = {}
+        self.rectangulos = []
+
+    def construir(self, rectangulos):
+        """Indexa una lista de (x, y, ancho, alto); los posteriores quedan por encima"""
+        self.celdas = {}
+        self.rectangulos = list(rectangulos)
+        for indice, (x, y, ancho, alto) in enumerate(self.rectangulos):
+            if ancho <= 0 or alto <= 0:
+                continue
+            columnas = range(math.floor(x / self.tamano_celda), math.floor((x + ancho) / self.tamano_celda) + 1)
+            filas = range(math.floor(y / self.tamano_celda), math.floor((y + alto) / self.tamano_celda) + 1)
+            for fila in filas:
+                for columna in columnas:
+                    self.celdas.setdefault((fila, columna), []).append(indice)
+
+    def consultar(self, x, y):
+        """Índice del rectángulo de más arriba que contiene (x, y), o None"""
+        candidatos = self.celdas.get((math.floor(y / self.tamano_celda), math.floor(x / self.tamano_celda)), ())
+        for indice in reversed(candidatos):
+            rx, ry, ancho, alto = self.rectangulos[indice]
+            if rx <= x < rx + ancho and ry <= y < ry + alto:
+                return indice
+        return None
+
+class CapaWidgets:
+    """Conjunto de widgets que se disponen, dibujan y consultan juntos"""
+
+    def __init__(self):
+        self.widgets = []
+        # Resolución de la disposición vigente (None si hay que recalcularla)
+        self.resolucion = None
+        # Última resolución pedida: invalidar() la conserva para volver a disponer sola
+        self._resolucion_pedida = None
+        self.indice = IndiceRejilla()
+        self.resaltado = None
+
+    def agregar(self, widget):
+        self.widgets.append(widget)
+        self.invalidar()
+        return widget
+
+    def invalidar(self):
+        """
+        Obliga a recalcular la disposición (tras mover u ocultar widgets): widget_en y dibujar
+        la rehacen en su próximo uso con la última resolución pedida a disponer()
+        """
+        self.resolucion = None
+
+    def _disposicion_al_dia(self):
+        """Rehace la disposición pendiente; False si todavía no se pidió ninguna resolución"""
+        if self.resolucion is None and self._resolucion_pedida is not None:
+            self.disponer(self._resolucion_pedida)
+        return self.resolucion is not None
+
+    def disponer(self, resolucion):
+        """Calcula rectángulos e índice; no hace nada si la resolución no cambió"""
+        resolucion = (int(resolucion[0]), int(resolucion[1]))
+        self._resolucion_pedida = resolucion
+        if resolucion == self.resolucion:
+            return False
+        for widget in self.widgets:
+            widget.disponer(resolucion)
+        self.indice.construir(widget.rectangulo_impacto if widget.visible else (0, 0, 0, 0)
+                              for widget in self.widgets)
+        self.resolucion = resolucion
+        return True
+
+    def widget_en(self, x, y):
+        """Widget visible bajo el punto (x, y) en píxeles, o None"""
+        if not self._disposicion_al_dia():
+            return None
+        indice = self.indice.consultar(x, y)
+        return None if indice is None else self.widgets[indice]
+
+    def dibujar(self, lote, capa=0):
+        """Agrega los widgets visibles al lote con sus rectángulos ya calculados"""
+        if not self._disposicion_al_dia():
+            return
+        for widget in self.widgets:
+            if not widget.visible:
+                continue
+            x, y, ancho, alto = widget.rectangulo
+            color = widget.color_resaltado if widget is self.resaltado else widget.color
+            lote.region(widget.region, x, y, ancho, alto, color, capa)